@@ -12,4 +12,8 @@ setup(
     install_requires=[
         'requests', 'logging', 'uuid', 'datetime'
     ],
+    extras_require={
+        'async': ['httpx'],
+        'columnar': ['numpy', 'pyarrow'],
+    },
 )
\ No newline at end of file
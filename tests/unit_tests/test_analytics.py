@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTLedgerClient
+from ttrest import FillAggregator
+
+FILLS = [
+    {"instrumentId": 1, "accountId": 10, "side": 1, "lastPx": "100", "lastQty": "2"},
+    {"instrumentId": 1, "accountId": 10, "side": 1, "lastPx": "103", "lastQty": "1"},
+    {"instrumentId": 1, "accountId": 10, "side": 2, "lastPx": "105", "lastQty": "2"},
+    {"instrumentId": 2, "accountId": 10, "side": 2, "lastPx": "50", "lastQty": "4"},
+    {"instrumentId": 2, "accountId": 10, "side": 0, "lastPx": "50", "lastQty": "4"},
+]
+
+
+class TestFillAggregator(unittest.TestCase):
+    def test_stats(self):
+        aggregator = FillAggregator().add(FILLS)
+
+        stats = aggregator.stats((1, 10))
+        self.assertEqual(stats["volume"], 5)
+        self.assertEqual(stats["netQty"], 1)
+        self.assertAlmostEqual(stats["buyVwap"], 101)
+        self.assertAlmostEqual(stats["vwap"], 102.6)
+        self.assertAlmostEqual(stats["realizedPnl"], 8)
+
+        self.assertEqual(aggregator.stats((2, 10))["realizedPnl"], 0.0)
+        self.assertIsNone(aggregator.stats((2, 10))["buyVwap"])
+        self.assertEqual(aggregator.skipped, 1)
+
+    def test_realized_pnl_after_reopening(self):
+        fills = [
+            {"instrumentId": 1, "accountId": 10, "side": 1, "lastPx": "100", "lastQty": "2"},
+            {"instrumentId": 1, "accountId": 10, "side": 2, "lastPx": "105", "lastQty": "2"},
+            {"instrumentId": 1, "accountId": 10, "side": 1, "lastPx": "110", "lastQty": "2"},
+            {"instrumentId": 1, "accountId": 10, "side": 2, "lastPx": "108", "lastQty": "3"},
+        ]
+        aggregator = FillAggregator().add(fills[:3])
+        self.assertAlmostEqual(aggregator.stats((1, 10))["realizedPnl"], 10)
+
+        aggregator.add(fills[3:])  # closes the long at a loss of 4 and opens a short
+        self.assertAlmostEqual(aggregator.stats((1, 10))["realizedPnl"], 6)
+
+    def test_merge_matches_single_pass(self):
+        merged = FillAggregator().add(FILLS[3:]).merge(FillAggregator().add(FILLS[:3]))
+        self.assertEqual(merged.results(), FillAggregator().add(FILLS).results())
+
+        flat = FillAggregator().add(FILLS[:1] + [dict(FILLS[0], side=2, lastPx="105")])
+        flat.merge(FillAggregator().add(FILLS[:1]))
+        self.assertAlmostEqual(flat.stats((1, 10))["realizedPnl"], 10)
+        with self.assertRaises(ValueError):
+            flat.merge(FillAggregator().add(FILLS[2:3]))
+
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_aggregate_fills(self, mock_get_fills):
+        fills = [dict(fill, timeStamp=str(i)) for i, fill in enumerate(FILLS, 1)]
+        mock_get_fills.side_effect = [{"fills": fills[:2]}, {"fills": fills[2:]}, {"fills": []}]
+
+        aggregator = TTLedgerClient(Mock(spec=TTAuthenticator)).aggregate_fills(min_timestamp=1)
+
+        self.assertEqual(aggregator.keys(), [(1, 10), (2, 10)])
+        self.assertEqual(aggregator.stats((1, 10))["fills"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import AsyncTTLedgerClient
+from ttrest import AsyncTTPdsClient
+from ttrest import UsageError
+
+
+class TestAsyncTTRestClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_get_markets(self, mock_send):
+        mock_response = Mock()
+        mock_response.json.return_value = {"markets": []}
+        mock_send.return_value = mock_response
+
+        client = AsyncTTPdsClient(self.auth_handler)
+        result = await client.get_markets()
+
+        self.assertEqual(result, {"markets": []})
+        mock_send.assert_called_once_with(
+            f"{client.TT_BASE_URL}/ttpds/{TTEnvironments.UAT.value}/markets", None, None, None, "get"
+        )
+
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_get_all_instruments(self, mock_send):
+        responses = [
+            {"instruments": [1, 2], "lastPage": "false", "nextPageKey": "key"},
+            {"instruments": [3], "lastPage": "true"},
+        ]
+        mock_send.side_effect = [Mock(**{"json.return_value": response}) for response in responses]
+
+        client = AsyncTTPdsClient(self.auth_handler)
+        result = await client.get_all_instruments(product_id=1)
+
+        self.assertEqual(result, {"instruments": [1, 2, 3], "lastPage": "true"})
+        self.assertEqual(mock_send.call_args_list[1].args[3], {"productId": 1, "nextPageKey": "key"})
+
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_get_all_fills(self, mock_send):
+        responses = [
+            {"fills": [{"timeStamp": "10"}, {"timeStamp": "20"}]},
+            {"fills": []},
+        ]
+        mock_send.side_effect = [Mock(**{"json.return_value": response}) for response in responses]
+
+        client = AsyncTTLedgerClient(self.auth_handler)
+        result = await client.get_all_fills()
+
+        self.assertEqual(result, {"fills": [{"timeStamp": "10"}, {"timeStamp": "20"}]})
+        self.assertEqual(mock_send.call_args_list[1].args[3]["minTimestamp"], 21)
+
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_iter_instruments(self, mock_send):
+        responses = [
+            {"instruments": [1, 2], "lastPage": "false", "nextPageKey": "key"},
+            {"instruments": [3], "lastPage": "true"},
+        ]
+        mock_send.side_effect = [Mock(**{"json.return_value": response}) for response in responses]
+
+        client = AsyncTTPdsClient(self.auth_handler)
+        instruments = [instrument async for instrument in client.iter_instruments(product_id=1)]
+
+        self.assertEqual(instruments, [1, 2, 3])
+
+    async def test_get_all_fills_sharded(self):
+        all_fills = [{"recordId": str(ts), "timeStamp": ts} for ts in [5, 6, 7, 8, 50, 90]]
+
+        async def fake_get_fills(min_timestamp=None, max_timestamp=None, **kwargs):
+            fills = [fill for fill in all_fills if min_timestamp <= fill["timeStamp"] <= max_timestamp]
+            return {"fills": fills[:2]}
+
+        client = AsyncTTLedgerClient(self.auth_handler)
+        with patch.object(AsyncTTLedgerClient, "FILLS_PAGE_SIZE", 2), \
+                patch.object(client, "get_fills", side_effect=fake_get_fills):
+            result = await client.get_all_fills_sharded(1, 100, shards=3, min_window_ns=1)
+
+        self.assertEqual(result["fills"], all_fills)
+
+    async def test_usage_error(self):
+        client = AsyncTTPdsClient(self.auth_handler)
+
+        with self.assertRaises(UsageError):
+            await client.get_currrency_rates_by_name(to_currency_name="USD")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTPdsClient
+from ttrest import AsyncTTPdsClient
+from ttrest import UsageError
+
+
+def fake_get_instrument(instrument_id):
+    if instrument_id == "bad":
+        raise UsageError("bad instrument")
+    return {"instrument": [{"id": instrument_id}]}
+
+
+def fake_get_product_families(market_ids):
+    # every market has its own family and shares family 0
+    return {"productFamilies": [{"id": 0}] + [{"id": market_id * 100} for market_id in market_ids], "status": "Ok"}
+
+
+class TestBulkRequests(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.client = TTPdsClient(self.auth_handler)
+
+    @patch("ttrest.pds.TTPdsClient.get_instrument", side_effect=fake_get_instrument)
+    def test_get_instruments_by_ids(self, mock_get_instrument):
+        mock_get_instrument.__name__ = "get_instrument"
+        result = self.client.get_instruments_by_ids([3, 1, "bad", 3, 2], max_workers=2)
+
+        # duplicates are requested once and the input order is preserved
+        self.assertEqual(mock_get_instrument.call_count, 4)
+        self.assertEqual(result.ids, [3, 1, "bad", 2])
+        self.assertEqual(list(result.results), [3, 1, 2])
+        self.assertEqual(result.results[1], {"instrument": [{"id": 1}]})
+
+        # a failure is reported without aborting the batch
+        self.assertFalse(result.ok)
+        self.assertIsInstance(result.errors["bad"], UsageError)
+
+    def test_empty_ids(self):
+        result = self.client.get_products_by_ids([])
+
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result), 0)
+
+    @patch("ttrest.pds.TTPdsClient.get_product_families", side_effect=fake_get_product_families)
+    def test_get_all_product_families(self, mock_get_product_families):
+        mock_get_product_families.__name__ = "get_product_families"
+        result = self.client.get_all_product_families(list(range(1, 24)) + [1], max_workers=3)
+
+        self.assertEqual(sorted(len(call.args[0]) for call in mock_get_product_families.call_args_list), [3, 10, 10])
+        self.assertEqual([family["id"] for family in result["productFamilies"]], [0] + [i * 100 for i in range(1, 24)])
+        self.assertEqual(result["status"], "Ok")
+
+        with self.assertRaises(UsageError):
+            self.client.get_all_product_families([1], chunk_size=11)
+
+    @patch("ttrest.pds.TTPdsClient.get_product_family_by_id", side_effect=lambda family_id: {"id": family_id})
+    @patch("ttrest.pds.TTPdsClient.get_product_families", side_effect=fake_get_product_families)
+    def test_get_all_product_families_details(self, mock_get_product_families, mock_get_product_family_by_id):
+        mock_get_product_families.__name__ = "get_product_families"
+        mock_get_product_family_by_id.__name__ = "get_product_family_by_id"
+        result = self.client.get_all_product_families([1, 2], chunk_size=1, details=True)
+
+        self.assertEqual([family["details"] for family in result["productFamilies"]], [{"id": 0}, {"id": 100}, {"id": 200}])
+        self.assertEqual(mock_get_product_family_by_id.call_count, 3)
+
+
+class TestAsyncBulkRequests(unittest.IsolatedAsyncioTestCase):
+    async def test_get_instruments_by_ids(self):
+        client = AsyncTTPdsClient(Mock(spec=TTAuthenticator))
+
+        async def fake_async_get_instrument(instrument_id):
+            return fake_get_instrument(instrument_id)
+
+        with patch.object(client, "get_instrument", side_effect=fake_async_get_instrument) as mock_get_instrument:
+            mock_get_instrument.__name__ = "get_instrument"
+            result = await client.get_instruments_by_ids([2, "bad", 1, 2], max_workers=2)
+
+        self.assertEqual(list(result.results), [2, 1])
+        self.assertEqual(list(result.errors), ["bad"])
+
+    async def test_get_all_product_families(self):
+        client = AsyncTTPdsClient(Mock(spec=TTAuthenticator))
+
+        async def get_product_families(market_ids):
+            return fake_get_product_families(market_ids)
+
+        with patch.object(client, "get_product_families", side_effect=get_product_families) as mock_get_product_families:
+            mock_get_product_families.__name__ = "get_product_families"
+            result = await client.get_all_product_families(range(1, 13))
+
+        self.assertEqual(mock_get_product_families.call_count, 2)
+        self.assertEqual(len(result["productFamilies"]), 13)
+
+    async def test_cancelled_request_is_not_a_result(self):
+        client = AsyncTTPdsClient(Mock(spec=TTAuthenticator))
+
+        async def get_instrument(instrument_id):
+            if instrument_id == 2:
+                raise asyncio.CancelledError()
+            return fake_get_instrument(instrument_id)
+
+        with self.assertRaises(asyncio.CancelledError):
+            await client._bulk_request(get_instrument, [1, 2])
+
+    async def test_iter_bulk_request(self):
+        client = AsyncTTPdsClient(Mock(spec=TTAuthenticator))
+
+        async def get_instrument(instrument_id):
+            return fake_get_instrument(instrument_id)
+
+        outcomes = [outcome async for outcome in client._iter_bulk_request(get_instrument, [1, "bad", 1], max_workers=2)]
+
+        self.assertEqual(sorted(str(item_id) for item_id, _, _ in outcomes), ["1", "bad"])
+        self.assertEqual({item_id: error is None for item_id, _, error in outcomes}, {1: True, "bad": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTCheckpointStore
+from ttrest import TTEnvironments
+from ttrest import TTLedgerClient
+from ttrest import TTPdsClient
+from ttrest import PostRequestError
+from ttrest import UsageError
+
+PAGES = {
+    None: {"instruments": [1, 2], "lastPage": "false", "nextPageKey": "page_2"},
+    "page_2": {"instruments": [3, 4], "lastPage": "false", "nextPageKey": "page_3"},
+    "page_3": {"instruments": [5], "lastPage": "true"},
+}
+
+
+def fake_get_instruments(product_type_id=None, product_id=None, alias=None, next_page_key=None):
+    return dict(PAGES[next_page_key])
+
+
+class TestTTCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TTCheckpointStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_save_and_reset(self):
+        checkpoint = self.store.checkpoint("test")
+        self.assertIsNone(checkpoint.cursor)
+
+        checkpoint.save("key_1", {"results": [1]})
+        checkpoint.save("key_2")
+
+        self.assertEqual(checkpoint.cursor, "key_2")
+        self.assertEqual(checkpoint.pages, 2)
+        self.assertEqual(checkpoint.stored_pages(), [{"results": [1]}])
+        self.assertEqual(self.store.names(), ["test"])
+
+        checkpoint.reset()
+        self.assertIsNone(checkpoint.cursor)
+        self.assertEqual(checkpoint.pages, 0)
+        self.assertEqual(checkpoint.stored_pages(), [])
+
+
+@patch("ttrest.pds.TTPdsClient.get_instruments", side_effect=fake_get_instruments)
+class TestCheckpointedPagination(unittest.TestCase):
+    def setUp(self):
+        self.store = TTCheckpointStore(":memory:")
+        self.client = TTPdsClient(Mock(spec=TTAuthenticator))
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_iter_resumes_after_interruption(self, mock_get_instruments):
+        mock_get_instruments.__name__ = "get_instruments"
+        checkpoint = self.store.checkpoint("instruments")
+
+        # consume the first page and stop part way through the second
+        instruments = self.client.iter_instruments(product_id=1, checkpoint=checkpoint)
+        self.assertEqual([next(instruments) for _ in range(3)], [1, 2, 3])
+        instruments.close()
+
+        self.assertEqual(checkpoint.cursor, "page_2")
+
+        # the second page is delivered again, the first is not
+        self.assertEqual(list(self.client.iter_instruments(product_id=1, checkpoint=checkpoint)), [3, 4, 5])
+        self.assertTrue(checkpoint.complete)
+        self.assertEqual(list(self.client.iter_instruments(product_id=1, checkpoint=checkpoint)), [])
+
+    def test_get_all_resumes_with_stored_pages(self, mock_get_instruments):
+        mock_get_instruments.__name__ = "get_instruments"
+        checkpoint = self.store.checkpoint("instruments")
+
+        mock_get_instruments.side_effect = [fake_get_instruments(), PostRequestError(Mock())]
+        with self.assertRaises(PostRequestError):
+            self.client.get_all_instruments(product_id=1, checkpoint=checkpoint)
+
+        mock_get_instruments.side_effect = fake_get_instruments
+        result = self.client.get_all_instruments(product_id=1, checkpoint=checkpoint)
+
+        self.assertEqual(result["instruments"], [1, 2, 3, 4, 5])
+        self.assertEqual(mock_get_instruments.call_args_list[2].kwargs["next_page_key"], "page_2")
+
+    def test_resume_with_other_filters_raises(self, mock_get_instruments):
+        mock_get_instruments.__name__ = "get_instruments"
+        checkpoint = self.store.checkpoint("instruments")
+
+        instruments = self.client.iter_instruments(product_id=1, checkpoint=checkpoint)
+        self.assertEqual([next(instruments) for _ in range(3)], [1, 2, 3])
+        instruments.close()
+
+        with self.assertRaises(UsageError):
+            list(self.client.iter_instruments(product_id=2, checkpoint=checkpoint))
+
+        checkpoint.reset()
+        self.assertEqual(list(self.client.iter_instruments(product_id=2, checkpoint=checkpoint)), [1, 2, 3, 4, 5])
+
+
+class TestCheckpointedFills(unittest.TestCase):
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_fills_resume_from_timestamp(self, mock_get_fills):
+        store = TTCheckpointStore(":memory:")
+        checkpoint = store.checkpoint("fills")
+        client = TTLedgerClient(Mock(spec=TTAuthenticator))
+        client.auth_handler.environment = TTEnvironments.UAT
+
+        mock_get_fills.side_effect = [{"fills": [{"timeStamp": 100}]}, PostRequestError(Mock())]
+        with self.assertRaises(PostRequestError):
+            client.get_all_fills(min_timestamp=1, checkpoint=checkpoint)
+        self.assertEqual(checkpoint.cursor, "101")
+
+        mock_get_fills.side_effect = [{"fills": [{"timeStamp": 200}]}, {"fills": []}]
+        result = client.get_all_fills(min_timestamp=1, checkpoint=checkpoint)
+
+        self.assertEqual(result["fills"], [{"timeStamp": 100}, {"timeStamp": 200}])
+        self.assertEqual(mock_get_fills.call_args_list[2].kwargs["min_timestamp"], 101)
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTLedgerClient
+from ttrest.columnar import np, pa, to_datetime64, ColumnarBuilder
+
+PAGES = [
+    {"fills": [{"recordId": "a", "timeStamp": "1690844400000000000", "qty": 1}, {"recordId": "b", "timeStamp": "1690844400000000500", "qty": 2}]},
+    {"fills": [{"recordId": "c", "timeStamp": "1690844400000001000", "qty": 3}]},
+    {"fills": []},
+]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestColumnarFills(unittest.TestCase):
+    def setUp(self):
+        self.ledger_client = TTLedgerClient(Mock(spec=TTAuthenticator))
+
+    def test_to_datetime64(self):
+        result = to_datetime64(["1690844400000000001", None])
+
+        self.assertEqual(result.dtype, np.dtype("datetime64[ns]"))
+        self.assertEqual(result[0], np.datetime64(1690844400000000001, "ns"))
+        self.assertTrue(np.isnat(result[1]))
+
+    @patch("ttrest.ledger.TTLedgerClient.get_fills", side_effect=PAGES)
+    def test_get_all_fills_numpy(self, mock_get_fills):
+        result = self.ledger_client.get_all_fills_columnar(min_timestamp=1)
+
+        self.assertEqual(result.dtype.names, ("recordId", "timeStamp", "qty"))
+        self.assertEqual(list(result["recordId"]), ["a", "b", "c"])
+        self.assertEqual(list(result["qty"]), [1, 2, 3])
+        self.assertEqual(result["timeStamp"][2] - result["timeStamp"][0], np.timedelta64(1000, "ns"))
+
+    def test_columns_seen_in_later_pages_and_nested_values(self):
+        builder = ColumnarBuilder()
+        builder.add_page([{"recordId": "a", "legs": [1, 2]}, {"recordId": "b", "legs": [3, 4]}])
+        builder.add_page([{"recordId": "c", "legs": [], "price": 1.5, "timeStamp": "1"}])
+        result = builder.build()
+
+        self.assertEqual(result.dtype.names, ("recordId", "legs", "price", "timeStamp"))
+        self.assertEqual(result["legs"].dtype, np.dtype(object))
+        self.assertEqual(list(result["legs"]), [[1, 2], [3, 4], []])
+        self.assertEqual(list(result["price"]), [None, None, 1.5])
+        self.assertTrue(np.isnat(result["timeStamp"][0]))
+        self.assertEqual(result["timeStamp"].dtype, np.dtype("datetime64[ns]"))
+
+        if pa is not None:
+            builder = ColumnarBuilder(output="arrow")
+            builder.add_page([{"recordId": "a"}])
+            builder.add_page([{"recordId": "b", "price": 1.5}])
+            self.assertEqual(builder.build().column("price").to_pylist(), [None, 1.5])
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    @patch("ttrest.ledger.TTLedgerClient.get_fills", side_effect=PAGES)
+    def test_get_all_fills_arrow(self, mock_get_fills):
+        result = self.ledger_client.get_all_fills_columnar(min_timestamp=1, output="arrow", columns=["recordId", "timeStamp"])
+
+        self.assertEqual(result.num_rows, 3)
+        self.assertEqual(result.column_names, ["recordId", "timeStamp"])
+        self.assertEqual(result.schema.field("timeStamp").type, pa.timestamp("ns"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTPdsClient
+from ttrest import AsyncTTPdsClient
+from ttrest import UsageError
+
+MARKETS = {"markets": [{"id": 1}, {"id": 2}, {"id": 3}]}
+PRODUCTS = {
+    1: [{"id": 10, "productTypeId": 34}, {"id": 11, "productTypeId": 51}],
+    2: [{"id": 20, "productTypeId": 34}, {"id": "bad", "productTypeId": 34}],
+}
+
+
+def fake_get_all_products(market_id):
+    if market_id not in PRODUCTS:
+        raise UsageError("bad market")
+    return {"products": PRODUCTS[market_id]}
+
+
+def fake_get_all_instruments(product_id):
+    if product_id == "bad":
+        raise UsageError("bad product")
+    return {"instruments": [{"id": f"{product_id}-1"}, {"id": f"{product_id}-2"}]}
+
+
+class TestCrawl(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.client = TTPdsClient(self.auth_handler)
+
+    @patch("ttrest.pds.TTPdsClient.get_all_instruments", side_effect=fake_get_all_instruments)
+    @patch("ttrest.pds.TTPdsClient.get_all_products", side_effect=fake_get_all_products)
+    @patch("ttrest.pds.TTPdsClient.get_markets", return_value=MARKETS)
+    def test_crawl(self, mock_get_markets, mock_get_all_products, mock_get_all_instruments):
+        delivered = []
+        progress = Mock()
+        report = self.client.crawl(lambda kind, parent_id, records: delivered.append((kind, parent_id, len(records))),
+                                   product_type_ids=[34], max_workers=3, progress=progress)
+
+        self.assertEqual(delivered[0], ("markets", None, 3))
+        self.assertCountEqual(delivered[1:], [("products", 1, 1), ("products", 2, 2), ("instruments", 10, 2), ("instruments", 20, 2)])
+        self.assertEqual((report.markets, report.products, report.instruments), (3, 3, 4))
+        self.assertEqual((report.requested, report.completed), (6, 6))
+        self.assertEqual(set(report.errors), {("market", 3), ("product", "bad")})
+        self.assertEqual(progress.call_count, 6)
+
+        # product 11 is not a future
+        self.assertNotIn(11, [call.kwargs["product_id"] for call in mock_get_all_instruments.call_args_list])
+
+    @patch("ttrest.pds.TTPdsClient.get_all_products", side_effect=fake_get_all_products)
+    @patch("ttrest.pds.TTPdsClient.get_markets", return_value=MARKETS)
+    def test_crawl_markets(self, mock_get_markets, mock_get_all_products):
+        with patch("ttrest.pds.TTPdsClient.get_all_instruments", side_effect=fake_get_all_instruments):
+            report = self.client.crawl(Mock(), market_ids=["1"])
+
+        self.assertTrue(report.ok)
+        mock_get_all_products.assert_called_once_with(1)
+        self.assertEqual(report.instruments, 4)
+
+
+class TestAsyncCrawl(unittest.IsolatedAsyncioTestCase):
+    async def test_crawl(self):
+        client = AsyncTTPdsClient(Mock(spec=TTAuthenticator))
+        delivered = []
+
+        async def sink(kind, parent_id, records):
+            delivered.append((kind, parent_id))
+
+        async def get_markets():
+            return MARKETS
+
+        async def get_all_products(market_id):
+            return fake_get_all_products(market_id)
+
+        async def get_all_instruments(product_id):
+            return fake_get_all_instruments(product_id)
+
+        with patch.object(client, "get_markets", get_markets), \
+                patch.object(client, "get_all_products", get_all_products), \
+                patch.object(client, "get_all_instruments", get_all_instruments):
+            report = await client.crawl(sink, max_workers=2)
+
+        self.assertEqual(report.instruments, 6)
+        self.assertEqual(set(report.errors), {("market", 3), ("product", "bad")})
+        self.assertIn(("instruments", 11), delivered)
+
+
+if __name__ == '__main__':
+    unittest.main()
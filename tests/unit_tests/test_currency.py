@@ -0,0 +1,73 @@
+import asyncio
+import math
+import unittest
+from unittest.mock import AsyncMock, Mock
+from ttrest import TTPdsClient
+from ttrest import CurrencyRateMatrix, AsyncCurrencyRateMatrix
+from ttrest.currency import np
+
+RATES = {"currencyRates": [
+    {"fromCurrencyId": 1, "fromCurrencyName": "USD", "toCurrencyId": 2, "toCurrencyName": "EUR", "rate": 0.5},
+    {"fromCurrencyId": 3, "fromCurrencyName": "GBP", "toCurrencyId": 1, "toCurrencyName": "USD", "rate": 4},
+    {"fromCurrencyId": 4, "fromCurrencyName": "JPY", "toCurrencyId": 5, "toCurrencyName": "CHF", "rate": 0.01},
+]}
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestCurrencyRateMatrix(unittest.TestCase):
+    def setUp(self):
+        self.rates = CurrencyRateMatrix().load(RATES)
+
+    def test_rates(self):
+        self.assertEqual(self.rates.rate("USD", "EUR"), 0.5)
+        self.assertEqual(self.rates.rate(2, "USD"), 2.0)         # inverse
+        self.assertEqual(self.rates.rate("GBP", "EUR"), 2.0)     # GBP -> USD -> EUR
+        self.assertEqual(self.rates.rate("EUR", "3"), 0.5)
+        self.assertEqual(self.rates.rate("CHF", "CHF"), 1.0)
+        self.assertTrue(math.isnan(self.rates.rate("USD", "JPY")))
+        self.assertEqual(len(self.rates), 5)
+
+        with self.assertRaises(KeyError):
+            self.rates.rate("USD", "AUD")
+
+    def test_no_triangulation(self):
+        rates = CurrencyRateMatrix(triangulate=False).load(RATES)
+        self.assertTrue(math.isnan(rates.rate("GBP", "EUR")))
+
+    def test_convert(self):
+        np.testing.assert_array_equal(self.rates.convert([1, 2], "USD", "EUR"), [0.5, 1.0])
+        np.testing.assert_array_equal(self.rates.convert([1, 2, 3], ["USD", "GBP", "EUR"], "EUR"), [0.5, 4.0, 3.0])
+        np.testing.assert_array_equal(self.rates.convert([1, 1], "USD", np.array(["EUR", "GBP"])), [0.5, 0.25])
+        np.testing.assert_array_equal(self.rates.convert([1, 1, 1], np.array([1, "GBP", 1], dtype=object), "EUR"), [0.5, 2.0, 0.5])
+
+    def test_refresh_keeps_rates_on_failure(self):
+        pds_client = Mock(spec=TTPdsClient)
+        pds_client.get_currrency_rates_by_name.side_effect = [RATES, ConnectionError("down")]
+        rates = CurrencyRateMatrix(pds_client, refresh_interval=0)
+        stop = Mock()
+        stop.is_set.side_effect = [False, False, True]
+
+        rates.run(stop)
+
+        self.assertEqual(pds_client.get_currrency_rates_by_name.call_count, 2)
+        self.assertEqual(rates.rate("USD", "EUR"), 0.5)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAsyncCurrencyRateMatrix(unittest.IsolatedAsyncioTestCase):
+    async def test_start_and_stop(self):
+        pds_client = Mock()
+        pds_client.get_currrency_rates_by_name = AsyncMock(return_value=RATES)
+        rates = AsyncCurrencyRateMatrix(pds_client)
+
+        rates.start()
+        while rates.updated is None:
+            await asyncio.sleep(0)
+        await rates.stop()
+
+        pds_client.get_currrency_rates_by_name.assert_awaited_once()
+        self.assertEqual(rates.rate("USD", "EUR"), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTEnumRegistry, EnumDecoder
+from ttrest import TTLedgerClient
+
+ORDER_DATA = {
+    "orderTypes": [{"id": 1, "name": "Market"}, {"id": 2, "name": "Limit"}],
+    "side": {"1": "Buy", "2": "Sell"},
+    "status": "Ok",
+}
+
+
+class TestEnumDecoder(unittest.TestCase):
+    def test_decode(self):
+        decoder = EnumDecoder(ORDER_DATA)
+        fills = [{"orderType": 1, "side": "2", "qty": 1}, {"orderType": "2", "side": 1, "qty": 2}, {"orderType": 99}]
+
+        decoder.decode(fills)
+
+        self.assertEqual(fills[0], {"orderType": "Market", "side": "Sell", "qty": 1})
+        self.assertEqual(fills[1], {"orderType": "Limit", "side": "Buy", "qty": 2})
+        self.assertEqual(fills[2], {"orderType": 99})
+
+    def test_decode_fields_missing_from_the_first_record(self):
+        fills = EnumDecoder(ORDER_DATA).decode([{"qty": 1}, {"side": "1", "orderType": 2}])
+        self.assertEqual(fills[1], {"side": "Buy", "orderType": "Limit"})
+
+    def test_decode_column(self):
+        decoder = EnumDecoder(ORDER_DATA, field_map={"ordType": "orderTypes"})
+        self.assertEqual(list(decoder.decode_column("ordType", [2, 1, 2, 7])), ["Limit", "Market", "Limit", 7])
+        self.assertEqual(list(decoder.decode_column("side", ["2", None, 1, "2"])), ["Sell", None, "Buy", "Sell"])
+
+    def test_plural_tables_are_aliased_exactly(self):
+        decoder = EnumDecoder({"sides": {"1": "Buy"}, "orderTypes": {"1": "Market"}})
+        self.assertEqual(sorted(decoder.fields), ["orderType", "orderTypes", "side", "sides"])
+
+
+class TestTTEnumRegistry(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+
+    @patch("ttrest.ledger.TTLedgerClient.get_order_data", return_value=ORDER_DATA)
+    def test_order_data_requested_once(self, mock_get_order_data):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "orderdata.json")
+            client = TTLedgerClient(self.auth_handler)
+
+            client.get_enum_decoder(TTEnumRegistry(path))
+            decoder = client.get_enum_decoder(TTEnumRegistry(path))  # a new registry reads the persisted file
+
+            self.assertEqual(mock_get_order_data.call_count, 1)
+            self.assertEqual(decoder.lookups["orderType"][1], "Market")
+
+            client.get_enum_decoder(TTEnumRegistry(path, ttl=0))
+            self.assertEqual(mock_get_order_data.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTFillStore
+from ttrest import TTLedgerClient
+
+
+class TestTTFillStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TTFillStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_upsert_is_idempotent(self):
+        fills = [
+            {"recordId": "a", "timeStamp": "100", "accountId": 1},
+            {"recordId": "b", "timeStamp": "200", "accountId": 2},
+        ]
+        self.assertEqual(self.store.upsert(fills, watermark="test"), fills)
+        self.assertEqual(self.store.upsert([{"recordId": "b", "timeStamp": "200", "accountId": 2, "qty": 3}]), [])
+
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.fills(account_id=2), [{"recordId": "b", "timeStamp": "200", "accountId": 2, "qty": 3}])
+        self.assertEqual(self.store.watermark("test"), 200)
+
+        # an earlier page never moves the watermark back
+        self.store.upsert([{"recordId": "c", "timeStamp": "50"}], watermark="test")
+        self.assertEqual(self.store.watermark("test"), 200)
+        self.assertEqual([fill["recordId"] for fill in self.store.fills()], ["c", "a", "b"])
+
+
+class TestSyncFills(unittest.TestCase):
+    def setUp(self):
+        self.store = TTFillStore(":memory:")
+        self.client = TTLedgerClient(Mock(spec=TTAuthenticator))
+        self.client.auth_handler.environment = TTEnvironments.UAT
+
+    def tearDown(self):
+        self.store.close()
+
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_sync_requests_after_watermark(self, mock_get_fills):
+        mock_get_fills.side_effect = [
+            {"fills": [{"recordId": "a", "timeStamp": "1000"}, {"recordId": "b", "timeStamp": "2000"}]},
+            {"fills": []},
+        ]
+        result = self.client.sync_fills(self.store, min_timestamp=1, account_id=7)
+        self.assertEqual(len(result["fills"]), 2)
+
+        # the second sync starts an overlap window before the latest fill and only returns fills it hadn't stored
+        mock_get_fills.side_effect = [
+            {"fills": [{"recordId": "b", "timeStamp": "2000"}, {"recordId": "c", "timeStamp": "2500"}]},
+            {"fills": []},
+        ]
+        result = self.client.sync_fills(self.store, min_timestamp=1, account_id=7, overlap_ns=500)
+
+        self.assertEqual(result["fills"], [{"recordId": "c", "timeStamp": "2500"}])
+        self.assertEqual(mock_get_fills.call_args_list[2].kwargs["min_timestamp"], 1500)
+        self.assertEqual(mock_get_fills.call_args_list[2].kwargs["account_id"], 7)
+        self.assertEqual(len(self.store), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTPdsClient
+from ttrest import InstrumentIndex
+
+INSTRUMENTS = [
+    {"id": "1", "alias": "ES Dec24", "securityId": "101", "productId": 10, "expirationDate": 300},
+    {"id": "2", "alias": "ES Mar25", "securityId": "102", "productId": 10, "expirationDate": 400},
+    {"id": "3", "alias": "ES Dec24-Mar25", "securityId": "103", "productId": 10, "expirationDate": 300},
+    {"id": "4", "alias": "NQ Dec24", "securityId": "101", "productId": 20, "expirationDate": 300},
+]
+
+
+class TestInstrumentIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = InstrumentIndex(INSTRUMENTS)
+
+    def ids(self, records):
+        return [record["id"] for record in records]
+
+    def test_lookups(self):
+        self.assertEqual(self.index.get("2")["alias"], "ES Mar25")
+        self.assertEqual(self.index.by_alias("NQ Dec24")["id"], "4")
+        self.assertEqual(self.ids(self.index.by_symbol("101")), ["1", "4"])
+        self.assertIsNone(self.index.get("5"))
+        self.assertIn("3", self.index)
+
+    def test_search(self):
+        self.assertEqual(self.ids(self.index.search(10, prefix="es dec")), ["1", "3"])
+        self.assertEqual(self.ids(self.index.search(10, min_expiry=350)), ["2"])
+        self.assertEqual(self.ids(self.index.search(10, prefix="ES Dec24", max_expiry=300)), ["1", "3"])
+        self.assertEqual(self.index.search(30), [])
+
+    def test_incremental_updates(self):
+        self.index.search(10)
+        self.index.add([{"id": "2", "alias": "ES Jun25", "securityId": "104", "productId": 10, "expirationDate": 500}])
+        self.index.remove(["3", "9"])
+
+        self.assertIsNone(self.index.by_alias("ES Mar25"))
+        self.assertEqual(self.ids(self.index.search(10, min_expiry=450)), ["2"])
+        self.assertEqual(self.ids(self.index.search(10, prefix="ES")), ["1", "2"])
+        self.assertEqual(self.ids(self.index.by_symbol("103")), [])
+        self.assertEqual(len(self.index), 3)
+
+        # the removed instrument's row is reused
+        self.index.add([{"id": "5", "alias": "ES Sep25", "productId": 10, "expirationDate": 600}])
+        self.assertEqual(len(self.index._ids), 4)
+        self.assertEqual(self.ids(self.index.search(10, min_expiry=450)), ["2", "5"])
+
+    def test_shared_alias_survives_removal(self):
+        self.index.add([{"id": "6", "alias": "ES Dec24", "productId": 30}])
+        self.assertEqual(self.index.by_alias("ES Dec24")["id"], "6")
+
+        self.index.remove(["6"])
+        self.assertEqual(self.index.by_alias("ES Dec24")["id"], "1")
+
+    @patch("ttrest.pds.TTPdsClient.get_all_instruments")
+    def test_load(self, mock_get_all_instruments):
+        mock_get_all_instruments.side_effect = lambda product_id: {
+            "instruments": [instrument for instrument in INSTRUMENTS if instrument["productId"] == product_id]
+        }
+        index = InstrumentIndex()
+        result = index.load(TTPdsClient(Mock(spec=TTAuthenticator)), [10, 20], max_workers=2)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(len(index), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
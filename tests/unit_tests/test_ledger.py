@@ -53,6 +53,81 @@ class TestTTLedgerClient(unittest.TestCase):
 
         self.assertEqual(result, {"data": "fill_data"})
 
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_iter_fills(self, mock_get_fills):
+        mock_get_fills.side_effect = [
+            {"fills": [{"timeStamp": "100"}, {"timeStamp": "200"}]},
+            {"fills": [{"timeStamp": "300"}]},
+            {"fills": []}
+        ]
+
+        fills = self.ledger_client.iter_fills(min_timestamp=50)
+
+        self.assertEqual(next(fills), {"timeStamp": "100"})
+        self.assertEqual(mock_get_fills.call_count, 1)
+        self.assertEqual([fill["timeStamp"] for fill in fills], ["200", "300"])
+        self.assertEqual(mock_get_fills.call_args_list[1].kwargs["min_timestamp"], 201)
+        self.assertEqual(mock_get_fills.call_count, 3)
+
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_get_all_fills(self, mock_get_fills):
+        mock_get_fills.side_effect = [
+            {"fills": [{"timeStamp": 100}], "status": "Ok"},
+            {"fills": [], "status": "Ok"}
+        ]
+
+        result = self.ledger_client.get_all_fills()
+
+        self.assertEqual(result, {"fills": [{"timeStamp": 100}], "status": "Ok"})
+        self.assertEqual(mock_get_fills.call_args_list[1].kwargs["min_timestamp"], 101)
+
+    def test_get_all_fills_sharded(self):
+        # dense around 1000-1020 and sparse elsewhere
+        timestamps = list(range(1000, 1020)) + [1500, 3000, 7000, 9999]
+        all_fills = [{"recordId": f"fill_{ts}", "timeStamp": str(ts)} for ts in timestamps]
+
+        def fake_get_fills(min_timestamp=None, max_timestamp=None, **kwargs):
+            fills = [fill for fill in all_fills if min_timestamp <= int(fill["timeStamp"]) <= max_timestamp]
+            return {"fills": fills[:TTLedgerClient.FILLS_PAGE_SIZE]}
+
+        with patch.object(TTLedgerClient, "FILLS_PAGE_SIZE", 3), \
+                patch.object(self.ledger_client, "get_fills", side_effect=fake_get_fills) as mock_get_fills:
+            result = self.ledger_client.get_all_fills_sharded(1000, 9999, shards=4, max_workers=2, min_window_ns=2)
+
+        self.assertEqual(result["fills"], all_fills)
+        self.assertGreater(mock_get_fills.call_count, 4)
+
+    def test_get_all_fills_sharded_windows(self):
+        self.assertEqual(
+            self.ledger_client._fill_shard_windows(1, 10, 3),
+            [(1, 4), (5, 8), (9, 10)]
+        )
+
+    @patch("ttrest.ledger.TTLedgerClient.get_orders")
+    def test_get_all_orders(self, mock_get_orders):
+        mock_get_orders.side_effect = [
+            {"orders": [{"id": "a", "timeStamp": "100"}, {"id": "b", "timeStamp": "200"}], "status": "Ok"},
+            {"orders": [], "status": "Ok"}
+        ]
+
+        result = self.ledger_client.get_all_orders(min_timestamp=50, account_id=7)
+
+        self.assertEqual([order["id"] for order in result["orders"]], ["a", "b"])
+        self.assertEqual(mock_get_orders.call_args_list[1].kwargs, {"min_timestamp": 201, "max_timestamp": None, "account_id": 7})
+
+    @patch("ttrest.rest_client.TTRestClient._authenticated_get")
+    def test_get_orders_by_ids(self, mock_authenticated_get):
+        mock_authenticated_get.side_effect = lambda url: Mock(**{"json.return_value": {"url": url}})
+        self.ledger_client.auth_handler.environment = TTEnvironments.UAT
+
+        result = self.ledger_client.get_orders_by_ids(["a", "b", "a"], max_workers=2)
+
+        self.assertEqual(result.ids, ["a", "b"])
+        self.assertEqual(
+            result.results["b"]["url"],
+            f"{self.ledger_client.TT_BASE_URL}/ttledger/{TTEnvironments.UAT.value}/orders/b"
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
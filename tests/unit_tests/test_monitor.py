@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTMonitorClient
+from ttrest import UsageError
+from ttrest.monitor import ScaleQty
+
+
+def fake_get_all_position(account_ids=None, scale_qty=ScaleQty.DEFAULT):
+    return {"positions": [{"accountId": account_id} for account_id in account_ids], "lastPage": "true", "status": "Ok"}
+
+
+def fake_get_all_sod(account_id, cache=None):
+    if account_id == 2:
+        raise UsageError("failed")
+    return {"sod": [account_id]}
+
+
+class TestTTMonitorClient(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.client = TTMonitorClient(self.auth_handler)
+
+    @patch("ttrest.monitor.TTMonitorClient.get_all_position", side_effect=fake_get_all_position)
+    def test_get_all_position_chunked(self, mock_get_all_position):
+        result = self.client.get_all_position_chunked([1, 2, 3, 2, 4, 5], chunk_size=2, max_workers=2)
+
+        self.assertEqual(mock_get_all_position.call_count, 3)
+        self.assertEqual([position["accountId"] for position in result["positions"]], [1, 2, 3, 4, 5])
+        self.assertEqual(result["status"], "Ok")
+
+    @patch("ttrest.account.TTAccountClient.get_all_accounts", return_value={"accounts": [{"id": 1}, {"id": 2}]})
+    @patch("ttrest.rest_client.TTRestClient._authenticated_get")
+    def test_get_all_product_position_chunked(self, mock_authenticated_get, mock_get_all_accounts):
+        mock_authenticated_get.side_effect = lambda url, query: Mock(**{"json.return_value": {"positions": [query]}})
+
+        result = self.client.get_all_position_chunked(chunk_size=1, position_type="productposition")
+
+        self.assertEqual(sorted(query["accountIds"] for query in result["positions"]), ["1", "2"])
+        self.assertTrue(all(call.args[0].endswith("/productposition") for call in mock_authenticated_get.call_args_list))
+
+    @patch("ttrest.monitor.TTMonitorClient.get_all_sod")
+    def test_iter_sod_by_account_ids(self, mock_get_all_sod):
+        mock_get_all_sod.__name__ = "get_all_sod"
+        mock_get_all_sod.side_effect = fake_get_all_sod
+
+        results = {account_id: (response, error) for account_id, response, error in self.client.iter_sod_by_account_ids([1, 2, 3, 1])}
+
+        self.assertEqual(mock_get_all_sod.call_count, 3)
+        self.assertEqual(results[1], ({"sod": [1]}, None))
+        self.assertIsNone(results[2][0])
+        self.assertIsInstance(results[2][1], UsageError)
+
+    @patch("ttrest.monitor.TTMonitorClient.get_all_credit_utilization")
+    def test_get_all_credit_utilization_by_account_ids(self, mock_get_all_credit_utilization):
+        mock_get_all_credit_utilization.__name__ = "get_all_credit_utilization"
+        mock_get_all_credit_utilization.side_effect = lambda account_id, include_product_pos: {"creditUtilization": [account_id]}
+
+        result = self.client.get_all_credit_utilization_by_account_ids([5, 4], include_product_pos=True)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(list(result.results), [5, 4])
+        mock_get_all_credit_utilization.assert_any_call(5, include_product_pos=True)
+
+    @patch("ttrest.rest_client.TTRestClient._authenticated_get")
+    def test_scale_qty_query(self, mock_authenticated_get):
+        requests = [
+            (self.client.get_position, None),
+            (self.client.get_product_family_position, None),
+            (self.client.get_product_position, None),
+            (self.client.get_position_for_account, 1),
+            (self.client.get_product_family_position_for_account, 1),
+            (self.client.get_product_position_for_account, 1),
+        ]
+        for request, account_id in requests:
+            args = () if account_id is None else (account_id,)
+            for scale_qty, expected in ((ScaleQty.CONTRACTS, "0"), (1, "1"), (ScaleQty.DEFAULT, None), (None, None)):
+                request(*args, scale_qty=scale_qty)
+                query = mock_authenticated_get.call_args.kwargs["query"]
+                self.assertEqual((query or {}).get("scaleQty"), expected, (request.__name__, scale_qty))
+
+    def test_invalid_position_type(self):
+        with self.assertRaises(UsageError):
+            self.client.get_all_position_chunked([1], position_type="sod")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import Mock
+from ttrest import TTLedgerClient
+from ttrest import TTMonitorClient
+from ttrest import TTPositionEngine
+from ttrest.bulk import BulkResult
+
+
+def fills_page(*fills):
+    return {"fills": [dict(zip(("recordId", "accountId", "instrumentId", "side", "lastQty", "timeStamp"), fill)) for fill in fills]}
+
+
+class TestTTPositionEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = TTPositionEngine(min_timestamp=100, account_ids=[1])
+
+    def test_load_sod_and_update(self):
+        sod = BulkResult([1])
+        sod.results[1] = {"sod": [{"accountId": 1, "instrumentId": 10, "netPosition": 5}]}
+        monitor_client = Mock(spec=TTMonitorClient)
+        monitor_client.get_all_sod_by_account_ids.return_value = sod
+        self.engine.load_sod(monitor_client)
+
+        ledger_client = Mock(spec=TTLedgerClient)
+        ledger_client.iter_fill_pages.side_effect = [
+            [fills_page(("a", 1, 10, 1, "3", "200"), ("b", 2, 10, 1, "9", "250"), ("c", 1, 11, 2, "2", "300"))],
+            [fills_page(("c", 1, 11, 2, "2", "300"), ("d", 1, 10, "2", "1", "300"))],
+        ]
+
+        self.assertEqual(self.engine.update(ledger_client), 2)
+        self.assertEqual(self.engine.update(ledger_client), 1)  # "c" is returned again at the watermark but not re-applied
+
+        self.assertEqual(ledger_client.iter_fill_pages.call_args_list[0].kwargs["min_timestamp"], 100)
+        self.assertEqual(ledger_client.iter_fill_pages.call_args_list[1].kwargs["min_timestamp"], 300)
+        self.assertEqual(self.engine.positions(), {(1, 10): 7.0, (1, 11): -2.0})
+        self.assertEqual(list(self.engine._applied), ["c", "d"])  # older fills are no longer requested
+
+    def test_watermark_moves_past_fills_of_other_accounts(self):
+        self.engine.apply_fills(fills_page(("a", 1, 10, 1, "3", "200"), ("b", 2, 10, 1, "9", "250"))["fills"])
+        self.assertEqual(self.engine._fills_from(), 250)
+
+    def test_seed_sod_sums_records_of_a_position(self):
+        self.engine.seed_sod([{"accountId": 1, "instrumentId": 10, "netPosition": 5}, {"accountId": 1, "instrumentId": 10, "netPosition": -2}])
+        self.assertEqual(self.engine.position(1, 10), 3.0)
+
+    def test_reconcile(self):
+        self.engine.apply_fills(fills_page(("a", 1, 10, 1, "3", "200"))["fills"])
+        monitor_client = Mock(spec=TTMonitorClient)
+        monitor_client.get_all_position.return_value = {"positions": [
+            {"accountId": 1, "instrumentId": 10, "netPosition": 3},
+            {"accountId": 1, "instrumentId": 12, "netPosition": 4},
+            {"accountId": 2, "instrumentId": 12, "netPosition": 4},
+        ]}
+
+        drift = self.engine.reconcile(monitor_client)
+
+        self.assertEqual(drift, {(1, 12): {"local": 0.0, "remote": 4.0, "drift": -4.0}})
+        self.assertEqual(monitor_client.get_all_position.call_args.kwargs["account_ids"], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
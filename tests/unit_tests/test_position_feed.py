@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, Mock
+from ttrest import TTMonitorClient
+from ttrest import TTPositionWatcher, AsyncTTPositionWatcher
+from ttrest import UsageError
+from ttrest.position_feed import diff_positions, index_positions
+
+
+class TestDiffPositions(unittest.TestCase):
+    def test_diff(self):
+        previous = index_positions([
+            {"accountId": 1, "instrumentId": 10, "netPosition": 5, "updated": 1},
+            {"accountId": 1, "instrumentId": 11, "netPosition": 2, "updated": 1},
+            {"accountId": 2, "instrumentId": 10, "netPosition": 1, "updated": 1},
+        ])
+        current = index_positions([
+            {"accountId": 1, "instrumentId": 10, "netPosition": 7, "updated": 2},
+            {"accountId": 1, "instrumentId": 11, "netPosition": 2, "updated": 2},
+            {"accountId": 3, "instrumentId": 10, "netPosition": 1, "updated": 2},
+        ])
+
+        delta = diff_positions(previous, current, ignore_fields=["updated"])
+
+        self.assertEqual(list(delta.added), [(3, 10)])
+        self.assertEqual(list(delta.removed), [(2, 10)])
+        self.assertEqual(delta.changed[(1, 10)][1], {"netPosition": (5, 7)})
+        self.assertNotIn((1, 11), delta.changed)
+
+
+class TestTTPositionWatcher(unittest.TestCase):
+    def test_poll_notifies_deltas(self):
+        monitor_client = Mock(spec=TTMonitorClient)
+        monitor_client.get_all_position.side_effect = [
+            {"positions": [{"accountId": 1, "instrumentId": 10, "netPosition": 5}]},
+            {"positions": [{"accountId": 1, "instrumentId": 10, "netPosition": 5}]},
+            {"positions": [{"accountId": 1, "instrumentId": 10, "netPosition": 6}]},
+        ]
+        deltas = []
+        watcher = TTPositionWatcher(monitor_client, account_ids=[1])
+        watcher.subscribe(deltas.append)
+
+        for _ in range(3):
+            watcher.poll()
+
+        self.assertEqual(len(deltas), 2)  # the unchanged poll is not emitted
+        self.assertEqual(list(deltas[0].added), [(1, 10)])
+        self.assertEqual(deltas[1].changed[(1, 10)][1], {"netPosition": (5, 6)})
+
+    def test_failing_subscriber_does_not_lose_the_delta(self):
+        monitor_client = Mock(spec=TTMonitorClient)
+        monitor_client.get_all_position.return_value = {"positions": [{"accountId": 1, "instrumentId": 10}]}
+        deltas = []
+        watcher = TTPositionWatcher(monitor_client)
+        watcher.subscribe(Mock(side_effect=ValueError("bad subscriber")))
+        watcher.subscribe(deltas.append)
+
+        with self.assertLogs(level="ERROR"):
+            watcher.poll()
+
+        self.assertEqual(list(deltas[0].added), [(1, 10)])
+
+    def test_run_survives_a_failed_poll(self):
+        monitor_client = Mock(spec=TTMonitorClient)
+        monitor_client.get_all_position.side_effect = [UsageError("timed out"), {"positions": [{"accountId": 1, "instrumentId": 10}]}]
+        stop = threading.Event()
+        deltas = []
+        watcher = TTPositionWatcher(monitor_client, interval=0)
+        watcher.subscribe(lambda delta: (deltas.append(delta), stop.set()))
+
+        with self.assertLogs(level="ERROR"):
+            watcher.run(stop)
+
+        self.assertEqual(monitor_client.get_all_position.call_count, 2)
+        self.assertEqual(list(deltas[0].added), [(1, 10)])
+
+
+class TestAsyncTTPositionWatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_run_survives_a_failed_poll(self):
+        monitor_client = Mock()
+        monitor_client.get_all_position = AsyncMock(side_effect=[UsageError("timed out"), {"positions": [{"accountId": 1, "instrumentId": 10}]}])
+        stop = asyncio.Event()
+        watcher = AsyncTTPositionWatcher(monitor_client, interval=0)
+        watcher.subscribe(lambda delta: stop.set())
+
+        with self.assertLogs(level="ERROR"):
+            await asyncio.wait_for(watcher.run(stop), 1)
+
+        self.assertEqual(monitor_client.get_all_position.await_count, 2)
+
+    async def test_failing_subscriber_does_not_lose_the_delta(self):
+        monitor_client = Mock()
+        monitor_client.get_all_position = AsyncMock(return_value={"positions": [{"accountId": 1, "instrumentId": 10}]})
+        deltas = []
+        watcher = AsyncTTPositionWatcher(monitor_client)
+        watcher.subscribe(AsyncMock(side_effect=ValueError("bad subscriber")))
+        watcher.subscribe(deltas.append)
+
+        with self.assertLogs(level="ERROR"):
+            await watcher.poll()
+
+        self.assertEqual(len(deltas), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+from ttrest.prefetch import prefetch_iterator, async_prefetch_iterator
+from ttrest.rest_client import TTRestClient
+
+
+class TestPrefetchIterator(unittest.TestCase):
+    def test_preserves_order(self):
+        self.assertEqual(list(prefetch_iterator(iter(range(10)), depth=3)), list(range(10)))
+
+    def test_reads_ahead_while_consumer_works(self):
+        fetched = []
+        second_page_fetched = threading.Event()
+
+        def pages():
+            for page in range(3):
+                fetched.append(page)
+                if page == 1:
+                    second_page_fetched.set()
+                yield page
+
+        iterator = prefetch_iterator(pages(), depth=1)
+        self.assertEqual(next(iterator), 0)
+
+        # page 1 is requested in the background before the consumer asks for it
+        self.assertTrue(second_page_fetched.wait(timeout=5))
+        self.assertEqual(list(iterator), [1, 2])
+
+    def test_errors_are_raised_in_order(self):
+        def pages():
+            yield 1
+            raise ValueError("failed page")
+
+        iterator = prefetch_iterator(pages(), depth=2)
+
+        self.assertEqual(next(iterator), 1)
+        self.assertRaises(ValueError, next, iterator)
+
+    def test_depth_validated_when_called(self):
+        with self.assertRaises(ValueError):
+            prefetch_iterator(iter(range(3)), depth=0)
+
+    def test_iter_pages_prefetch(self):
+        tt_client = TTRestClient(MagicMock())
+
+        responses = [
+            {"results_key": [1, 2], "lastPage": "false", "nextPageKey": "page_2"},
+            {"results_key": [3], "lastPage": "true"}
+        ]
+
+        def mock_request_func(*args, **kwargs):
+            return responses.pop(0)
+
+        pages = tt_client.iter_pages(mock_request_func, prefetch=2)
+
+        self.assertEqual([page["results_key"] for page in pages], [[1, 2], [3]])
+
+
+class TestAsyncPrefetchIterator(unittest.IsolatedAsyncioTestCase):
+    async def test_preserves_order(self):
+        async def pages():
+            for page in range(5):
+                yield page
+
+        self.assertEqual([page async for page in async_prefetch_iterator(pages(), depth=2)], list(range(5)))
+
+    async def test_close_waits_for_producer(self):
+        async def pages():
+            for page in range(5):
+                yield page
+
+        iterator = async_prefetch_iterator(pages(), depth=1)
+        self.assertEqual(await iterator.__anext__(), 0)
+        await iterator.aclose()
+
+        # the producer has finished cancelling rather than being left pending
+        self.assertEqual([task for task in asyncio.all_tasks() if task is not asyncio.current_task()], [])
+
+        with self.assertRaises(ValueError):
+            async_prefetch_iterator(pages(), depth=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTLedgerClient
+from ttrest import TTRateLimiter
+from ttrest import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("ttrest.rate_limiter.time.monotonic", return_value=100.0)
+    def test_reserve_waits_once_burst_is_spent(self, mock_monotonic):
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+        stats = bucket.stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["waits"], 2)
+        self.assertAlmostEqual(stats["maxWait"], 1.0)
+
+    @patch("ttrest.rate_limiter.time.monotonic")
+    def test_refill(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.reserve()
+
+        mock_monotonic.return_value = 100.5
+        self.assertAlmostEqual(bucket.available, 0.5)
+
+        mock_monotonic.return_value = 105.0
+        self.assertAlmostEqual(bucket.available, 1.0)  # never above capacity
+
+
+class TestTTRateLimiter(unittest.TestCase):
+    def test_endpoint_rates(self):
+        rate_limiter = TTRateLimiter(default_rate=10, endpoint_rates={"ttledger": (5, 20)})
+
+        self.assertEqual(rate_limiter.bucket("ttledger").rate, 5)
+        self.assertEqual(rate_limiter.bucket("ttledger").capacity, 20)
+        self.assertEqual(rate_limiter.bucket("ttpds").rate, 10)
+        self.assertIs(rate_limiter.bucket("ttpds"), rate_limiter.bucket("ttpds"))
+
+    def test_unlimited_endpoint(self):
+        rate_limiter = TTRateLimiter(endpoint_rates={"ttledger": 5})
+
+        self.assertIsNone(rate_limiter.bucket("ttpds"))
+        self.assertEqual(rate_limiter.acquire("ttpds"), 0.0)
+        self.assertEqual(list(rate_limiter.stats()), [])
+
+    def test_clients_share_authenticator_limiter(self):
+        rate_limiter = TTRateLimiter(default_rate=100)
+        auth_handler = TTAuthenticator(TTEnvironments.UAT, "key", "key:secret", "YourApp", "YourCompany", rate_limiter=rate_limiter)
+        auth_handler._token = "Bearer token"
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+
+        for _ in range(2):
+            client = TTLedgerClient(auth_handler)
+            with patch.object(client.transport, "send", return_value=mock_response):
+                client.get_order_data()
+
+        self.assertEqual(rate_limiter.stats()["ttledger"]["requests"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTTransport
+from ttrest import TTPdsClient
+from ttrest import AsyncTTPdsClient
+from ttrest import TTReferenceCache
+
+
+class TestTTReferenceCache(unittest.TestCase):
+    @patch("ttrest.reference_cache.time.time")
+    def test_expires_per_endpoint(self, mock_time):
+        cache = TTReferenceCache(ttls={"instruments": 60})
+        mock_time.return_value = 1000
+        cache.put(TTEnvironments.UAT, "markets", {}, {"markets": [1]})
+        cache.put(TTEnvironments.UAT, "instruments", {"productId": 1}, {"instruments": [2]})
+
+        mock_time.return_value = 1061
+        self.assertEqual(cache.get(TTEnvironments.UAT, "markets"), {"markets": [1]})
+        self.assertIsNone(cache.get(TTEnvironments.UAT, "instruments", {"productId": 1}))
+        self.assertIsNone(cache.get(TTEnvironments.LIVE, "markets"))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_bounded_and_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reference.sqlite")
+            with TTReferenceCache(path, max_entries=2) as cache:
+                for product_id in range(3):
+                    cache.put(TTEnvironments.UAT, "product", {"productId": product_id}, {"id": product_id})
+                self.assertEqual(len(cache), 2)
+                # evicted from memory but still on disk
+                self.assertEqual(cache.get(TTEnvironments.UAT, "product", {"productId": 0}), {"id": 0})
+
+            with TTReferenceCache(path) as cache:
+                self.assertEqual(cache.get(TTEnvironments.UAT, "product", {"productId": 2}), {"id": 2})
+                cache.invalidate(name="product")
+                self.assertIsNone(cache.get(TTEnvironments.UAT, "product", {"productId": 2}))
+
+    def test_get_returns_a_copy(self):
+        cache = TTReferenceCache()
+        response = {"markets": [1]}
+        cache.put(TTEnvironments.UAT, "markets", {}, response)
+        response["markets"].append(2)
+        cache.get(TTEnvironments.UAT, "markets")["markets"].append(3)
+
+        self.assertEqual(cache.get(TTEnvironments.UAT, "markets"), {"markets": [1]})
+
+
+class TestTTPdsClientCache(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.client = TTPdsClient(self.auth_handler, cache=TTReferenceCache())
+
+    @patch("ttrest.pds.TTPdsClient._authenticated_get")
+    def test_get_markets_requested_once(self, mock_get):
+        mock_get.return_value.json.return_value = {"markets": [1]}
+
+        self.assertEqual(self.client.get_markets(), {"markets": [1]})
+        self.assertEqual(self.client.get_markets(), {"markets": [1]})
+        mock_get.assert_called_once()
+
+    @patch("ttrest.pds.TTPdsClient.get_products")
+    def test_get_all_products_cached_per_market(self, mock_get_products):
+        mock_get_products.__name__ = "get_products"
+        mock_get_products.side_effect = lambda market_id: {"products": [market_id], "lastPage": "true"}
+
+        for market_id in (1, 2, 1):
+            self.assertEqual(self.client.get_all_products(market_id)["products"], [market_id])
+        self.assertEqual(mock_get_products.call_count, 2)
+
+    def test_get_product_families_requested_once(self):
+        # the query goes through the real request path, which adds a request ID without changing the cache key
+        self.auth_handler.rate_limiter = None
+        self.auth_handler.authenticate_request.side_effect = lambda request: request
+        client = TTPdsClient(self.auth_handler, transport=TTTransport(), cache=TTReferenceCache())
+        response = Mock(status_code=200, **{"json.return_value": {"productFamilies": [1]}})
+
+        with patch.object(client.transport, "send", return_value=response) as mock_send:
+            self.assertEqual(client.get_product_families([1, 2]), {"productFamilies": [1]})
+            self.assertEqual(client.get_product_families([1, 2]), {"productFamilies": [1]})
+        mock_send.assert_called_once()
+
+    @patch("ttrest.pds.TTPdsClient.get_products")
+    def test_concurrent_misses_request_once(self, mock_get_products):
+        mock_get_products.__name__ = "get_products"
+        mock_get_products.side_effect = lambda market_id: time.sleep(0.05) or {"products": [market_id], "lastPage": "true"}
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(self.client.get_all_products, [1] * 4))
+
+        self.assertEqual([result["products"] for result in results], [[1]] * 4)
+        self.assertEqual(mock_get_products.call_count, 1)
+        self.assertEqual(self.client._flights, {})
+
+
+class TestAsyncTTPdsClientCache(unittest.IsolatedAsyncioTestCase):
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_get_instrument_requested_once(self, mock_send):
+        mock_send.return_value = Mock(**{"json.return_value": {"instrument": [1]}})
+        auth_handler = Mock(spec=TTAuthenticator)
+        auth_handler.environment = TTEnvironments.UAT
+        client = AsyncTTPdsClient(auth_handler, cache=TTReferenceCache())
+
+        self.assertEqual(await client.get_instrument(1), {"instrument": [1]})
+        self.assertEqual(await client.get_instrument(1), {"instrument": [1]})
+        mock_send.assert_called_once()
+
+    @patch("ttrest.async_rest_client.AsyncTTRestClient._send")
+    async def test_concurrent_misses_request_once(self, mock_send):
+        async def send(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return Mock(**{"json.return_value": {"instrument": [1]}})
+        mock_send.side_effect = send
+        auth_handler = Mock(spec=TTAuthenticator)
+        auth_handler.environment = TTEnvironments.UAT
+        client = AsyncTTPdsClient(auth_handler, cache=TTReferenceCache())
+
+        results = await asyncio.gather(*(client.get_instrument(1) for _ in range(4)))
+
+        self.assertEqual(results, [{"instrument": [1]}] * 4)
+        mock_send.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
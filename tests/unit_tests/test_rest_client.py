@@ -93,6 +93,42 @@ class TestTTRestClient(unittest.TestCase):
             "lastPage": "false"
         })
 
+    def test_iter_pages_is_lazy(self):
+        tt_client = TTRestClient(self.auth_handler)
+
+        responses = [
+            {"results_key": [1, 2], "lastPage": "false", "nextPageKey": "page_2"},
+            {"results_key": [3], "lastPage": "true"}
+        ]
+        calls = []
+
+        def mock_request_func(*args, **kwargs):
+            calls.append(kwargs)
+            return responses.pop(0)
+
+        pages = tt_client.iter_pages(mock_request_func, arg1="arg1")
+        self.assertEqual(calls, [])
+
+        self.assertEqual(next(pages)["results_key"], [1, 2])
+        self.assertEqual(len(calls), 1)
+
+        self.assertEqual(next(pages)["results_key"], [3])
+        self.assertEqual(calls[1], {"arg1": "arg1", "next_page_key": "page_2"})
+        self.assertRaises(StopIteration, next, pages)
+
+    def test_iter_records(self):
+        tt_client = TTRestClient(self.auth_handler)
+
+        responses = [
+            {"results_key": [1, 2], "lastPage": "false", "nextPageKey": "page_2"},
+            {"results_key": [3], "lastPage": "true"}
+        ]
+
+        def mock_request_func(*args, **kwargs):
+            return responses.pop(0)
+
+        self.assertEqual(list(tt_client._iter_records(mock_request_func, "results_key")), [1, 2, 3])
+
 
 if __name__ == '__main__':
     unittest.main()
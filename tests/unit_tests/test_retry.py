@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTPdsClient
+from ttrest import TTTransport
+from ttrest import RetryPolicy
+from ttrest import CircuitBreaker
+from ttrest import CircuitOpenError
+from ttrest import PostRequestError
+
+
+def mock_response(status_code, json=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = json or {}
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+
+        self.assertEqual([policy.get_backoff(attempt) for attempt in range(4)], [0.5, 1.0, 2.0, 3])
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff=10)
+
+        self.assertEqual(policy.get_backoff(0, mock_response(429, headers={"Retry-After": "4"})), 4.0)
+        self.assertEqual(policy.get_backoff(0, mock_response(429, headers={"Retry-After": "120"})), 10)
+
+    def test_only_idempotent_methods_retry(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.can_retry("get", 1))
+        self.assertFalse(policy.can_retry("get", 2))
+        self.assertFalse(policy.can_retry("post", 0))
+
+    @patch("ttrest.retry.time.monotonic")
+    def test_circuit_breaker(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker("ttpds", failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        mock_monotonic.return_value = 131.0
+        breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @patch("ttrest.retry.time.monotonic")
+    def test_half_open_allows_one_trial_until_it_times_out(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker("ttpds", failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 131.0
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        # the trial never reported back
+        mock_monotonic.return_value = 161.0
+        breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+@patch("ttrest.rest_client.time.sleep")
+class TestClientRetries(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.auth_handler.rate_limiter = None
+        self.auth_handler.authenticate_request.side_effect = lambda request: request
+        self.transport = TTTransport(retry_policy=RetryPolicy(max_retries=2, jitter=False))
+        self.client = TTPdsClient(self.auth_handler, transport=self.transport)
+
+    def test_pagination_resumes_from_failed_page(self, mock_sleep):
+        responses = [
+            mock_response(200, {"instruments": [1], "lastPage": "false", "nextPageKey": "page2"}),
+            mock_response(502),
+            mock_response(200, {"instruments": [2], "lastPage": "true"}),
+        ]
+
+        with patch.object(self.transport, "send", side_effect=responses) as mock_send:
+            result = self.client.get_all_instruments(product_id=1)
+
+        self.assertEqual(result["instruments"], [1, 2])
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertIn("nextPageKey=page2", mock_send.call_args_list[1].args[0].url)
+        self.assertIn("nextPageKey=page2", mock_send.call_args_list[2].args[0].url)
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        with patch.object(self.transport, "send", return_value=mock_response(503)) as mock_send:
+            with self.assertRaises(PostRequestError):
+                self.client.get_markets()
+
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_client_errors_are_not_retried(self, mock_sleep):
+        with patch.object(self.transport, "send", return_value=mock_response(400)) as mock_send:
+            with self.assertRaises(PostRequestError):
+                self.client.get_markets()
+
+        self.assertEqual(mock_send.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch("ttrest.retry.time.monotonic")
+    def test_unexpected_error_in_trial_reopens_circuit(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        client = TTPdsClient(self.auth_handler, transport=TTTransport(retry_policy=RetryPolicy(failure_threshold=1, reset_timeout=30)))
+        breaker = client.transport.retry_policy.circuit_breaker("ttpds")
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 131.0
+        self.auth_handler.authenticate_request.side_effect = RuntimeError("token")
+        with self.assertRaises(RuntimeError):
+            client.get_markets()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # another trial follows once the reset timeout has passed again
+        mock_monotonic.return_value = 162.0
+        self.auth_handler.authenticate_request.side_effect = lambda request: request
+        with patch.object(client.transport, "send", return_value=mock_response(200, {"markets": []})):
+            self.assertEqual(client.get_markets(), {"markets": []})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTMonitorClient
+from ttrest import TTSodCache
+
+
+class TestTTSodCache(unittest.TestCase):
+    def test_trading_date_rolls_over(self):
+        cache = TTSodCache()
+
+        # 16:59 and 17:00 Chicago time (CDT, UTC-5)
+        self.assertEqual(cache.trading_date(datetime(2024, 6, 3, 21, 59, tzinfo=timezone.utc)), date(2024, 6, 3))
+        self.assertEqual(cache.trading_date(datetime(2024, 6, 3, 22, 0, tzinfo=timezone.utc)), date(2024, 6, 4))
+
+    def test_trading_date_skips_the_weekend(self):
+        cache = TTSodCache()
+
+        # Friday 17:00, Saturday and Sunday before and after 17:00 Chicago time all trade for Monday
+        for now in (datetime(2024, 6, 7, 22, 0), datetime(2024, 6, 8, 12, 0), datetime(2024, 6, 9, 12, 0), datetime(2024, 6, 9, 22, 0)):
+            self.assertEqual(cache.trading_date(now.replace(tzinfo=timezone.utc)), date(2024, 6, 10))
+        self.assertEqual(cache.trading_date(datetime(2024, 6, 7, 21, 59, tzinfo=timezone.utc)), date(2024, 6, 7))
+
+    def test_get_returns_a_copy(self):
+        cache = TTSodCache()
+        sod = {"sod": [{"netPosition": 5}]}
+        cache.put(TTEnvironments.UAT, 1, sod, date(2024, 6, 3))
+        sod["sod"][0]["netPosition"] = 1
+        cache.get(TTEnvironments.UAT, 1, date(2024, 6, 3))["sod"][0]["netPosition"] *= 10
+
+        self.assertEqual(cache.get(TTEnvironments.UAT, 1, date(2024, 6, 3)), {"sod": [{"netPosition": 5}]})
+
+    def test_purged_once_per_trading_date(self):
+        cache = TTSodCache(":memory:")
+        cache._purge = Mock(wraps=cache._purge)
+
+        for _ in range(3):
+            cache.get(TTEnvironments.UAT, 1, date(2024, 6, 3))
+        cache.get(TTEnvironments.UAT, 1, date(2024, 6, 4))
+
+        self.assertEqual(cache._purge.call_count, 2)
+
+    def test_persisted_and_purged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sod.sqlite")
+            with TTSodCache(path) as cache:
+                cache.put(TTEnvironments.UAT, 1, {"sod": [1]}, date(2024, 6, 3))
+
+            with TTSodCache(path) as cache:
+                self.assertEqual(cache.get(TTEnvironments.UAT, "1", date(2024, 6, 3)), {"sod": [1]})
+                self.assertIsNone(cache.get(TTEnvironments.LIVE, 1, date(2024, 6, 3)))
+
+                # the next trading date no longer sees, and purges, the previous one's SODs
+                self.assertIsNone(cache.get(TTEnvironments.UAT, 1, date(2024, 6, 4)))
+                self.assertIsNone(cache.get(TTEnvironments.UAT, 1, date(2024, 6, 3)))
+
+    @patch("ttrest.monitor.TTMonitorClient.get_sod")
+    def test_get_all_sod_cached(self, mock_get_sod):
+        mock_get_sod.__name__ = "get_sod"
+        mock_get_sod.side_effect = lambda account_id: {"sod": [account_id], "lastPage": "true"}
+        auth_handler = Mock(spec=TTAuthenticator)
+        auth_handler.environment = TTEnvironments.UAT
+        client = TTMonitorClient(auth_handler)
+        cache = TTSodCache()
+
+        self.assertEqual(client.get_all_sod(7, cache=cache)["sod"], [7])
+        self.assertEqual(client.get_all_sod(7, cache=cache)["sod"], [7])
+        self.assertEqual(mock_get_sod.call_count, 1)
+
+        client.get_all_sod(7, cache=cache, refresh=True)
+        self.assertEqual(mock_get_sod.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTLedgerClient
+from ttrest.tail import AdaptivePollInterval
+
+
+class TestAdaptivePollInterval(unittest.TestCase):
+    def test_update(self):
+        interval = AdaptivePollInterval(min_interval=1, max_interval=8)
+
+        self.assertEqual([interval.update(0) for _ in range(4)], [2, 4, 8, 8])
+        self.assertEqual(interval.update(5), 4)
+        self.assertEqual(interval.update(5, headroom=0.2), 8)  # busy, but the rate limit budget is running low
+        self.assertEqual(interval.update(5, headroom=1.0), 4)
+
+
+class TestTailFills(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.rate_limiter = None
+        self.ledger_client = TTLedgerClient(self.auth_handler)
+
+    @patch("ttrest.ledger.TTLedgerClient.get_fills")
+    def test_follow_fills(self, mock_get_fills):
+        mock_get_fills.side_effect = [
+            {"fills": [{"recordId": "a", "timeStamp": "100"}, {"recordId": "b", "timeStamp": "200"}]},
+            {"fills": []},
+            # the fill at the watermark timestamp is returned again alongside one that arrived later
+            {"fills": [{"recordId": "b", "timeStamp": "200"}, {"recordId": "c", "timeStamp": "200"}]},
+        ]
+        stop = threading.Event()
+        batches = []
+
+        def callback(fills):
+            batches.append([fill["recordId"] for fill in fills])
+            if len(batches) == 2:
+                stop.set()
+
+        self.ledger_client.follow_fills(callback, min_timestamp=50, account_id=1, stop=stop, min_interval=0.001, max_interval=0.01)
+
+        self.assertEqual(batches, [["a", "b"], ["c"]])
+        self.assertEqual([call.kwargs["min_timestamp"] for call in mock_get_fills.call_args_list], [50, 200, 200])
+        self.assertEqual(mock_get_fills.call_args_list[0].kwargs["account_id"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
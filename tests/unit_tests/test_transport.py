@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import Mock, patch
+from ttrest import TTAuthenticator
+from ttrest import TTEnvironments
+from ttrest import TTLedgerClient
+from ttrest import TTPdsClient
+from ttrest import TTTransport
+
+
+class TestTTTransport(unittest.TestCase):
+    def setUp(self):
+        self.auth_handler = Mock(spec=TTAuthenticator)
+        self.auth_handler.environment = TTEnvironments.UAT
+        self.auth_handler.app_name = "YourApp"
+        self.auth_handler.company_name = "YourCompany"
+        self.auth_handler.authenticate_request.side_effect = lambda request: request
+
+    def test_session_is_reused(self):
+        transport = TTTransport(pool_maxsize=4)
+        session = transport.session
+
+        self.assertIs(transport.session, session)
+        self.assertEqual(transport.session.get_adapter("https://ttrestapi.trade.tt")._pool_maxsize, 4)
+
+        transport.close()
+        self.assertTrue(transport.closed)
+
+    def test_clients_share_transport(self):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {}
+
+        with TTTransport() as transport:
+            with patch.object(transport, "send", return_value=mock_response) as mock_send:
+                TTLedgerClient(self.auth_handler, transport=transport).get_fills()
+                TTPdsClient(self.auth_handler, transport=transport).get_markets()
+
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_client_does_not_close_shared_transport(self):
+        transport = TTTransport()
+        transport.session  # open the session
+
+        with TTLedgerClient(self.auth_handler, transport=transport):
+            pass
+
+        self.assertFalse(transport.closed)
+        transport.close()
+
+    def test_client_closes_own_transport(self):
+        with TTLedgerClient(self.auth_handler) as client:
+            client.transport.session  # open the session
+
+        self.assertTrue(client.transport.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,22 @@
 from .environments import TTEnvironments
 from .authenticator import TTAuthenticator
-from .account import TTAccountClient
-from .ledger import TTLedgerClient
-from .monitor import TTMonitorClient
-from .user import TTUserClient
-from .pds import TTPdsClient
-from .exceptions import TokenGenerationError, NotAuthorisedError, UsageError, PostRequestError
+from .transport import TTTransport, AsyncTTTransport
+from .bulk import BulkResult, CrawlReport
+from .rate_limiter import TTRateLimiter, TokenBucket
+from .retry import RetryPolicy, CircuitBreaker
+from .checkpoint import TTCheckpointStore, Checkpoint
+from .fill_store import TTFillStore
+from .sod_cache import TTSodCache
+from .reference_cache import TTReferenceCache
+from .enums import TTEnumRegistry, EnumDecoder
+from .analytics import FillAggregator
+from .account import TTAccountClient, AsyncTTAccountClient
+from .ledger import TTLedgerClient, AsyncTTLedgerClient
+from .monitor import TTMonitorClient, AsyncTTMonitorClient
+from .position_feed import TTPositionWatcher, AsyncTTPositionWatcher, PositionDelta
+from .position_engine import TTPositionEngine, AsyncTTPositionEngine
+from .user import TTUserClient, AsyncTTUserClient
+from .pds import TTPdsClient, AsyncTTPdsClient
+from .instrument_index import InstrumentIndex, AsyncInstrumentIndex
+from .currency import CurrencyRateMatrix, AsyncCurrencyRateMatrix
+from .exceptions import TokenGenerationError, NotAuthorisedError, UsageError, PostRequestError, CircuitOpenError
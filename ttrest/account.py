@@ -1,5 +1,7 @@
 from .rest_client import TTRestClient
+from .async_rest_client import AsyncTTRestClient
 from .authenticator import TTAuthenticator
+from .transport import TTTransport
 
 
 class TTAccountClient(TTRestClient):
@@ -8,11 +10,12 @@ class TTAccountClient(TTRestClient):
 
     Args:
         auth_handler (TTAuthenticator): An authenticator.
+        transport (TTTransport, optional): A pooled HTTP transport to share with other clients. Default is None.
     """
     endpoint = "ttaccount"
 
-    def __init__(self, auth_handler: TTAuthenticator):
-        super().__init__(auth_handler)
+    def __init__(self, auth_handler: TTAuthenticator, transport: TTTransport = None):
+        super().__init__(auth_handler, transport)
 
     def get_limits(self, account_id, next_page_key=None):
         """
@@ -56,6 +59,36 @@ class TTAccountClient(TTRestClient):
             account_id=account_id
         )
 
+    def iter_limits(self, account_id):
+        """
+        Iterates over the account limits for the specified account ID, requesting each page only once the previous one
+        has been consumed.
+
+        Args:
+            account_id: The account ID. Can be retrieved from the get_accounts() method.
+
+        Returns:
+            generator: Account limit records.
+        """
+        return self._iter_records(
+            self.get_limits,
+            "accountLimits",
+            account_id=account_id
+        )
+
+    def get_all_limits_by_account_ids(self, account_ids, max_workers=None):
+        """
+        Gets all account limits for many account IDs, requesting each account concurrently.
+
+        Args:
+            account_ids: An iterable of account IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses and errors keyed by account ID, in input order.
+        """
+        return self._bulk_request(self.get_all_limits, account_ids, max_workers=max_workers)
+
     def get_accounts(self, mine_only: bool = False, next_page_key=None):
         """
         Gets a list of accounts associated with the application key.
@@ -99,3 +132,33 @@ class TTAccountClient(TTRestClient):
             results_key="accounts",
             mine_only=mine_only
         )
+
+    def iter_accounts(self, mine_only: bool = False):
+        """
+        Iterates over the accounts associated with the application key, requesting each page only once the previous
+        one has been consumed.
+
+        Args:
+            mine_only (bool): Set as True to return only the account through which the user can trade.
+
+        Returns:
+            generator: Account records.
+
+        Raises:
+            PostRequestError: If the response status code is not 200.
+        """
+        return self._iter_records(
+            self.get_accounts,
+            "accounts",
+            mine_only=mine_only
+        )
+
+
+class AsyncTTAccountClient(AsyncTTRestClient, TTAccountClient):
+    """
+    An asyncio Rest API Client implementing the TT Account endpoints. Methods mirror TTAccountClient and return awaitables.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport to share with other clients. Default is None.
+    """
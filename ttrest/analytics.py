@@ -0,0 +1,210 @@
+import logging
+from array import array
+
+log = logging.getLogger()
+
+
+class FillAggregator:
+    """
+    Running per-instrument/per-account fill aggregates, updated a page of fills at a time.
+
+    Buy and sell quantity and notional are kept in compact arrays indexed by key, so memory grows with the number of
+    instrument/account pairs rather than the number of fills and the aggregates can be read at any point during a pull.
+    Aggregators built from shards of different keys (e.g. accounts) merge exactly, see merge().
+
+    Realized P&L is kept at average cost, in fill order: a fill that reduces the position realizes the closed quantity
+    times its price less the position's average price. It assumes the position was flat before the first fill and is in
+    price units, multiply by the contract point value for currency. Fills whose side is neither a buy nor a sell are
+    skipped.
+
+    Args:
+        key_fields (tuple, optional): The fill fields to aggregate by. Default is ("instrumentId", "accountId").
+
+    Example:
+        aggregator = FillAggregator()
+        for page in ledger_client.iter_fill_pages(min_timestamp=start_of_day):
+            aggregator.add(page["fills"])
+            print(aggregator.stats(aggregator.keys()[0]))
+    """
+
+    PRICE_FIELD = "lastPx"
+    QUANTITY_FIELD = "lastQty"
+    SIDE_FIELD = "side"
+    BUY_SIDES = frozenset([1, "1", "Buy", "BUY"])
+    SELL_SIDES = frozenset([2, "2", "Sell", "SELL"])
+
+    def __init__(self, key_fields: tuple = ("instrumentId", "accountId")):
+        self.key_fields = tuple(key_fields)
+        self._index = {}
+        self._fills = array("q")
+        self._buy_quantity = array("d")
+        self._buy_notional = array("d")
+        self._sell_quantity = array("d")
+        self._sell_notional = array("d")
+        self._position = array("d")
+        self._average_price = array("d")
+        self._realized = array("d")
+        self.skipped = 0
+
+    def _slot(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            slot = self._index[key] = len(self._fills)
+            self._fills.append(0)
+            for column in (self._buy_quantity, self._buy_notional, self._sell_quantity, self._sell_notional,
+                           self._position, self._average_price, self._realized):
+                column.append(0.0)
+        return slot
+
+    def add(self, fills):
+        """
+        Add a page of fills to the aggregates. Pages and the fills in them must be added in the order they happened.
+
+        Args:
+            fills (list): Fill records, e.g. the "fills" of a get_fills() response.
+
+        Returns:
+            FillAggregator: The aggregator.
+        """
+        for fill in fills:
+            side = fill.get(self.SIDE_FIELD)
+            if side in self.BUY_SIDES:
+                quantity_column, notional_column, sign = self._buy_quantity, self._buy_notional, 1.0
+            elif side in self.SELL_SIDES:
+                quantity_column, notional_column, sign = self._sell_quantity, self._sell_notional, -1.0
+            else:
+                self.skipped += 1
+                continue
+
+            slot = self._slot(tuple(fill.get(field) for field in self.key_fields))
+            quantity = float(fill[self.QUANTITY_FIELD])
+            price = float(fill[self.PRICE_FIELD])
+            self._fills[slot] += 1
+            quantity_column[slot] += quantity
+            notional_column[slot] += quantity * price
+            self._trade(slot, sign * quantity, price)
+        return self
+
+    def _trade(self, slot, quantity, price):
+        # apply a signed fill quantity to the slot's average cost position
+        position, average_price = self._position[slot], self._average_price[slot]
+        if position * quantity >= 0:
+            opened = position + quantity
+            self._average_price[slot] = (average_price * position + price * quantity) / opened if opened else 0.0
+        else:
+            closed = min(abs(quantity), abs(position))
+            self._realized[slot] += closed * (price - average_price) * (1.0 if position > 0 else -1.0)
+            opened = position + quantity
+            if opened == 0:
+                self._average_price[slot] = 0.0
+            elif opened * position < 0:
+                # the fill closed the position and opened one on the other side
+                self._average_price[slot] = price
+        self._position[slot] = opened
+
+    def consume(self, pages, results_key: str = "fills"):
+        """
+        Add every page of a page iterator, e.g. iter_fill_pages(), without keeping the pages.
+
+        Args:
+            pages: An iterable of fills responses.
+            results_key (str, optional): The key holding the fills in each page. Default is "fills".
+
+        Returns:
+            FillAggregator: The aggregator.
+        """
+        for page in pages:
+            self.add(page.get(results_key, []))
+        return self
+
+    def merge(self, other):
+        """
+        Add the aggregates of another aggregator, e.g. one built from a different shard of fills.
+
+        Realized P&L depends on the order of the fills, so a key both aggregators hold is only merged if this
+        aggregator's position in it is flat, other's fills then being the ones that followed. Shards of different keys
+        (e.g. accounts) always merge.
+
+        Args:
+            other (FillAggregator): An aggregator with the same key fields.
+
+        Returns:
+            FillAggregator: The aggregator.
+
+        Raises:
+            ValueError: If the key fields differ, or other holds fills of a key whose position is open here.
+        """
+        if other.key_fields != self.key_fields:
+            raise ValueError(f"Cannot merge aggregates keyed by {other.key_fields} into {self.key_fields}")
+
+        open_keys = [key for key in other._index if key in self._index and self._position[self._index[key]]]
+        if open_keys:
+            raise ValueError(f"Cannot merge fills onto the open positions of {len(open_keys)} keys, e.g. {open_keys[0]}")
+
+        for key, other_slot in other._index.items():
+            slot = self._slot(key)
+            self._fills[slot] += other._fills[other_slot]
+            self._buy_quantity[slot] += other._buy_quantity[other_slot]
+            self._buy_notional[slot] += other._buy_notional[other_slot]
+            self._sell_quantity[slot] += other._sell_quantity[other_slot]
+            self._sell_notional[slot] += other._sell_notional[other_slot]
+            self._position[slot] = other._position[other_slot]
+            self._average_price[slot] = other._average_price[other_slot]
+            self._realized[slot] += other._realized[other_slot]
+        self.skipped += other.skipped
+        return self
+
+    def keys(self):
+        """
+        Get the keys with at least one fill.
+
+        Returns:
+            list: Tuples of the key field values, e.g. (instrumentId, accountId).
+        """
+        return list(self._index)
+
+    def stats(self, key):
+        """
+        Get the aggregates for a key.
+
+        Args:
+            key (tuple): The key field values, e.g. (instrumentId, accountId).
+
+        Returns:
+            dict: fills, buyQty, sellQty, volume, netQty, buyVwap, sellVwap, vwap and realizedPnl. A VWAP is None when
+                  there is no quantity on that side.
+        """
+        slot = self._index[key]
+        buy_quantity, buy_notional = self._buy_quantity[slot], self._buy_notional[slot]
+        sell_quantity, sell_notional = self._sell_quantity[slot], self._sell_notional[slot]
+        volume = buy_quantity + sell_quantity
+
+        buy_vwap = buy_notional / buy_quantity if buy_quantity else None
+        sell_vwap = sell_notional / sell_quantity if sell_quantity else None
+
+        return {
+            "fills": self._fills[slot],
+            "buyQty": buy_quantity,
+            "sellQty": sell_quantity,
+            "volume": volume,
+            "netQty": buy_quantity - sell_quantity,
+            "buyVwap": buy_vwap,
+            "sellVwap": sell_vwap,
+            "vwap": (buy_notional + sell_notional) / volume if volume else None,
+            "realizedPnl": self._realized[slot],
+        }
+
+    def results(self):
+        """
+        Get the aggregates for every key.
+
+        Returns:
+            dict: stats() keyed by key, in the order keys were first seen.
+        """
+        return {key: self.stats(key) for key in self._index}
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(keys={len(self)}, fills={sum(self._fills)}, skipped={self.skipped})"
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+from .bulk import BulkResult
+from .exceptions import PostRequestError
+from .prefetch import async_prefetch_iterator
+from .rest_client import TTRestClient
+from .transport import AsyncTTTransport
+
+try:
+    import httpx
+except ImportError:  # httpx is only required by the async clients, see extras_require in setup.py
+    httpx = None
+
+log = logging.getLogger()
+
+
+class _PendingResponse:
+    """
+    Stands in for the response returned by _authenticated_get in the async clients.
+
+    The request methods of the sync clients build a URL and query, call _authenticated_get and return response.json().
+    Returning this object instead of a response lets the async clients reuse those methods unchanged: json() returns a
+    coroutine which sends the request and resolves to the decoded JSON, so the sync method ends up returning an
+    awaitable.
+    """
+
+    def __init__(self, client, url, header, data, query, http_method):
+        self._client = client
+        self._url = url
+        self._header = header
+        self._data = data
+        self._query = query
+        self._http_method = http_method
+
+    async def _json(self):
+        response = await self._client._send(self._url, self._header, self._data, self._query, self._http_method)
+        return response.json()
+
+    def json(self):
+        return self._json()
+
+
+class AsyncTTRestClient(TTRestClient):
+    """
+    A base client for handling authenticated asyncio requests to the Trading Technologies API.
+
+    The async clients share the URL and query building of their sync counterparts, every request method returns an
+    awaitable instead of the JSON response. Requires the optional httpx dependency (pip install tt-rest-api[async]).
+
+    Args:
+        auth_handler (TTAuthentication): An instance of TTAuthentication for handling authentication.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport, which can be shared between clients. If
+                                                not given the client creates and owns its own transport. Default is
+                                                None.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 10
+
+    def __init__(self, auth_handler, transport: AsyncTTTransport = None):
+        self.auth_handler = auth_handler
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else AsyncTTTransport()
+
+    async def close(self):
+        """
+        Close the client's connections. A transport passed in by the caller is left open for its owner to close.
+        """
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _authenticated_get(self, url, header=None, data=None, query=None, http_method="get"):
+        return _PendingResponse(self, url, header, data, query, http_method)
+
+    async def _send(self, url, header=None, data=None, query=None, http_method="get"):
+        """
+        Send an authenticated HTTP request to the Trading Technologies API.
+
+        Args:
+            url (str): The API endpoint URL.
+            header (dict, optional): Headers to include in the request. Default is None.
+            data: (dict, optional): Request payload data. Default is None.
+            query: (dict, optional): Query parameters to include in the request. Default is None.
+            http_method (str, optional): The HTTP method to use. Default is "get".
+
+        Returns:
+            httpx.Response: The response object from the API request.
+
+        Raises:
+            PostRequestError: If the response status code is not 200, after any retries allowed by the transport's
+                              retry policy.
+            CircuitOpenError: If the circuit breaker for the client's endpoint is open.
+        """
+
+        log.debug(f"Async HTTP GET request to TT REST API 2.0 {url}")
+
+        retry_policy = self.transport.retry_policy
+        circuit_breaker = retry_policy.circuit_breaker(self.endpoint) if retry_policy is not None else None
+        attempt = 0
+
+        while True:
+            if circuit_breaker is not None:
+                circuit_breaker.before_request()
+
+            try:
+                query = self._add_request_id(query)
+
+                if self.auth_handler.rate_limiter is not None:
+                    await self.auth_handler.rate_limiter.acquire_async(self.endpoint)
+
+                request = httpx.Request(http_method.upper(), url=url, headers=header, data=data, params=query)
+                request = await self.auth_handler.authenticate_request_async(request, self.transport.client)
+
+                try:
+                    response = await self.transport.send(request)
+                except httpx.TransportError as e:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_failure()
+                    if retry_policy is None or not retry_policy.can_retry(http_method, attempt):
+                        raise
+                    backoff = retry_policy.get_backoff(attempt)
+                    log.warning(f"Async HTTP GET request to {url} failed ({e}), retry {attempt + 1} in {backoff:.2f}s")
+                    await asyncio.sleep(backoff)
+                    attempt += 1
+                    continue
+
+                if response.status_code == 200 or retry_policy is None or not retry_policy.is_retryable_status(response.status_code):
+                    # the service responded, even if the request itself was rejected
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    break
+
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if not retry_policy.can_retry(http_method, attempt):
+                    break
+                backoff = retry_policy.get_backoff(attempt, response)
+                log.warning(f"Async HTTP GET request to {url} returned {response.status_code}, retry {attempt + 1} in {backoff:.2f}s")
+                await asyncio.sleep(backoff)
+                attempt += 1
+            except BaseException:
+                # an exception the attempt didn't expect (authentication, cancellation, ...) must not leave a
+                # trial request unreported, or the circuit would stay half open
+                if circuit_breaker is not None:
+                    circuit_breaker.record_abandoned()
+                raise
+
+        if response.status_code != 200:
+            raise PostRequestError(response)
+
+        return response
+
+    def _prefetch(self, pages, prefetch):
+        return async_prefetch_iterator(pages, prefetch) if prefetch else pages
+
+    async def _iter_pages(self, request_func, *args, **kwargs):
+        json_response = await request_func(*args, **kwargs)
+        kwargs.pop("next_page_key", None)  # the first page may have been requested with a key when resuming
+        yield json_response
+
+        is_last_page = json_response["lastPage"].lower().strip() == "true"
+        while not is_last_page:
+            if "nextPageKey" not in json_response:
+                error_message = f"'nextPageKey' not returned in server response to {request_func.__name__}(). Returning the retrieved, but possibly incomplete data."
+                logging.warning(error_message)
+                break
+
+            next_page_key = json_response["nextPageKey"]
+            json_response = await request_func(*args, **kwargs, next_page_key=next_page_key)
+            is_last_page = json_response["lastPage"].lower().strip() == "true"
+            logging.debug(f"{request_func.__name__}: lastPage={is_last_page}, nextPageKey={next_page_key}")
+            yield json_response
+
+    async def _iter_page_records(self, pages, results_key):
+        async for page in pages:
+            for record in page.get(results_key, []):
+                yield record
+
+    async def _checkpointed_pages(self, pages, checkpoint, next_cursor, store_pages=False):
+        if checkpoint.complete:
+            log.info(f"Checkpoint {checkpoint.name} is complete, there are no more pages to request")
+            return
+
+        async for page in pages:
+            yield page
+            # only reached once the caller has finished with the page and asks for the next one
+            checkpoint.save(next_cursor(page), page if store_pages else None)
+
+        checkpoint.mark_complete()
+
+    async def _collect_pages(self, pages, results_key, stored_pages=()):
+        items = [item for page in stored_pages for item in page[results_key]]
+        json_response = stored_pages[-1] if stored_pages else {}
+
+        async for json_response in pages:
+            items.extend(json_response.get(results_key, []))
+
+        json_response.update({results_key: items})
+        return json_response
+
+    async def _bulk_request(self, request_func, ids, max_workers=None, **kwargs):
+        result = BulkResult(list(dict.fromkeys(ids)))
+        semaphore = asyncio.Semaphore(max_workers or self.DEFAULT_MAX_CONCURRENCY)
+
+        async def bounded_request(item_id):
+            async with semaphore:
+                return await request_func(item_id, **kwargs)
+
+        responses = await asyncio.gather(*[bounded_request(item_id) for item_id in result.ids], return_exceptions=True)
+
+        for item_id, response in zip(result.ids, responses):
+            if isinstance(response, BaseException) and not isinstance(response, Exception):
+                # cancellation (or an interpreter exit) is not a failed id, gather returned it rather than raising it
+                raise response
+            if isinstance(response, Exception):
+                log.warning(f"{request_func.__name__}({item_id}) failed in bulk request: {response}")
+                result.errors[item_id] = response
+            else:
+                result.results[item_id] = response
+
+        log.debug(f"{request_func.__name__}: bulk request for {len(result)} ids, {len(result.errors)} errors")
+        return result
+
+    async def _iter_bulk_request(self, request_func, ids, max_workers=None, **kwargs):
+        semaphore = asyncio.Semaphore(max_workers or self.DEFAULT_MAX_CONCURRENCY)
+
+        async def bounded_request(item_id):
+            async with semaphore:
+                try:
+                    return item_id, await request_func(item_id, **kwargs), None
+                except Exception as e:
+                    return item_id, None, e
+
+        tasks = [asyncio.ensure_future(bounded_request(item_id)) for item_id in dict.fromkeys(ids)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item_id, response, error = await next_done
+                if error is not None:
+                    log.warning(f"{request_func.__name__}({item_id}) failed in bulk request: {error}")
+                yield item_id, response, error
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,5 +1,7 @@
 import requests
+import asyncio
 import logging
+import threading
 from uuid import uuid4
 
 from .exceptions import TokenGenerationError
@@ -17,6 +19,8 @@ class TTAuthenticator:
         secret_key (str): The secret key for authentication.
         app_name (str): The name of the application.
         company_name (str): The name of the company.
+        rate_limiter (TTRateLimiter, optional): A rate limiter shared by every client using this authenticator.
+                                                Default is None (requests are not paced).
 
     Attributes:
         _TT_BASE_URL (str): Base URL for the Trading Technologies API.
@@ -54,7 +58,17 @@ class TTAuthenticator:
         """
         return self._company_name
 
-    def __init__(self, environment, api_key, secret_key, app_name, company_name):
+    @property
+    def rate_limiter(self):
+        """
+        Get the rate limiter shared by the clients using this authenticator.
+
+        Returns:
+            TTRateLimiter: The rate limiter, or None if requests are not paced.
+        """
+        return self._rate_limiter
+
+    def __init__(self, environment, api_key, secret_key, app_name, company_name, rate_limiter=None):
         self._environment = environment
         self._app_name = app_name
         self._company_name = company_name
@@ -62,12 +76,17 @@ class TTAuthenticator:
         # grant_type=user_app&app_key=00000000-0000-0000-0000-000000000000:00000000-0000-0000-0000-000000000000
         self._api_key = api_key
         self._secret_key = secret_key
+        self._rate_limiter = rate_limiter
         self._token = None
+        self._token_lock = threading.Lock()
+        self._async_token_lock = None
 
-    def get_token(self):
+    def _token_request_args(self):
         """
-        Obtain an authentication token from the Trading Technologies API.
-        Refer to https://library.tradingtechnologies.com/tt-rest/v2/ttid.html
+        Build the keyword arguments for a token request, shared by the sync and async token paths.
+
+        Returns:
+            dict: The url, headers, data and params of the token request.
         """
         ttid_header = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -85,14 +104,34 @@ class TTAuthenticator:
         }
 
         url = f"{self._TT_BASE_URL}/ttid/{self._environment.value}/token"
-        response = requests.post(url=url, headers=ttid_header, data=ttid_data, params=query)
+        return {"url": url, "headers": ttid_header, "data": ttid_data, "params": query}
 
+    def _set_token(self, response):
         if response.status_code == 200:
             json = response.json()
             self._token = '{} {}'.format(json['token_type'].capitalize(), json['access_token'])
         else:
             raise TokenGenerationError(response)
 
+    def get_token(self):
+        """
+        Obtain an authentication token from the Trading Technologies API.
+        Refer to https://library.tradingtechnologies.com/tt-rest/v2/ttid.html
+        """
+        response = requests.post(**self._token_request_args())
+        self._set_token(response)
+
+    async def get_token_async(self, client):
+        """
+        Obtain an authentication token from the Trading Technologies API without blocking the event loop.
+        Refer to https://library.tradingtechnologies.com/tt-rest/v2/ttid.html
+
+        Args:
+            client (httpx.AsyncClient): The async HTTP client used to send the token request.
+        """
+        response = await client.post(**self._token_request_args())
+        self._set_token(response)
+
     def authenticate_request(self, request):
         """
         Authenticate an HTTP request with the generated token.
@@ -105,7 +144,37 @@ class TTAuthenticator:
         """
 
         if not self._token:
-            self.get_token()
+            # many threads may start without a token, only one of them needs to request it
+            with self._token_lock:
+                if not self._token:
+                    self.get_token()
+
+        request.headers.update({
+            "x-api-key": self._api_key,
+            "Authorization": self._token
+        })
+
+        return request
+
+    async def authenticate_request_async(self, request, client):
+        """
+        Authenticate an HTTP request with the generated token, obtaining a token asynchronously if required.
+
+        Args:
+            request (httpx.Request): The HTTP request.
+            client (httpx.AsyncClient): The async HTTP client used to send a token request if required.
+
+        Returns:
+            request: The authenticated HTTP request.
+        """
+
+        if not self._token:
+            # many coroutines may start without a token, only one of them needs to request it
+            if self._async_token_lock is None:
+                self._async_token_lock = asyncio.Lock()
+            async with self._async_token_lock:
+                if not self._token:
+                    await self.get_token_async(client)
 
         request.headers.update({
             "x-api-key": self._api_key,
@@ -0,0 +1,70 @@
+class BulkResult:
+    """
+    The outcome of a bulk request that fans out one request per ID.
+
+    Args:
+        ids (list): The de-duplicated IDs in the order they were requested.
+
+    Attributes:
+        ids (list): The de-duplicated IDs in the order they were requested.
+        results (dict): JSON responses keyed by ID, for the requests that succeeded, in input order.
+        errors (dict): Exceptions keyed by ID, for the requests that failed, in input order.
+    """
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def ok(self):
+        """
+        Check whether every request succeeded.
+
+        Returns:
+            bool: True if there were no errors.
+        """
+        return len(self.errors) == 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(results={len(self.results)}, errors={len(self.errors)})"
+
+
+class CrawlReport:
+    """
+    The progress and outcome of a reference data crawl, see TTPdsClient.crawl().
+
+    Attributes:
+        markets (int): The market records delivered.
+        products (int): The product records delivered.
+        instruments (int): The instrument records delivered.
+        requested (int): The nodes (markets and products) requested so far.
+        completed (int): The nodes that have completed, successfully or not.
+        errors (dict): Exceptions keyed by ("market", market ID) or ("product", product ID), for the nodes that failed.
+                       The products of a failed market are not crawled.
+    """
+
+    def __init__(self):
+        self.markets = 0
+        self.products = 0
+        self.instruments = 0
+        self.requested = 0
+        self.completed = 0
+        self.errors = {}
+
+    @property
+    def ok(self):
+        """
+        Check whether every node was crawled.
+
+        Returns:
+            bool: True if there were no errors.
+        """
+        return len(self.errors) == 0
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(markets={self.markets}, products={self.products}, "
+                f"instruments={self.instruments}, completed={self.completed}/{self.requested}, errors={len(self.errors)})")
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import time
+from .exceptions import UsageError
+from .sqlite_store import SQLiteStore
+
+log = logging.getLogger()
+
+
+class TTCheckpointStore(SQLiteStore):
+    """
+    A local SQLite store of pagination checkpoints, used to resume long paginated pulls after an interruption.
+
+    Each named checkpoint records the cursor of the next page to request (a 'nextPageKey', or the next minTimestamp for
+    fills), the number of pages already consumed and, for get_all_* calls, the pages themselves so a resumed call can
+    return the complete result. A checkpoint is tied to the filters of the first pull using it, resuming it with other
+    filters raises UsageError.
+
+    Args:
+        path (str): The SQLite database file. Use ":memory:" for a store that does not survive the process.
+
+    Example:
+        with TTCheckpointStore("backfill.sqlite") as store:
+            for fill in ledger_client.iter_fills(min_timestamp=start, checkpoint=store.checkpoint("fills-backfill")):
+                writer.write(fill)
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS checkpoints "
+        "(name TEXT PRIMARY KEY, cursor TEXT, pages INTEGER NOT NULL, complete INTEGER NOT NULL, updated REAL NOT NULL, "
+        "filters TEXT)",
+        "CREATE TABLE IF NOT EXISTS checkpoint_pages "
+        "(name TEXT NOT NULL, page INTEGER NOT NULL, body TEXT NOT NULL, PRIMARY KEY (name, page))",
+    )
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        with self._connection:
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(checkpoints)")]
+            if "filters" not in columns:
+                # stores created before checkpoints were tied to filters
+                self._connection.execute("ALTER TABLE checkpoints ADD COLUMN filters TEXT")
+
+    def checkpoint(self, name: str):
+        """
+        Get a named checkpoint, creating it if it doesn't exist yet.
+
+        Args:
+            name (str): A name identifying the pull, e.g. "instruments-product-1234".
+
+        Returns:
+            Checkpoint: The checkpoint.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO checkpoints (name, cursor, pages, complete, updated) VALUES (?, NULL, 0, 0, ?)",
+                (name, time.time())
+            )
+        return Checkpoint(self, name)
+
+    def names(self):
+        """
+        Get the names of all checkpoints in the store.
+
+        Returns:
+            list: The checkpoint names.
+        """
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT name FROM checkpoints ORDER BY name")]
+
+    def delete(self, name: str):
+        """
+        Delete a checkpoint and its stored pages.
+
+        Args:
+            name (str): The checkpoint name.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM checkpoint_pages WHERE name = ?", (name,))
+            self._connection.execute("DELETE FROM checkpoints WHERE name = ?", (name,))
+
+    def _get(self, name):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT cursor, pages, complete, updated FROM checkpoints WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Checkpoint '{name}' has been deleted")
+        return row
+
+    def _save(self, name, cursor, page):
+        with self._lock, self._connection:
+            pages = self._connection.execute("SELECT pages FROM checkpoints WHERE name = ?", (name,)).fetchone()[0]
+            if page is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO checkpoint_pages (name, page, body) VALUES (?, ?, ?)",
+                    (name, pages, json.dumps(page))
+                )
+            self._connection.execute(
+                "UPDATE checkpoints SET cursor = ?, pages = ?, updated = ? WHERE name = ?",
+                (cursor, pages + 1, time.time(), name)
+            )
+
+    def _bind(self, name, filters_hash):
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT filters FROM checkpoints WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(f"Checkpoint '{name}' has been deleted")
+            if row[0] is None:
+                self._connection.execute("UPDATE checkpoints SET filters = ? WHERE name = ?", (filters_hash, name))
+            elif row[0] != filters_hash:
+                raise UsageError(f"Checkpoint '{name}' records a pull with other filters, use another name or reset it")
+
+    def _mark_complete(self, name):
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE checkpoints SET complete = 1, updated = ? WHERE name = ?", (time.time(), name))
+
+    def _reset(self, name):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM checkpoint_pages WHERE name = ?", (name,))
+            self._connection.execute(
+                "UPDATE checkpoints SET cursor = NULL, pages = 0, complete = 0, filters = NULL, updated = ? WHERE name = ?",
+                (time.time(), name)
+            )
+
+    def _stored_pages(self, name):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT body FROM checkpoint_pages WHERE name = ? ORDER BY page", (name,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+class Checkpoint:
+    """
+    The progress of a single paginated pull, persisted in a TTCheckpointStore.
+
+    Pass a checkpoint to an iter_* or get_all_* method to resume from where a previous run stopped. A page is only
+    committed once the caller has finished with it (i.e. asked for the next one), so after a crash the last page may be
+    delivered again but none are skipped.
+
+    Args:
+        store (TTCheckpointStore): The store holding the checkpoint.
+        name (str): The checkpoint name.
+    """
+
+    def __init__(self, store: TTCheckpointStore, name: str):
+        self._store = store
+        self._name = name
+
+    @property
+    def name(self):
+        """
+        Get the checkpoint name.
+
+        Returns:
+            str: The name.
+        """
+        return self._name
+
+    @property
+    def cursor(self):
+        """
+        Get the cursor of the next page to request.
+
+        Returns:
+            str: A 'nextPageKey', or the next minTimestamp for fills. None if no page has been committed yet.
+        """
+        return self._store._get(self._name)[0]
+
+    @property
+    def pages(self):
+        """
+        Get the number of pages already committed.
+
+        Returns:
+            int: The page count.
+        """
+        return self._store._get(self._name)[1]
+
+    @property
+    def complete(self):
+        """
+        Check whether the pull has finished.
+
+        Returns:
+            bool: True if the last page has been committed.
+        """
+        return bool(self._store._get(self._name)[2])
+
+    def save(self, cursor, page: dict = None):
+        """
+        Commit a consumed page.
+
+        Args:
+            cursor (str): The cursor of the next page to request.
+            page (dict, optional): The page JSON to keep for get_all_* resumption. Default is None.
+        """
+        self._store._save(self._name, None if cursor is None else str(cursor), page)
+
+    def bind(self, filters: dict):
+        """
+        Tie the checkpoint to the filters of the pull it records. Called by the paginated methods before resuming.
+
+        Args:
+            filters (dict): The request arguments, other than the cursor.
+
+        Raises:
+            UsageError: If the checkpoint already records a pull with other filters.
+        """
+        digest = hashlib.sha256(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        self._store._bind(self._name, digest)
+
+    def mark_complete(self):
+        """
+        Mark the pull as finished.
+        """
+        self._store._mark_complete(self._name)
+
+    def reset(self):
+        """
+        Discard all progress so the next pull starts from the first page, with any filters.
+        """
+        self._store._reset(self._name)
+
+    def stored_pages(self):
+        """
+        Get the pages kept by get_all_* calls.
+
+        Returns:
+            list: The page JSON, in order.
+        """
+        return self._store._stored_pages(self._name)
+
+    def __repr__(self):
+        cursor, pages, complete, _ = self._store._get(self._name)
+        return f"{self.__class__.__name__}(name={self._name!r}, cursor={cursor!r}, pages={pages}, complete={bool(complete)})"
@@ -0,0 +1,149 @@
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for columnar results, see extras_require in setup.py
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is only required for Arrow results, see extras_require in setup.py
+    pa = None
+
+log = logging.getLogger()
+
+OUTPUT_FORMATS = ("numpy", "arrow")
+
+
+def to_datetime64(values):
+    """
+    Convert epoch times in nanoseconds to a datetime64[ns] array in a single vectorized operation.
+
+    Args:
+        values (list): Epoch times in nanoseconds, as int or numeric strings (TT returns fill timeStamps as strings).
+                       None becomes NaT.
+
+    Returns:
+        numpy.ndarray: The times as datetime64[ns] (UTC).
+    """
+    if np is None:
+        raise ImportError("Columnar results require numpy. Install it with 'pip install tt-rest-api[columnar]'.")
+
+    array = np.asarray(values)
+    if array.dtype == object:
+        # a missing value prevents a direct cast, NaT is the minimum int64
+        nat = np.iinfo(np.int64).min
+        array = np.array([nat if value is None else int(value) for value in values], dtype=np.int64)
+    return array.astype(np.int64).view("datetime64[ns]")
+
+
+class ColumnarBuilder:
+    """
+    Builds a columnar result from pages of records, converting each page to column arrays as it arrives.
+
+    Only the column arrays of pages already added are kept, so the record dicts of a page can be freed as soon as the
+    next page is requested. Timestamp columns are stored as datetime64[ns] (or an Arrow timestamp[ns]). Without explicit
+    columns, a field first seen in a later page is added as a column that is None in the earlier pages.
+
+    Args:
+        output (str, optional): "numpy" for a NumPy structured array or "arrow" for a pyarrow Table. Default is "numpy".
+        columns (list, optional): The fields to keep. Defaults to every field seen, in the order first seen.
+        timestamp_columns (tuple, optional): The fields holding epoch times in nanoseconds. Default is ("timeStamp",).
+    """
+
+    def __init__(self, output: str = "numpy", columns: list = None, timestamp_columns: tuple = ("timeStamp",)):
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"output must be one of {OUTPUT_FORMATS}, got {output!r}")
+        if np is None:
+            raise ImportError("Columnar results require numpy. Install it with 'pip install tt-rest-api[columnar]'.")
+        if output == "arrow" and pa is None:
+            raise ImportError("Arrow results require pyarrow. Install it with 'pip install tt-rest-api[columnar]'.")
+
+        self.output = output
+        self.columns = list(columns) if columns is not None else None
+        self._infer_columns = columns is None
+        self.timestamp_columns = set(timestamp_columns)
+        self._chunks = []
+        self._rows = 0
+
+    def add_page(self, records):
+        """
+        Convert a page of records to column arrays.
+
+        Args:
+            records (list): The page's records, e.g. the "fills" of a fills response.
+        """
+        if not records:
+            return
+        if self._infer_columns:
+            self.columns = list(dict.fromkeys([*(self.columns or []), *(key for record in records for key in record)]))
+
+        chunk = {}
+        for column in self.columns:
+            values = [record.get(column) for record in records]
+            if column in self.timestamp_columns:
+                array = to_datetime64(values)
+                chunk[column] = array if self.output == "numpy" else pa.array(array)
+            else:
+                chunk[column] = self._to_array(values) if self.output == "numpy" else pa.array(values)
+
+        if self.output == "arrow":
+            chunk = pa.Table.from_arrays(list(chunk.values()), names=list(chunk))
+
+        self._chunks.append((len(records), chunk))
+        self._rows += len(records)
+
+    @staticmethod
+    def _to_array(values):
+        if not any(isinstance(value, (list, tuple, dict)) for value in values):
+            return np.asarray(values)
+
+        # nested values stay whole, np.asarray would make a 2-D or ragged array of them
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+        return array
+
+    def _missing_column(self, column, length):
+        # a column first seen after this page, None (NaT for timestamps) in each of its rows
+        if column in self.timestamp_columns:
+            array = to_datetime64([None] * length)
+            return array if self.output == "numpy" else pa.array(array)
+        if self.output == "arrow":
+            return pa.nulls(length)
+        return np.full(length, None, dtype=object)
+
+    def build(self):
+        """
+        Combine the pages added so far.
+
+        Returns:
+            numpy.ndarray/pyarrow.Table: A structured array with one field per column, or a Table.
+        """
+        log.debug(f"Building {self.output} result: {self._rows} rows from {len(self._chunks)} pages")
+
+        if self.output == "arrow":
+            if not self._chunks:
+                return pa.table({column: pa.array([]) for column in self.columns or []})
+            tables = []
+            for length, table in self._chunks:
+                for column in self.columns:
+                    if column not in table.column_names:
+                        table = table.append_column(column, self._missing_column(column, length))
+                tables.append(table.select(self.columns))
+            # a column that is null in one page and typed in another is promoted to the common type
+            return pa.concat_tables(tables, promote_options="permissive")
+
+        columns = {}
+        for column in self.columns or []:
+            arrays = [chunk[column] if column in chunk else self._missing_column(column, length) for length, chunk in self._chunks]
+            try:
+                columns[column] = np.concatenate(arrays) if arrays else np.array([])
+            except TypeError:
+                # pages inferred incompatible types for the column, e.g. numbers in one and strings in another
+                columns[column] = np.concatenate([array.astype(object) for array in arrays])
+
+        result = np.empty(self._rows, dtype=[(column, array.dtype) for column, array in columns.items()])
+        for column, array in columns.items():
+            result[column] = array
+        return result
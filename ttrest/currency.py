@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for currency rate matrices, see extras_require in setup.py
+    np = None
+
+log = logging.getLogger()
+
+
+class CurrencyRateMatrix:
+    """
+    Every exchange rate between currencies, downloaded in a single request and held as a dense NumPy matrix, so whole
+    arrays of amounts are converted in one operation. Pairs TT doesn't report are derived from the inverse rate or,
+    with triangulate, through other currencies, and are NaN otherwise.
+
+    Args:
+        pds_client (TTPdsClient, optional): The client to download rates with. Default is None (load() only).
+        refresh_interval (float, optional): Seconds between refreshes when running. Default is 3600.
+        triangulate (bool, optional): Derive missing pairs through intermediate currencies. Default is True.
+
+    Example:
+        rates = CurrencyRateMatrix(pds_client)
+        rates.refresh()
+        usd_pnl = rates.convert(pnl, currencies, "USD")  # an array of P&L in an array of currencies
+    """
+
+    RESULTS_KEY = "currencyRates"
+    FROM_ID_FIELD = "fromCurrencyId"
+    FROM_NAME_FIELD = "fromCurrencyName"
+    TO_ID_FIELD = "toCurrencyId"
+    TO_NAME_FIELD = "toCurrencyName"
+    RATE_FIELD = "rate"
+
+    def __init__(self, pds_client=None, refresh_interval: float = 3600.0, triangulate: bool = True):
+        if np is None:
+            raise ImportError("Currency rate matrices require numpy. Install it with 'pip install tt-rest-api[columnar]'.")
+
+        self.pds_client = pds_client
+        self.refresh_interval = refresh_interval
+        self.triangulate = triangulate
+        self.updated = None
+        self._rates = ({}, np.empty((0, 0)))
+        self._stop = None
+        self._thread = None
+
+    def load(self, response):
+        """
+        Build the matrix from a rates response.
+
+        Args:
+            response (dict): The JSON response of TTPdsClient.get_currrency_rates_by_name() called with no arguments.
+
+        Returns:
+            CurrencyRateMatrix: The matrix.
+        """
+        records = response.get(self.RESULTS_KEY, [])
+
+        keys = {}
+        for record in records:
+            for id_field, name_field in ((self.FROM_ID_FIELD, self.FROM_NAME_FIELD), (self.TO_ID_FIELD, self.TO_NAME_FIELD)):
+                currency = (record.get(id_field), record.get(name_field))
+                keys.setdefault(currency[0] if currency[0] is not None else currency[1], currency)
+
+        index = {}
+        for position, (currency_id, name) in enumerate(keys.values()):
+            for key in (currency_id, name):
+                if key is not None:
+                    index[key] = position
+                    index[str(key)] = position
+
+        matrix = np.full((len(keys), len(keys)), np.nan)
+        for record in records:
+            rate = record.get(self.RATE_FIELD)
+            if rate is not None:
+                matrix[self._position(index, record, self.FROM_ID_FIELD, self.FROM_NAME_FIELD),
+                       self._position(index, record, self.TO_ID_FIELD, self.TO_NAME_FIELD)] = float(rate)
+
+        matrix = self._fill(matrix)
+        missing = int(np.isnan(matrix).sum())
+        if missing:
+            log.warning(f"{missing} of {matrix.size} currency pairs have no rate")
+
+        # swap the index and matrix in together, so lookups always read a consistent pair
+        self._rates = (index, matrix)
+        self.updated = time.time()
+        log.debug(f"Loaded {len(records)} rates between {len(keys)} currencies")
+        return self
+
+    @staticmethod
+    def _position(index, record, id_field, name_field):
+        currency_id = record.get(id_field)
+        return index[currency_id if currency_id is not None else record.get(name_field)]
+
+    def _fill(self, matrix):
+        np.fill_diagonal(matrix, 1.0)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / matrix.T
+        matrix = np.where(np.isnan(matrix), inverse, matrix)
+
+        if self.triangulate:
+            # Floyd-Warshall over the currencies: each pivot fills the pairs it connects, using rates filled by earlier
+            # pivots, so rates are derived through as many intermediate currencies as needed
+            for pivot in range(len(matrix)):
+                missing = np.isnan(matrix)
+                if not missing.any():
+                    break
+                matrix = np.where(missing, np.outer(matrix[:, pivot], matrix[pivot, :]), matrix)
+        return matrix
+
+    def refresh(self):
+        """
+        Download every rate and rebuild the matrix. This can take 30 seconds or more.
+
+        Returns:
+            CurrencyRateMatrix: The matrix.
+        """
+        return self.load(self.pds_client.get_currrency_rates_by_name())
+
+    @property
+    def currencies(self):
+        """
+        Get the indexed currency IDs and names.
+
+        Returns:
+            list: The currency keys (IDs, names and their string forms) accepted by rate() and convert().
+        """
+        return list(self._rates[0])
+
+    def rate(self, from_currency, to_currency):
+        """
+        Get the rate from one currency to another.
+
+        Args:
+            from_currency: A currency ID or name.
+            to_currency: A currency ID or name.
+
+        Returns:
+            float: The amount of to_currency per unit of from_currency, NaN if the pair has no rate.
+
+        Raises:
+            KeyError: If a currency is unknown.
+        """
+        index, matrix = self._rates
+        return float(matrix[index[from_currency], index[to_currency]])
+
+    def _positions(self, index, currencies):
+        currencies = np.asarray(currencies)
+        if currencies.dtype == object:
+            # mixed IDs and names can't be sorted by np.unique, look up each element
+            return np.fromiter((index[currency] for currency in currencies), dtype=np.intp, count=len(currencies))
+        # map each distinct currency once, rather than every element
+        unique, inverse = np.unique(currencies, return_inverse=True)
+        return np.array([index[currency.item()] for currency in unique], dtype=np.intp)[inverse]
+
+    def convert(self, amounts, from_currency, to_currency):
+        """
+        Convert an array of amounts in a single vectorized operation.
+
+        Args:
+            amounts (array-like): The amounts.
+            from_currency: A currency ID or name, or an array of them holding the currency of each amount.
+            to_currency: A currency ID or name, or an array of them holding the currency to convert each amount to.
+
+        Returns:
+            numpy.ndarray: The converted amounts, NaN where the pair has no rate.
+
+        Raises:
+            KeyError: If a currency is unknown.
+        """
+        index, matrix = self._rates
+        rows = index[from_currency] if np.ndim(from_currency) == 0 else self._positions(index, from_currency)
+        columns = index[to_currency] if np.ndim(to_currency) == 0 else self._positions(index, to_currency)
+        return np.asarray(amounts, dtype=float) * matrix[rows, columns]
+
+    def run(self, stop: threading.Event = None):
+        """
+        Refresh every refresh_interval seconds until stop is set. A failed refresh is logged and the previous rates are
+        kept.
+
+        Args:
+            stop (threading.Event, optional): Ends the refreshes when set. Default is None (run until interrupted).
+        """
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                log.error(f"Currency rate refresh failed, keeping the rates from {self.updated}: {e}")
+            stop.wait(self.refresh_interval)
+
+    def start(self):
+        """
+        Refresh in a background thread, the first refresh starting immediately.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.run, args=(self._stop,), name="currency-rate-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background refreshes started by start().
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self):
+        return len(self._rates[1])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(currencies={len(self)}, updated={self.updated})"
+
+
+class AsyncCurrencyRateMatrix(CurrencyRateMatrix):
+    """
+    A currency rate matrix downloaded with AsyncTTPdsClient. Methods mirror CurrencyRateMatrix, and refresh, run and
+    stop return awaitables. start() refreshes in a task on the running event loop.
+    """
+
+    def __init__(self, pds_client=None, refresh_interval: float = 3600.0, triangulate: bool = True):
+        super().__init__(pds_client, refresh_interval, triangulate)
+        self._task = None
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self.run(self._stop), name="currency-rate-refresh")
+
+    async def stop(self):
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    async def refresh(self):
+        return self.load(await self.pds_client.get_currrency_rates_by_name())
+
+    async def run(self, stop: asyncio.Event = None):
+        stop = stop if stop is not None else asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.error(f"Currency rate refresh failed, keeping the rates from {self.updated}: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
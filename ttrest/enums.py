@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for decoding columnar results, see extras_require in setup.py
+    np = None
+
+log = logging.getLogger()
+
+_CODE_KEYS = ("id", "code", "key")
+_NAME_KEYS = ("name", "description", "value")
+
+
+def _enum_tables(order_data):
+    # orderdata lists each order field's enumerated values, either as a {code: name} map or a list of records
+    tables = {}
+    for field, values in order_data.items():
+        if isinstance(values, dict):
+            entries = values.items()
+        elif isinstance(values, list):
+            entries = []
+            for entry in values:
+                if isinstance(entry, dict):
+                    code = next((entry[key] for key in _CODE_KEYS if key in entry), None)
+                    name = next((entry[key] for key in _NAME_KEYS if key in entry), None)
+                    entries.append((code, name))
+        else:
+            continue
+
+        table = {}
+        for code, name in entries:
+            if code is None or name is None or isinstance(name, (dict, list)):
+                continue
+            # records may hold the code as an int or a numeric string
+            table[code] = name
+            table[str(code)] = name
+            if isinstance(code, str) and code.lstrip("-").isdigit():
+                table[int(code)] = name
+        if table:
+            tables[field] = table
+    return tables
+
+
+class TTEnumRegistry:
+    """
+    A memoized cache of the order enum definitions returned by TTLedgerClient.get_order_data(), one per environment.
+
+    The definitions rarely change, so they are fetched once per environment and reused by every decoder built from the
+    registry. Given a path, they are also persisted to a JSON file so later processes skip the request until the TTL
+    expires.
+
+    Args:
+        path (str, optional): A JSON file to persist the definitions to. Default is None (memory only).
+        ttl (float, optional): Seconds before cached definitions are fetched again. Default is 86400 (one day).
+    """
+
+    def __init__(self, path: str = None, ttl: float = 86400):
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = {}
+
+    def load(self, environment):
+        """
+        Get the cached order data for an environment.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+
+        Returns:
+            dict: The get_order_data() JSON, or None if it isn't cached or has expired.
+        """
+        with self._lock:
+            entry = self._memory.get(environment.value)
+            if entry is None and self._path is not None:
+                entry = self._read_file().get(environment.value)
+                if entry is not None:
+                    self._memory[environment.value] = entry
+
+        if entry is None or time.time() - entry["fetched"] > self._ttl:
+            return None
+        return entry["data"]
+
+    def store(self, environment, order_data):
+        """
+        Cache the order data for an environment.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            order_data (dict): The get_order_data() JSON.
+        """
+        entry = {"fetched": time.time(), "data": order_data}
+        with self._lock:
+            self._memory[environment.value] = entry
+            if self._path is not None:
+                entries = self._read_file()
+                entries[environment.value] = entry
+                temp_path = f"{self._path}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(entries, f)
+                os.replace(temp_path, self._path)
+
+    def clear(self):
+        """
+        Discard the cached definitions, including the persisted file.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._path is not None and os.path.exists(self._path):
+                os.remove(self._path)
+
+    def _read_file(self):
+        try:
+            with open(self._path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            log.warning(f"Ignoring unreadable order data cache {self._path}")
+            return {}
+
+
+class EnumDecoder:
+    """
+    Translates the numeric enum fields of fills and orders to their names, a whole batch at a time.
+
+    A lookup table is built once per field from the order data, so decoding a batch is a single table lookup per value.
+    A record field is matched to the order data field of the same name or that name plus "s" (e.g. orderType and
+    orderTypes), or mapped to another with field_map. Codes that have no name are left unchanged.
+
+    Args:
+        order_data (dict): The get_order_data() JSON.
+        field_map (dict, optional): Maps record fields to order data fields where the names don't match. Default is
+                                    None.
+
+    Example:
+        decoder = ledger_client.get_enum_decoder()
+        fills = decoder.decode(ledger_client.get_all_fills(min_timestamp=start_of_day)["fills"])
+    """
+
+    def __init__(self, order_data: dict, field_map: dict = None):
+        tables = _enum_tables(order_data)
+        self.lookups = {}
+
+        for name, table in tables.items():
+            self.lookups[name] = table
+            if name.endswith("s"):
+                # order data names the tables in the plural, records name the field in the singular
+                self.lookups.setdefault(name[:-1], table)
+
+        for field, name in (field_map or {}).items():
+            if name not in tables:
+                raise KeyError(f"'{name}' is not an order data field, expected one of {sorted(tables)}")
+            self.lookups[field] = tables[name]
+
+    @property
+    def fields(self):
+        """
+        Get the record fields the decoder can translate.
+
+        Returns:
+            list: The field names.
+        """
+        return list(self.lookups)
+
+    def decode(self, records, fields=None):
+        """
+        Replace enum codes with their names in a batch of records, in place.
+
+        Args:
+            records (list): Fill or order records.
+            fields (list, optional): The fields to decode. Defaults to every field the decoder knows that appears in any
+                                     of the records.
+
+        Returns:
+            list: The records.
+        """
+        if not records:
+            return records
+        if fields is None:
+            fields = {field for record in records for field in record if field in self.lookups}
+
+        for field in fields:
+            lookup = self.lookups[field]
+            values = [record.get(field) for record in records]
+            for record, name in zip(records, map(lookup.get, values, values)):
+                if field in record:
+                    record[field] = name
+        return records
+
+    def decode_column(self, field, values):
+        """
+        Translate a column of enum codes, e.g. a field of a columnar fills result.
+
+        With numpy the distinct codes are looked up once and broadcast back to the column. Object columns, which may
+        mix types or hold None, are mapped through a dict of their distinct values instead of being sorted.
+
+        Args:
+            field (str): The record field the codes belong to.
+            values: The codes, a list or array.
+
+        Returns:
+            numpy.ndarray/list: The names, an object array if numpy is installed.
+        """
+        lookup = self.lookups[field]
+        if np is None:
+            return [lookup.get(value, value) for value in values]
+
+        values = np.asarray(values)
+        if values.dtype == object:
+            names = {}
+            for value in values:
+                if value not in names:
+                    names[value] = lookup.get(value, value)
+            result = np.empty(len(values), dtype=object)
+            result[:] = [names[value] for value in values]
+            return result
+
+        codes, inverse = np.unique(values, return_inverse=True)
+        names = np.array([lookup.get(code.item(), code.item()) for code in codes], dtype=object)
+        return names[inverse.reshape(-1)]
@@ -59,3 +59,20 @@ class UsageError(Exception):
 
     def __init__(self, error_message):
         super().__init__(error_message)
+
+
+class CircuitOpenError(Exception):
+    """
+    Exception raised when a request is refused because the circuit breaker for its endpoint is open after repeated
+    failures.
+
+    Attributes:
+        endpoint (str): The TT service endpoint, e.g. "ttledger".
+        retry_in (float): Seconds until the circuit breaker allows a trial request.
+    """
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        error_message = f"Circuit breaker for {endpoint} is open after repeated failures, retry in {retry_in:.1f}s"
+        super().__init__(error_message)
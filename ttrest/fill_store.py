@@ -0,0 +1,166 @@
+import json
+import logging
+import time
+from .sqlite_store import SQLiteStore
+
+log = logging.getLogger()
+
+
+def fill_key(fill):
+    """
+    Gets a key identifying a fill, used to de-duplicate fills returned by overlapping requests.
+
+    Args:
+        fill (dict): A fill record.
+
+    Returns:
+        The fill's recordId, or its serialised content if it has no recordId.
+    """
+    record_id = fill.get("recordId")
+    if record_id is not None:
+        return record_id
+    return json.dumps(fill, sort_keys=True, default=str)
+
+
+class TTFillStore(SQLiteStore):
+    """
+    A local SQLite store of fills keyed by fill, with a high-watermark timeStamp per sync filter.
+
+    Used by TTLedgerClient.sync_fills() so that repeated syncs through the day only request the fills after the last
+    one already stored. Fills are upserted, so syncing the same fills again leaves a single copy of each.
+
+    Args:
+        path (str): The SQLite database file. Use ":memory:" for a store that does not survive the process.
+
+    Example:
+        with TTFillStore("fills.sqlite") as store:
+            new_fills = ledger_client.sync_fills(store, account_id=account_id)["fills"]
+            todays_fills = store.fills(account_id=account_id, min_timestamp=start_of_day)
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS fills "
+        "(key TEXT PRIMARY KEY, time_stamp INTEGER NOT NULL, account_id INTEGER, body TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS fills_time_stamp ON fills (time_stamp)",
+        "CREATE TABLE IF NOT EXISTS fill_watermarks "
+        "(name TEXT PRIMARY KEY, time_stamp INTEGER NOT NULL, updated REAL NOT NULL)",
+    )
+
+    def __init__(self, path: str):
+        super().__init__(path)
+
+    @staticmethod
+    def watermark_name(account_id=None, order_id=None, product_id=None, include_otc: bool = False):
+        """
+        Get the name of the watermark tracking a fills filter, each distinct filter is synced independently.
+
+        Args:
+            account_id (int): Account ID filter.
+            order_id (int): Order ID filter.
+            product_id (int): Product ID filter.
+            include_otc (bool): Whether OTC fills are included.
+
+        Returns:
+            str: The watermark name.
+        """
+        return json.dumps(
+            {"accountId": account_id, "orderId": order_id, "productId": product_id, "includeOTC": include_otc},
+            sort_keys=True
+        )
+
+    def watermark(self, name: str):
+        """
+        Get the timeStamp of the latest fill synced for a watermark.
+
+        Args:
+            name (str): The watermark name.
+
+        Returns:
+            int: Epoch time in nanoseconds, or None if nothing has been synced yet.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT time_stamp FROM fill_watermarks WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def reset_watermark(self, name: str):
+        """
+        Discard a watermark so the next sync for it starts from the beginning. Stored fills are kept.
+
+        Args:
+            name (str): The watermark name.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM fill_watermarks WHERE name = ?", (name,))
+
+    def upsert(self, fills, watermark: str = None):
+        """
+        Insert fills, replacing any stored fill with the same key.
+
+        Args:
+            fills (list): The fill records.
+            watermark (str, optional): A watermark name to advance to the latest timeStamp of the fills, in the same
+                                       transaction. Default is None.
+
+        Returns:
+            list: The fills that were not already in the store.
+        """
+        rows = {}
+        for fill in fills:
+            rows[str(fill_key(fill))] = fill
+
+        with self._lock, self._connection:
+            existing = set()
+            keys = list(rows)
+            for i in range(0, len(keys), 500):  # stay under SQLite's bound parameter limit
+                chunk = keys[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                existing.update(row[0] for row in self._connection.execute(
+                    f"SELECT key FROM fills WHERE key IN ({placeholders})", chunk
+                ))
+
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fills (key, time_stamp, account_id, body) VALUES (?, ?, ?, ?)",
+                [(key, int(fill["timeStamp"]), fill.get("accountId"), json.dumps(fill)) for key, fill in rows.items()]
+            )
+
+            if watermark is not None and rows:
+                latest = max(int(fill["timeStamp"]) for fill in rows.values())
+                self._connection.execute(
+                    "INSERT INTO fill_watermarks (name, time_stamp, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET time_stamp = MAX(time_stamp, excluded.time_stamp), updated = excluded.updated",
+                    (watermark, latest, time.time())
+                )
+
+        return [fill for key, fill in rows.items() if key not in existing]
+
+    def fills(self, account_id=None, min_timestamp: int = None, max_timestamp: int = None):
+        """
+        Get stored fills, in timestamp order.
+
+        Args:
+            account_id (int): Account ID to filter fills.
+            min_timestamp (int): Filters fills at or after the epoch time in nanoseconds.
+            max_timestamp (int): Filters fills at or before the epoch time in nanoseconds.
+
+        Returns:
+            list: The fill records.
+        """
+        query = "SELECT body FROM fills WHERE 1 = 1"
+        params = []
+        if account_id is not None:
+            query += " AND account_id = ?"
+            params.append(account_id)
+        if min_timestamp is not None:
+            query += " AND time_stamp >= ?"
+            params.append(min_timestamp)
+        if max_timestamp is not None:
+            query += " AND time_stamp <= ?"
+            params.append(max_timestamp)
+
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY time_stamp, key", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM fills").fetchone()[0]
@@ -0,0 +1,295 @@
+import logging
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+log = logging.getLogger()
+
+_NO_EXPIRY = -(2 ** 63)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _expiry(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class InstrumentIndex:
+    """
+    An in-memory index of instruments, so lookups by ID, alias or symbol and searches within a product don't need a
+    request. Only the indexed fields are kept, and instruments can be added and removed incrementally.
+
+    Args:
+        instruments (list, optional): Instrument records to index, e.g. the "instruments" of
+                                      TTPdsClient.get_all_instruments(). Default is None.
+
+    Example:
+        index = InstrumentIndex()
+        index.load(pds_client, product_ids)
+        instrument = index.by_alias("ES Dec24")
+        front_months = index.search(product_id, prefix="ES", min_expiry=now_ms)
+    """
+
+    ID_FIELD = "id"
+    ALIAS_FIELD = "alias"
+    SYMBOL_FIELD = "securityId"
+    PRODUCT_FIELD = "productId"
+    EXPIRY_FIELD = "expirationDate"
+
+    def __init__(self, instruments: list = None):
+        self._ids = []
+        self._aliases = []
+        self._symbols = []
+        self._products = []
+        self._expiries = array("q")
+        self._row_by_id = {}
+        self._rows_by_alias = {}
+        self._rows_by_symbol = {}
+        self._rows_by_product = {}
+        self._sorted = {}
+        self._free_rows = []
+
+        if instruments:
+            self.add(instruments)
+
+    def add(self, instruments):
+        """
+        Add instruments to the index, replacing the indexed fields of instruments already in it.
+
+        Args:
+            instruments (list): Instrument records.
+
+        Returns:
+            int: The number of instruments added or updated.
+        """
+        count = 0
+        for instrument in instruments:
+            instrument_id = _intern(instrument[self.ID_FIELD])
+            row = self._row_by_id.get(instrument_id)
+            if row is None and self._free_rows:
+                row = self._row_by_id[instrument_id] = self._free_rows.pop()
+                self._ids[row] = instrument_id
+            elif row is None:
+                row = self._row_by_id[instrument_id] = len(self._ids)
+                self._ids.append(instrument_id)
+                self._aliases.append(None)
+                self._symbols.append(None)
+                self._products.append(None)
+                self._expiries.append(_NO_EXPIRY)
+            else:
+                self._unlink(row)
+
+            alias = _intern(instrument.get(self.ALIAS_FIELD))
+            symbol = _intern(instrument.get(self.SYMBOL_FIELD))
+            product_id = _intern(instrument.get(self.PRODUCT_FIELD))
+            expiry = _expiry(instrument.get(self.EXPIRY_FIELD))
+
+            self._aliases[row] = alias
+            self._symbols[row] = symbol
+            self._products[row] = product_id
+            self._expiries[row] = _NO_EXPIRY if expiry is None else expiry
+            self._link(row)
+            count += 1
+        return count
+
+    def remove(self, instrument_ids):
+        """
+        Remove instruments from the index, e.g. once they have expired. Their rows are reused by later additions.
+
+        Args:
+            instrument_ids (iterable): Instrument IDs. IDs not in the index are ignored.
+
+        Returns:
+            int: The number of instruments removed.
+        """
+        count = 0
+        for instrument_id in instrument_ids:
+            row = self._row_by_id.pop(instrument_id, None)
+            if row is not None:
+                self._unlink(row)
+                self._ids[row] = self._aliases[row] = self._symbols[row] = self._products[row] = None
+                self._expiries[row] = _NO_EXPIRY
+                self._free_rows.append(row)
+                count += 1
+        return count
+
+    def load(self, pds_client, product_ids=None, synthetic: bool = False, max_workers: int = None):
+        """
+        Request instruments and add them to the index, products concurrently.
+
+        Args:
+            pds_client (TTPdsClient): The client to request instruments with.
+            product_ids (iterable, optional): The products whose instruments to load. Default is None (none).
+            synthetic (bool, optional): Also load the synthetic instruments. Default is False.
+            max_workers (int, optional): The maximum number of concurrent requests.
+
+        Returns:
+            BulkResult: The instruments responses and errors keyed by product ID. Failed products are not loaded.
+        """
+        result = pds_client.get_all_instruments_by_product_ids(product_ids or [], max_workers=max_workers)
+        synthetic_instruments = pds_client.get_all_synthetic_instruments() if synthetic else None
+        return self._add_loaded(result, synthetic_instruments)
+
+    def _add_loaded(self, result, synthetic_instruments):
+        for response in result.results.values():
+            self.add(response.get("instruments", []))
+        if synthetic_instruments is not None:
+            self.add(synthetic_instruments.get("syntheticInstruments", []))
+        if not result.ok:
+            log.warning(f"Failed to load the instruments of {len(result.errors)} products")
+        log.debug(f"Indexed {len(self)} instruments")
+        return result
+
+    def get(self, instrument_id):
+        """
+        Look up an instrument by ID.
+
+        Args:
+            instrument_id: An Instrument ID.
+
+        Returns:
+            dict: The indexed fields of the instrument, or None if it isn't in the index.
+        """
+        row = self._row_by_id.get(instrument_id)
+        return None if row is None else self._record(row)
+
+    def by_alias(self, alias):
+        """
+        Look up an instrument by alias, e.g. "ES Dec24".
+
+        Args:
+            alias (str): The exact alias.
+
+        Returns:
+            dict: The indexed fields of the instrument, the most recently added if several share the alias, or None if
+                  no instrument has it.
+        """
+        rows = self._rows_by_alias.get(alias)
+        return self._record(rows[-1]) if rows else None
+
+    def by_symbol(self, symbol):
+        """
+        Look up instruments by symbol (SYMBOL_FIELD, the exchange's security ID by default).
+
+        Args:
+            symbol: The symbol.
+
+        Returns:
+            list: The indexed fields of the instruments with the symbol, which may be on different exchanges.
+        """
+        return [self._record(row) for row in self._rows_by_symbol.get(symbol, ())]
+
+    def search(self, product_id, prefix: str = "", min_expiry=None, max_expiry=None):
+        """
+        Search the instruments of a product by alias prefix and expiry range. Instruments without an expiry are only
+        found without a range.
+
+        Args:
+            product_id: A Product ID.
+            prefix (str, optional): The start of the alias, matched case-insensitively. Default is "" (any alias).
+            min_expiry (int, optional): The earliest expiry, inclusive. Default is None (no bound).
+            max_expiry (int, optional): The latest expiry, inclusive. Default is None (no bound).
+
+        Returns:
+            list: The indexed fields of the matching instruments, ordered by expiry if a range is given, otherwise by
+                  alias.
+        """
+        if product_id not in self._rows_by_product:
+            return []
+        alias_keys, alias_rows, expiries, expiry_rows = self._sorted_product(product_id)
+
+        if prefix:
+            key = prefix.casefold()
+            start = bisect_left(alias_keys, key)
+            stop = bisect_left(alias_keys, key + "\U0010ffff", start)
+            rows = alias_rows[start:stop]
+        else:
+            rows = alias_rows
+
+        if min_expiry is not None or max_expiry is not None:
+            start = 0 if min_expiry is None else bisect_left(expiries, int(min_expiry))
+            stop = len(expiries) if max_expiry is None else bisect_right(expiries, int(max_expiry))
+            in_range = expiry_rows[start:stop]
+            if prefix:
+                matched = set(rows)
+                in_range = [row for row in in_range if row in matched]
+            rows = in_range
+
+        return [self._record(row) for row in rows]
+
+    def __len__(self):
+        return len(self._row_by_id)
+
+    def __contains__(self, instrument_id):
+        return instrument_id in self._row_by_id
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(instruments={len(self)}, products={len(self._rows_by_product)})"
+
+    def _record(self, row):
+        expiry = self._expiries[row]
+        return {
+            self.ID_FIELD: self._ids[row],
+            self.ALIAS_FIELD: self._aliases[row],
+            self.SYMBOL_FIELD: self._symbols[row],
+            self.PRODUCT_FIELD: self._products[row],
+            self.EXPIRY_FIELD: None if expiry == _NO_EXPIRY else expiry,
+        }
+
+    def _link(self, row):
+        alias, symbol, product_id = self._aliases[row], self._symbols[row], self._products[row]
+        if alias is not None:
+            self._rows_by_alias.setdefault(alias, []).append(row)
+        if symbol is not None:
+            self._rows_by_symbol.setdefault(symbol, []).append(row)
+        self._rows_by_product.setdefault(product_id, set()).add(row)
+        self._sorted.pop(product_id, None)
+
+    def _unlink(self, row):
+        alias, symbol, product_id = self._aliases[row], self._symbols[row], self._products[row]
+        if alias is not None:
+            rows = self._rows_by_alias[alias]
+            rows.remove(row)
+            if not rows:
+                del self._rows_by_alias[alias]
+        if symbol is not None:
+            rows = self._rows_by_symbol[symbol]
+            rows.remove(row)
+            if not rows:
+                del self._rows_by_symbol[symbol]
+        rows = self._rows_by_product[product_id]
+        rows.discard(row)
+        if not rows:
+            del self._rows_by_product[product_id]
+        self._sorted.pop(product_id, None)
+
+    def _sorted_product(self, product_id):
+        # the product's rows sorted by alias and by expiry, rebuilt on first search after the product changes
+        views = self._sorted.get(product_id)
+        if views is None:
+            rows = self._rows_by_product[product_id]
+            by_alias = sorted(((self._aliases[row] or "").casefold(), row) for row in rows)
+            by_expiry = sorted((self._expiries[row], row) for row in rows if self._expiries[row] != _NO_EXPIRY)
+            views = self._sorted[product_id] = (
+                [key for key, _ in by_alias],
+                [row for _, row in by_alias],
+                array("q", (expiry for expiry, _ in by_expiry)),
+                [row for _, row in by_expiry],
+            )
+        return views
+
+
+class AsyncInstrumentIndex(InstrumentIndex):
+    """
+    An instrument index loaded with AsyncTTPdsClient. Methods mirror InstrumentIndex, and load returns an awaitable.
+    """
+
+    async def load(self, pds_client, product_ids=None, synthetic: bool = False, max_workers: int = None):
+        result = await pds_client.get_all_instruments_by_product_ids(product_ids or [], max_workers=max_workers)
+        synthetic_instruments = await pds_client.get_all_synthetic_instruments() if synthetic else None
+        return self._add_loaded(result, synthetic_instruments)
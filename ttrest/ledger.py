@@ -1,7 +1,20 @@
 from .rest_client import TTRestClient
+from .async_rest_client import AsyncTTRestClient
 from .authenticator import TTAuthenticator
+from .transport import TTTransport
+from .analytics import FillAggregator
+from .checkpoint import Checkpoint
+from .columnar import ColumnarBuilder
+from .enums import TTEnumRegistry, EnumDecoder
+from .fill_store import TTFillStore, fill_key
+from .tail import AdaptivePollInterval, _TailWatermark
+from .exceptions import UsageError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, date, timedelta
+import asyncio
 import logging
+import threading
+import time
 
 log = logging.getLogger()
 
@@ -12,11 +25,28 @@ class TTLedgerClient(TTRestClient):
 
     Args:
         auth_handler (TTAuthenticator): An authenticator.
+        transport (TTTransport, optional): A pooled HTTP transport to share with other clients. Default is None.
     """
     endpoint = "ttledger"
+    FILLS_PAGE_SIZE = 500  # the maximum number of fills returned by a single /fills request
+    ENUM_REGISTRY = TTEnumRegistry()  # shared by every ledger client in the process unless a registry is passed
+    SYNC_OVERLAP_NS = 5_000_000_000  # fills sync re-requests this window before the watermark to catch late arrivals
 
-    def __init__(self, auth_handler: TTAuthenticator):
-        super().__init__(auth_handler)
+    def __init__(self, auth_handler: TTAuthenticator, transport: TTTransport = None):
+        super().__init__(auth_handler, transport)
+
+    @staticmethod
+    def fill_key(fill):
+        """
+        Gets a key identifying a fill, used to de-duplicate fills returned by overlapping requests.
+
+        Args:
+            fill (dict): A fill record.
+
+        Returns:
+            The fill's recordId, or its serialised content if it has no recordId.
+        """
+        return fill_key(fill)
 
     def _convert_to_nanoseconds(self, dt):
         if isinstance(dt, datetime):
@@ -43,6 +73,52 @@ class TTLedgerClient(TTRestClient):
         dt = datetime.utcfromtimestamp(t_seconds) + timedelta(microseconds=t_microseconds)
         return dt
 
+    def _next_min_timestamp(self, fills):
+        # the next page of fills starts 1ns after the timestamp of the last fill
+        min_timestamp = fills[-1]['timeStamp']
+        return int(min_timestamp) + 1 if isinstance(min_timestamp, str) else min_timestamp + 1
+
+    def _fill_shard_windows(self, min_timestamp, max_timestamp, shards):
+        # splits [min_timestamp, max_timestamp] into equal, disjoint windows of epoch nanoseconds
+        if min_timestamp is None:
+            raise UsageError("A sharded fills request requires a min_timestamp.")
+        if shards < 1:
+            raise UsageError(f"shards must be at least 1, got {shards}")
+
+        min_ns = self._convert_to_nanoseconds(min_timestamp)
+        max_ns = self._convert_to_nanoseconds(max_timestamp) if max_timestamp else time.time_ns()
+        if max_ns < min_ns:
+            raise UsageError(f"max_timestamp ({max_ns}) is before min_timestamp ({min_ns}).")
+
+        step = -(-(max_ns - min_ns + 1) // shards)  # ceiling division
+        return [(lo, min(lo + step - 1, max_ns)) for lo in range(min_ns, max_ns + 1, step)]
+
+    def _next_fill_windows(self, fills, window_max, min_window_ns):
+        # a full page means the window has more fills: split what is left of a wide window so it is fetched in parallel
+        if len(fills) < self.FILLS_PAGE_SIZE:
+            return []
+
+        cursor = self._next_min_timestamp(fills)
+        if cursor > window_max:
+            return []
+
+        if window_max - cursor + 1 >= 2 * min_window_ns:
+            middle = cursor + (window_max - cursor) // 2
+            return [(cursor, middle), (middle + 1, window_max)]
+        return [(cursor, window_max)]
+
+    def _merge_fill_chunks(self, chunks):
+        # chunks are (window start, fills) from disjoint windows, so ordering by window start orders by timestamp
+        fills = []
+        seen = set()
+        for _, chunk in sorted(chunks, key=lambda c: c[0]):
+            for fill in chunk:
+                key = self.fill_key(fill)
+                if key not in seen:
+                    seen.add(key)
+                    fills.append(fill)
+        return fills
+
     def get_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False):
         """
         Retrieves fills for specified criteria.
@@ -79,7 +155,108 @@ class TTLedgerClient(TTRestClient):
         response = self._authenticated_get(url, query=query)
         return response.json()
 
-    def get_all_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False):
+    def _iter_timestamp_responses(self, request_func, results_key, min_timestamp=None, **filters):
+        # yields every response, including the final one that has no records
+        while True:
+            json_response = request_func(min_timestamp=min_timestamp, **filters)
+            yield json_response
+
+            records = json_response.get(results_key, [])
+            message = f"Requested {results_key}"
+            message += f"\n\tParams: min_timestamp={min_timestamp}, " + ", ".join(f"{key}={value}" for key, value in filters.items())
+            message += f"\n\tResults Count: {len(records)}"
+            log.debug(message)
+
+            if len(records) == 0:
+                # if the records are an empty set then there are no more
+                break
+
+            # TT Docs: the GET request returns a maximum of 500 fills (or orders).
+            # To retrieve the next set of fills, you can adjust the minTimestamp parameter as follows:
+            #  1. From the query results, extract the timestamp of the last record.
+            #  2. In the next request, set `minTimestamp` to last_timestamp + 1.
+            #  3. Repeat this until (a) you get a response with an empty set of fills, or (b) a response with < 500 fills
+            # Link: https://library.tradingtechnologies.com/tt-rest/v2/ttledger.html#/default/get_fills
+            min_timestamp = self._next_min_timestamp(records)
+
+    def _iter_timestamp_pages(self, request_func, results_key, min_timestamp=None, **filters):
+        for json_response in self._iter_timestamp_responses(request_func, results_key, min_timestamp, **filters):
+            if len(json_response.get(results_key, [])) > 0:
+                yield json_response
+
+    def _paginate_by_timestamp(self, request_func, results_key, min_timestamp, filters, prefetch=0, checkpoint=None, store_pages=False):
+        if checkpoint is not None:
+            checkpoint.bind({"results": results_key, **filters})
+        if checkpoint is not None and checkpoint.cursor is not None:
+            log.info(f"{results_key.capitalize()}: resuming from checkpoint {checkpoint}")
+            min_timestamp = int(checkpoint.cursor)
+
+        pages = self._prefetch(self._iter_timestamp_pages(request_func, results_key, min_timestamp, **filters), prefetch)
+
+        if checkpoint is not None:
+            pages = self._checkpointed_pages(pages, checkpoint, lambda page: self._next_min_timestamp(page[results_key]), store_pages)
+        return pages
+
+    @staticmethod
+    def _fill_filters(max_timestamp, account_id, order_id, product_id, include_otc):
+        return {"max_timestamp": max_timestamp, "account_id": account_id, "order_id": order_id, "product_id": product_id, "include_otc": include_otc}
+
+    def _iter_fill_responses(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False):
+        filters = self._fill_filters(max_timestamp, account_id, order_id, product_id, include_otc)
+        return self._iter_timestamp_responses(self.get_fills, "fills", min_timestamp, **filters)
+
+    def _iter_fill_pages(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False):
+        filters = self._fill_filters(max_timestamp, account_id, order_id, product_id, include_otc)
+        return self._iter_timestamp_pages(self.get_fills, "fills", min_timestamp, **filters)
+
+    def _paginate_fills(self, min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch=0, checkpoint=None, store_pages=False):
+        filters = self._fill_filters(max_timestamp, account_id, order_id, product_id, include_otc)
+        return self._paginate_by_timestamp(self.get_fills, "fills", min_timestamp, filters, prefetch, checkpoint, store_pages)
+
+    def iter_fill_pages(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, prefetch: int = 0, checkpoint: Checkpoint = None):
+        """
+        Iterates over pages of fills, advancing the minTimestamp cursor after each page. The next page is only
+        requested once the current one has been consumed, unless prefetch is set.
+
+        Args:
+            min_timestamp (int/datetime): Filters fills after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters fills before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            prefetch (int): The number of pages to read ahead on a background worker while the caller processes the
+                            current page. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint): Optional, records the minTimestamp of the next page after each consumed page so an
+                                     interrupted iteration resumes where it stopped.
+
+        Returns:
+            generator: JSON response of each page containing fills.
+        """
+        return self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch, checkpoint)
+
+    def iter_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, prefetch: int = 0, checkpoint: Checkpoint = None):
+        """
+        Iterates over all fills one at a time, handling pagination with constant memory.
+
+        Args:
+            min_timestamp (int/datetime): Filters fills after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters fills before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            prefetch (int): The number of pages to read ahead on a background worker. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint): Optional, records progress after each consumed page so an interrupted iteration
+                                     resumes where it stopped.
+
+        Returns:
+            generator: Fills, in timestamp order.
+        """
+        pages = self.iter_fill_pages(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch, checkpoint)
+        return self._iter_page_records(pages, "fills")
+
+    def get_all_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, checkpoint: Checkpoint = None):
         """
         Retrieves all fills, handling pagination.
 
@@ -90,50 +267,232 @@ class TTLedgerClient(TTRestClient):
             order_id (int): Order ID to filter fills.
             product_id (int): Product ID to filter fills.
             include_otc (bool): Whether to include fills for OTC trades.
+            checkpoint (Checkpoint): Optional, records each page so an interrupted call resumes where it stopped and
+                                     still returns every fill.
 
         Returns:
             list: Aggregated list of fills across multiple requests.
         """
+        if checkpoint is None:
+            pages = self._iter_fill_responses(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc)
+            return self._collect_pages(pages, "fills")
 
-        all_fills = []
+        stored_pages = checkpoint.stored_pages()
+        pages = self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, checkpoint=checkpoint, store_pages=True)
+        return self._collect_pages(pages, "fills", stored_pages)
 
-        while True:
+    def aggregate_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, aggregator: FillAggregator = None, prefetch: int = 0, checkpoint: Checkpoint = None):
+        """
+        Aggregates fills page by page into per-instrument/per-account VWAP, volume and realized P&L, without keeping
+        the fills.
+
+        Args:
+            min_timestamp (int/datetime): Filters fills after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters fills before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            aggregator (FillAggregator): Optional, an aggregator to add to, e.g. to key by other fields or to read the
+                                         aggregates from another thread during the pull. Default is a new aggregator.
+            prefetch (int): The number of pages to read ahead on a background worker. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint): Optional, records progress after each consumed page.
+
+        Returns:
+            FillAggregator: The aggregator.
+        """
+        aggregator = aggregator if aggregator is not None else FillAggregator()
+        pages = self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch, checkpoint)
+        return aggregator.consume(pages)
+
+    def get_all_fills_columnar(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, output: str = "numpy", columns: list = None, prefetch: int = 0):
+        """
+        Retrieves all fills as columns rather than a list of dicts, handling pagination.
+
+        Each page is converted to column arrays as it arrives, so only one page of fill dicts is held at a time.
+        timeStamp is converted to datetime64[ns] (UTC) in one vectorized operation per page. Requires numpy, and
+        pyarrow for Arrow output (pip install tt-rest-api[columnar]).
+
+        Args:
+            min_timestamp (int/datetime): Filters fills after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters fills before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            output (str): "numpy" for a NumPy structured array or "arrow" for a pyarrow Table. Default is "numpy".
+            columns (list): The fill fields to keep. Defaults to every field seen on any page, missing values filled with None (NaT for timestamps).
+            prefetch (int): The number of pages to read ahead on a background worker. Default is 0 (no read-ahead).
+
+        Returns:
+            numpy.ndarray/pyarrow.Table: The fills, in timestamp order, with one column per field.
+        """
+        builder = ColumnarBuilder(output, columns)
+        for page in self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch):
+            builder.add_page(page["fills"])
+        return builder.build()
+
+    def get_all_fills_sharded(self, min_timestamp, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, shards: int = 8, max_workers: int = None, min_window_ns: int = 1_000_000_000):
+        """
+        Retrieves all fills between two timestamps, splitting the range into time windows that are fetched concurrently.
+
+        Each request fetches one page of a window. When a page is full the rest of the window is split in two, so
+        dense periods are subdivided until every window fits a page or is narrower than min_window_ns, in which case it
+        is paginated serially. Adjacent window requests overlap by 1ns and fills are de-duplicated with fill_key().
+
+        Args:
+            min_timestamp (int/datetime): Filters fills after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters fills before the specified datetime or int (epoch time in nanoseconds).
+                                          Defaults to now.
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            shards (int): The number of windows to start with. Default is 8.
+            max_workers (int): The maximum number of concurrent requests. Defaults to the transport pool size.
+            min_window_ns (int): Windows narrower than this are not split further. Default is 1 second.
+
+        Returns:
+            dict: JSON with "fills" holding every fill in the range, in timestamp order.
+        """
+        windows = self._fill_shard_windows(min_timestamp, max_timestamp, shards)
+        chunks = []
+
+        def fetch_window(window_min, window_max):
             fills_json = self.get_fills(
-                min_timestamp=min_timestamp,
-                max_timestamp=max_timestamp,
+                min_timestamp=window_min,
+                max_timestamp=window_max + 1,
                 account_id=account_id,
                 order_id=order_id,
                 product_id=product_id,
                 include_otc=include_otc
             )
+            return fills_json.get("fills", [])
 
-            if "fills" in fills_json:
-                all_fills.extend(fills_json["fills"])
+        with ThreadPoolExecutor(max_workers=max_workers or self.transport.pool_maxsize) as executor:
+            pending = {executor.submit(fetch_window, *window): window for window in windows}
 
-                message = "Requested fills"
-                message += f"\n\tParams: min_timestamp={min_timestamp}, max_timestamp={max_timestamp}, account_id=" \
-                           f"{account_id}, order_id={order_id}, product_id={product_id}, include_otc={include_otc}"
-                message += f"\n\tResults Count: {len(fills_json['fills'])}"
-                log.debug(message)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window_min, window_max = pending.pop(future)
+                    fills = future.result()
+                    chunks.append((window_min, fills))
 
-                if len(fills_json["fills"]) == 0:
-                    # if fills is an empty set then there are no more fills
-                    break
-            else:
-                # there are no fills
-                break
+                    for window in self._next_fill_windows(fills, window_max, min_window_ns):
+                        pending[executor.submit(fetch_window, *window)] = window
 
-            # TT Docs: the GET request returns a maximum of 500 fills.
-            # To retrieve the next set of fills, you can adjust the minTimestamp parameter as follows:
-            #  1. From the query results, extract the timestamp of the last record.
-            #  2. In the next request, set `minTimestamp` to last_timestamp + 1.
-            #  3. Repeat this until (a) you get a response with an empty set of fills, or (b) a response with < 500 fills
-            # Link: https://library.tradingtechnologies.com/tt-rest/v2/ttledger.html#/default/get_fills
-            min_timestamp = fills_json["fills"][-1]['timeStamp']
-            min_timestamp = int(min_timestamp) + 1 if isinstance(min_timestamp, str) else min_timestamp + 1
+        log.debug(f"Requested sharded fills: {len(windows)} windows, {len(chunks)} requests")
+        return {"fills": self._merge_fill_chunks(chunks)}
+
+    def _sync_start(self, store, name, min_timestamp, overlap_ns):
+        # resume just before the watermark, the overlap re-requests fills that arrived late with an earlier timestamp
+        watermark = store.watermark(name)
+        if watermark is None:
+            return min_timestamp
+        start = max(watermark - overlap_ns, 1)
+        if min_timestamp is not None:
+            start = max(start, self._convert_to_nanoseconds(min_timestamp))
+        return start
+
+    def sync_fills(self, store: TTFillStore, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, overlap_ns: int = None):
+        """
+        Brings a local fill store up to date, requesting only the fills after the store's watermark for the filter.
+
+        The first sync for a filter pulls every fill from min_timestamp, later syncs start overlap_ns before the
+        timeStamp of the latest stored fill so fills that arrive late are still picked up. Each page is upserted and
+        the watermark advanced in one transaction, so an interrupted sync carries on from the last stored page.
+
+        Args:
+            store (TTFillStore): The store to sync into.
+            min_timestamp (int/datetime): Where the first sync starts, later syncs never start before it.
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            overlap_ns (int): The window re-requested before the watermark. Defaults to SYNC_OVERLAP_NS (5 seconds).
+
+        Returns:
+            dict: JSON with "fills" holding the fills that were not already in the store.
+        """
+        name = store.watermark_name(account_id, order_id, product_id, include_otc)
+        overlap_ns = self.SYNC_OVERLAP_NS if overlap_ns is None else overlap_ns
+        start = self._sync_start(store, name, min_timestamp, overlap_ns)
 
-        fills_json.update({"fills": all_fills})
-        return fills_json
+        new_fills = []
+        for page in self._iter_fill_pages(start, None, account_id, order_id, product_id, include_otc):
+            new_fills.extend(store.upsert(page["fills"], watermark=name))
+
+        log.debug(f"Synced fills from {start}: {len(new_fills)} new fills")
+        return {"fills": new_fills}
+
+    def _poll_new_fills(self, watermark, filters):
+        # one poll of a live tail: a single request unless the fills fill a page
+        new_fills = []
+        min_timestamp = watermark.min_timestamp
+        while True:
+            fills = self.get_fills(min_timestamp=min_timestamp, **filters).get("fills", [])
+            new_fills.extend(watermark.new_records(fills))
+            if len(fills) < self.FILLS_PAGE_SIZE:
+                return new_fills
+            min_timestamp = self._next_min_timestamp(fills)
+
+    def _tail_fill_batches(self, min_timestamp, filters, stop, min_interval, max_interval):
+        watermark = _TailWatermark(self._convert_to_nanoseconds(min_timestamp) if min_timestamp else time.time_ns(), self.fill_key)
+        interval = AdaptivePollInterval(min_interval, max_interval)
+        stop = stop if stop is not None else threading.Event()
+
+        while not stop.is_set():
+            new_fills = self._poll_new_fills(watermark, filters)
+            if new_fills:
+                yield new_fills
+
+            delay = interval.update(len(new_fills), self._rate_limit_headroom())
+            log.debug(f"Tailing fills from {watermark.min_timestamp}: {len(new_fills)} new fills, next poll in {delay:.2f}s")
+            stop.wait(delay)
+
+    def tail_fills(self, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, stop: threading.Event = None, min_interval: float = 0.5, max_interval: float = 30.0):
+        """
+        Follows new fills as they arrive, polling with an interval that adapts to the fill rate and rate limit headroom.
+
+        Each poll starts at the timestamp of the latest fill delivered, so fills sharing that timestamp that arrive
+        later are not missed, and fills already delivered are dropped.
+
+        Args:
+            min_timestamp (int/datetime): Where the tail starts. Defaults to now.
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            stop (threading.Event): Optional, ends the tail when set. The tail also ends when the generator is closed.
+            min_interval (float): The shortest wait between polls in seconds. Default is 0.5.
+            max_interval (float): The longest wait between polls in seconds, reached during quiet periods. Default is 30.
+
+        Returns:
+            generator: New fills, in timestamp order.
+        """
+        filters = {"account_id": account_id, "order_id": order_id, "product_id": product_id, "include_otc": include_otc}
+        for new_fills in self._tail_fill_batches(min_timestamp, filters, stop, min_interval, max_interval):
+            yield from new_fills
+
+    def follow_fills(self, callback, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, stop: threading.Event = None, min_interval: float = 0.5, max_interval: float = 30.0):
+        """
+        Calls back with each batch of new fills as they arrive, blocking until stop is set. See tail_fills().
+
+        Args:
+            callback: Called with the list of new fills found by each poll.
+            min_timestamp (int/datetime): Where the tail starts. Defaults to now.
+            account_id (int): Account ID to filter fills.
+            order_id (int): Order ID to filter fills.
+            product_id (int): Product ID to filter fills.
+            include_otc (bool): Whether to include fills for OTC trades.
+            stop (threading.Event): Optional, ends the tail when set, e.g. from another thread.
+            min_interval (float): The shortest wait between polls in seconds. Default is 0.5.
+            max_interval (float): The longest wait between polls in seconds. Default is 30.
+        """
+        filters = {"account_id": account_id, "order_id": order_id, "product_id": product_id, "include_otc": include_otc}
+        for new_fills in self._tail_fill_batches(min_timestamp, filters, stop, min_interval, max_interval):
+            callback(new_fills)
 
     def get_order_data(self):
         """
@@ -148,11 +507,262 @@ class TTLedgerClient(TTRestClient):
         response = self._authenticated_get(url)
         return response.json()
 
-    # def get_orders(self):
-    #     # url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/orders"
-    #     raise NotImplementedError()
-    #
-    # def get_order_by_id(self, order_id):
-    #     # url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/orders/{order_id}"
-    #     raise NotImplementedError()
+    def get_enum_decoder(self, registry: TTEnumRegistry = None, field_map: dict = None):
+        """
+        Gets a decoder translating the enum fields of fills and orders, e.g. orderType=1 to its name.
+
+        The order data is requested at most once per environment for the registry's TTL, later calls reuse the cached
+        definitions.
+
+        Args:
+            registry (TTEnumRegistry): Optional, a registry caching the order data, e.g. one persisted to disk.
+                                       Defaults to the in-memory ENUM_REGISTRY shared by all ledger clients.
+            field_map (dict): Optional, maps record fields to order data fields where the names don't match.
+
+        Returns:
+            EnumDecoder: The decoder.
+        """
+        registry = registry if registry is not None else self.ENUM_REGISTRY
+        order_data = registry.load(self.auth_handler.environment)
+        if order_data is None:
+            order_data = self.get_order_data()
+            registry.store(self.auth_handler.environment, order_data)
+        return EnumDecoder(order_data, field_map)
+
+    def get_orders(self, min_timestamp=None, max_timestamp=None, account_id=None):
+        """
+        Retrieves orders for specified criteria.
+
+        Args:
+            min_timestamp (int/datetime): Filters orders after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters orders before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter orders.
+
+        Returns:
+            dict: JSON response containing orders information.
+
+        Note:
+            Like fills, the GET request returns a maximum of 500 orders. To retrieve the next set of orders, adjust the
+            minTimestamp parameter or use get_all_orders().
+        """
+        query = {
+            "accountId": account_id,
+            "maxTimestamp": self._convert_to_nanoseconds(max_timestamp) if max_timestamp else None,
+            "minTimestamp": self._convert_to_nanoseconds(min_timestamp) if min_timestamp else None,
+        }
+        # Filter out the keys with Null values
+        query = {key: value for key, value in query.items() if value is not None}
+
+        url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/orders"
+        response = self._authenticated_get(url, query=query)
+        return response.json()
+
+    def iter_order_pages(self, min_timestamp=None, max_timestamp=None, account_id=None, prefetch: int = 0, checkpoint: Checkpoint = None):
+        """
+        Iterates over pages of orders, advancing the minTimestamp cursor after each page. The next page is only
+        requested once the current one has been consumed, unless prefetch is set.
+
+        Args:
+            min_timestamp (int/datetime): Filters orders after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters orders before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter orders.
+            prefetch (int): The number of pages to read ahead on a background worker. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint): Optional, records progress after each consumed page so an interrupted iteration
+                                     resumes where it stopped.
+
+        Returns:
+            generator: JSON response of each page containing orders.
+        """
+        filters = {"max_timestamp": max_timestamp, "account_id": account_id}
+        return self._paginate_by_timestamp(self.get_orders, "orders", min_timestamp, filters, prefetch, checkpoint)
+
+    def iter_orders(self, min_timestamp=None, max_timestamp=None, account_id=None, prefetch: int = 0, checkpoint: Checkpoint = None):
+        """
+        Iterates over all orders one at a time, handling pagination with constant memory.
+
+        Args:
+            min_timestamp (int/datetime): Filters orders after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters orders before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter orders.
+            prefetch (int): The number of pages to read ahead on a background worker. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint): Optional, records progress after each consumed page so an interrupted iteration
+                                     resumes where it stopped.
+
+        Returns:
+            generator: Orders, in timestamp order.
+        """
+        pages = self.iter_order_pages(min_timestamp, max_timestamp, account_id, prefetch, checkpoint)
+        return self._iter_page_records(pages, "orders")
+
+    def get_all_orders(self, min_timestamp=None, max_timestamp=None, account_id=None, checkpoint: Checkpoint = None):
+        """
+        Retrieves all orders, handling pagination.
+
+        Args:
+            min_timestamp (int/datetime): Filters orders after the specified datetime or int (epoch time in nanoseconds).
+            max_timestamp (int/datetime): Filters orders before the specified datetime or int (epoch time in nanoseconds).
+            account_id (int): Account ID to filter orders.
+            checkpoint (Checkpoint): Optional, records each page so an interrupted call resumes where it stopped and
+                                     still returns every order.
+
+        Returns:
+            dict: JSON with "orders" aggregated across multiple requests.
+        """
+        filters = {"max_timestamp": max_timestamp, "account_id": account_id}
+        if checkpoint is None:
+            pages = self._iter_timestamp_responses(self.get_orders, "orders", min_timestamp, **filters)
+            return self._collect_pages(pages, "orders")
+
+        stored_pages = checkpoint.stored_pages()
+        pages = self._paginate_by_timestamp(self.get_orders, "orders", min_timestamp, filters, checkpoint=checkpoint, store_pages=True)
+        return self._collect_pages(pages, "orders", stored_pages)
+
+    def get_order_by_id(self, order_id):
+        """
+        Retrieves an order given its ID.
+
+        Args:
+            order_id (str): The order ID.
+
+        Returns:
+            dict: JSON response containing the order.
+        """
+        url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/orders/{order_id}"
+        response = self._authenticated_get(url)
+        return response.json()
+
+    def get_orders_by_ids(self, order_ids, max_workers=None):
+        """
+        Retrieves many orders given their IDs, requesting them concurrently.
+
+        Args:
+            order_ids: An iterable of order IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses and errors keyed by order ID, in input order.
+        """
+        return self._bulk_request(self.get_order_by_id, order_ids, max_workers=max_workers)
+
+
+class AsyncTTLedgerClient(AsyncTTRestClient, TTLedgerClient):
+    """
+    An asyncio Rest API Client implementing the TT Ledger endpoints. Methods mirror TTLedgerClient and return awaitables.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport to share with other clients. Default is None.
+    """
+
+    async def _iter_timestamp_responses(self, request_func, results_key, min_timestamp=None, **filters):
+        # yields every response, including the final one that has no records
+        while True:
+            json_response = await request_func(min_timestamp=min_timestamp, **filters)
+            yield json_response
+
+            if len(json_response.get(results_key, [])) == 0:
+                break
+
+            min_timestamp = self._next_min_timestamp(json_response[results_key])
+
+    async def _iter_timestamp_pages(self, request_func, results_key, min_timestamp=None, **filters):
+        async for json_response in self._iter_timestamp_responses(request_func, results_key, min_timestamp, **filters):
+            if len(json_response.get(results_key, [])) > 0:
+                yield json_response
+
+    async def _poll_new_fills(self, watermark, filters):
+        new_fills = []
+        min_timestamp = watermark.min_timestamp
+        while True:
+            fills = (await self.get_fills(min_timestamp=min_timestamp, **filters)).get("fills", [])
+            new_fills.extend(watermark.new_records(fills))
+            if len(fills) < self.FILLS_PAGE_SIZE:
+                return new_fills
+            min_timestamp = self._next_min_timestamp(fills)
+
+    async def _tail_fill_batches(self, min_timestamp, filters, stop, min_interval, max_interval):
+        # stop is an asyncio.Event
+        watermark = _TailWatermark(self._convert_to_nanoseconds(min_timestamp) if min_timestamp else time.time_ns(), self.fill_key)
+        interval = AdaptivePollInterval(min_interval, max_interval)
+        stop = stop if stop is not None else asyncio.Event()
+
+        while not stop.is_set():
+            new_fills = await self._poll_new_fills(watermark, filters)
+            if new_fills:
+                yield new_fills
+
+            delay = interval.update(len(new_fills), self._rate_limit_headroom())
+            log.debug(f"Tailing fills from {watermark.min_timestamp}: {len(new_fills)} new fills, next poll in {delay:.2f}s")
+            try:
+                await asyncio.wait_for(stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def tail_fills(self, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, stop: asyncio.Event = None, min_interval: float = 0.5, max_interval: float = 30.0):
+        filters = {"account_id": account_id, "order_id": order_id, "product_id": product_id, "include_otc": include_otc}
+        async for new_fills in self._tail_fill_batches(min_timestamp, filters, stop, min_interval, max_interval):
+            for fill in new_fills:
+                yield fill
+
+    async def follow_fills(self, callback, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, stop: asyncio.Event = None, min_interval: float = 0.5, max_interval: float = 30.0):
+        filters = {"account_id": account_id, "order_id": order_id, "product_id": product_id, "include_otc": include_otc}
+        async for new_fills in self._tail_fill_batches(min_timestamp, filters, stop, min_interval, max_interval):
+            result = callback(new_fills)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def get_enum_decoder(self, registry: TTEnumRegistry = None, field_map: dict = None):
+        registry = registry if registry is not None else self.ENUM_REGISTRY
+        order_data = registry.load(self.auth_handler.environment)
+        if order_data is None:
+            order_data = await self.get_order_data()
+            registry.store(self.auth_handler.environment, order_data)
+        return EnumDecoder(order_data, field_map)
+
+    async def aggregate_fills(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, aggregator: FillAggregator = None, prefetch: int = 0, checkpoint: Checkpoint = None):
+        aggregator = aggregator if aggregator is not None else FillAggregator()
+        async for page in self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch, checkpoint):
+            aggregator.add(page["fills"])
+        return aggregator
+
+    async def get_all_fills_columnar(self, min_timestamp=None, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, output: str = "numpy", columns: list = None, prefetch: int = 0):
+        builder = ColumnarBuilder(output, columns)
+        async for page in self._paginate_fills(min_timestamp, max_timestamp, account_id, order_id, product_id, include_otc, prefetch):
+            builder.add_page(page["fills"])
+        return builder.build()
+
+    async def get_all_fills_sharded(self, min_timestamp, max_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, shards: int = 8, max_workers: int = None, min_window_ns: int = 1_000_000_000):
+        windows = self._fill_shard_windows(min_timestamp, max_timestamp, shards)
+        semaphore = asyncio.Semaphore(max_workers or self.DEFAULT_MAX_CONCURRENCY)
+        chunks = []
+
+        async def fetch_window(window_min, window_max):
+            async with semaphore:
+                fills_json = await self.get_fills(
+                    min_timestamp=window_min,
+                    max_timestamp=window_max + 1,
+                    account_id=account_id,
+                    order_id=order_id,
+                    product_id=product_id,
+                    include_otc=include_otc
+                )
+            fills = fills_json.get("fills", [])
+            chunks.append((window_min, fills))
+            await asyncio.gather(*[fetch_window(*window) for window in self._next_fill_windows(fills, window_max, min_window_ns)])
+
+        await asyncio.gather(*[fetch_window(*window) for window in windows])
+
+        log.debug(f"Requested sharded fills: {len(windows)} windows, {len(chunks)} requests")
+        return {"fills": self._merge_fill_chunks(chunks)}
+
+    async def sync_fills(self, store: TTFillStore, min_timestamp=None, account_id=None, order_id=None, product_id=None, include_otc: bool = False, overlap_ns: int = None):
+        name = store.watermark_name(account_id, order_id, product_id, include_otc)
+        overlap_ns = self.SYNC_OVERLAP_NS if overlap_ns is None else overlap_ns
+        start = self._sync_start(store, name, min_timestamp, overlap_ns)
+
+        new_fills = []
+        async for page in self._iter_fill_pages(start, None, account_id, order_id, product_id, include_otc):
+            new_fills.extend(store.upsert(page["fills"], watermark=name))
 
+        log.debug(f"Synced fills from {start}: {len(new_fills)} new fills")
+        return {"fills": new_fills}
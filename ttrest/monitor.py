@@ -1,5 +1,11 @@
 from .rest_client import TTRestClient
+from .async_rest_client import AsyncTTRestClient
+from .account import TTAccountClient, AsyncTTAccountClient
 from .authenticator import TTAuthenticator
+from .transport import TTTransport
+from .checkpoint import Checkpoint
+from .exceptions import UsageError
+from .sod_cache import TTSodCache
 from enum import Enum
 
 import logging
@@ -16,17 +22,26 @@ class ScaleQty(Enum):
     IN_FLOW = 1
 
 
+def _add_scale_qty(query, scale_qty):
+    # scale_qty may be a ScaleQty, its value or None, the API's default is sent as no parameter
+    if scale_qty not in (None, ScaleQty.DEFAULT):
+        query["scaleQty"] = str(ScaleQty(scale_qty).value)
+    return query
+
+
 class TTMonitorClient(TTRestClient):
     """
     A Rest API Client implementing the TT Monitor endpoints.
 
     Args:
         auth_handler (TTAuthenticator): An authenticator.
+        transport (TTTransport, optional): A pooled HTTP transport to share with other clients. Default is None.
     """
     endpoint = "ttmonitor"
+    POSITION_TYPES = ("position", "productposition", "productfamilyposition")
 
-    def __init__(self, auth_handler: TTAuthenticator):
-        super().__init__(auth_handler)
+    def __init__(self, auth_handler: TTAuthenticator, transport: TTTransport = None):
+        super().__init__(auth_handler, transport)
 
     def get_credit_utilization(self, account_id, include_product_pos=None, next_page_key=None):
         """
@@ -78,6 +93,51 @@ class TTMonitorClient(TTRestClient):
             include_product_pos=include_product_pos
         )
 
+    def iter_credit_utilization(self, account_id, include_product_pos=None):
+        """
+        Iterates over credit limit and credit utilization details for a given account, requesting each page only once
+        the previous one has been consumed.
+
+        Args:
+            account_id: Account ID
+            include_product_pos: Include product position
+
+        Returns: Generator of credit utilization records.
+        """
+        return self._iter_records(
+            self.get_credit_utilization,
+            "creditUtilization",
+            account_id=account_id,
+            include_product_pos=include_product_pos
+        )
+
+    def get_all_credit_utilization_by_account_ids(self, account_ids, include_product_pos=None, max_workers=None):
+        """
+        Gets all credit limit and credit utilization details for many accounts, paginating each account concurrently.
+
+        Args:
+            account_ids: An iterable of account IDs. Duplicate IDs are only requested once.
+            include_product_pos: Include product position
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns: BulkResult of credit utilization and errors keyed by account ID, in input order.
+        """
+        return self._bulk_request(self.get_all_credit_utilization, account_ids, max_workers=max_workers, include_product_pos=include_product_pos)
+
+    def iter_credit_utilization_by_account_ids(self, account_ids, include_product_pos=None, max_workers=None):
+        """
+        Gets all credit limit and credit utilization details for many accounts, paginating each account concurrently
+        and yielding each account as soon as it completes.
+
+        Args:
+            account_ids: An iterable of account IDs. Duplicate IDs are only requested once.
+            include_product_pos: Include product position
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns: Generator of (account ID, JSON record, None) for each account that succeeded and (account ID, None, exception) for each that failed, in completion order.
+        """
+        return self._iter_bulk_request(self.get_all_credit_utilization, account_ids, max_workers=max_workers, include_product_pos=include_product_pos)
+
     def get_position(self, account_ids: [None, list, int, str] = None, scale_qty: ScaleQty=ScaleQty.DEFAULT, next_page_key=None):
         """
         Gets positions based on today's fills for the all accounts associated with the application key or for specific accounts. Included in the response are SODs.
@@ -99,10 +159,7 @@ class TTMonitorClient(TTRestClient):
                 "accountIds": ",".join([str(account_id) for account_id in account_ids]) if isinstance(account_ids, list) else account_ids
             })
 
-        if scale_qty != scale_qty.DEFAULT:
-            query.update({
-                "scaleQty": str(scale_qty.value)
-            })
+        _add_scale_qty(query, scale_qty)
 
         if next_page_key is not None:
             query.update({
@@ -113,13 +170,14 @@ class TTMonitorClient(TTRestClient):
         response = self._authenticated_get(url, query=query)
         return response.json()
 
-    def get_all_position(self, account_ids: [None, list, int, str] = None, scale_qty: ScaleQty=ScaleQty.DEFAULT):
+    def get_all_position(self, account_ids: [None, list, int, str] = None, scale_qty: ScaleQty=ScaleQty.DEFAULT, checkpoint: Checkpoint = None):
         """
         Gets all positions based on today's fills for the all accounts associated with the application key or for specific accounts. Included in the response are SODs.
 
         Args:
             account_ids: Comma-separated list of Account IDs
             scale_qty: Receive position quantities in flow or as a number of contracts. (0 = contracts, 1 = in flow). Instruments whose position can be displayed in flow will default to flow. The scaleQty parameter provides the ability to specify how positions are displayed for these instruments.
+            checkpoint: A Checkpoint recording each page so an interrupted call resumes where it stopped.
 
         Returns: JSON record of positions based on today's fills for the all accounts associated with the application key or for specific accounts. Included in the response are SODs. P&L is expressed in the instrument's currency.
 
@@ -128,9 +186,96 @@ class TTMonitorClient(TTRestClient):
             self.get_position,
             results_key="positions",
             account_ids=account_ids,
-            scale_qty=scale_qty
+            scale_qty=scale_qty,
+            checkpoint=checkpoint
         )
 
+    def iter_positions(self, account_ids: [None, list, int, str] = None, scale_qty: ScaleQty=ScaleQty.DEFAULT, checkpoint: Checkpoint = None):
+        """
+        Iterates over positions based on today's fills for the all accounts associated with the application key or for specific accounts, requesting each page only once the previous one has been consumed.
+
+        Args:
+            account_ids: Comma-separated list of Account IDs
+            scale_qty: Receive position quantities in flow or as a number of contracts. (0 = contracts, 1 = in flow). Instruments whose position can be displayed in flow will default to flow. The scaleQty parameter provides the ability to specify how positions are displayed for these instruments.
+            checkpoint: A Checkpoint recording each consumed page so an interrupted iteration resumes where it stopped.
+
+        Returns: Generator of position records. P&L is expressed in the instrument's currency.
+
+        """
+        return self._iter_records(
+            self.get_position,
+            "positions",
+            account_ids=account_ids,
+            scale_qty=scale_qty,
+            checkpoint=checkpoint
+        )
+
+    def _discover_account_ids(self):
+        account_client = TTAccountClient(self.auth_handler, transport=self.transport)
+        return [account["id"] for account in account_client.get_all_accounts()["accounts"]]
+
+    def _position_chunks(self, account_ids, chunk_size, position_type):
+        if position_type not in self.POSITION_TYPES:
+            raise UsageError(f"position_type must be one of {self.POSITION_TYPES}, got {position_type!r}")
+        if chunk_size < 1:
+            raise UsageError(f"chunk_size must be at least 1, got {chunk_size}")
+
+        account_ids = list(dict.fromkeys(account_ids))
+        return [tuple(account_ids[i:i + chunk_size]) for i in range(0, len(account_ids), chunk_size)]
+
+    def _position_chunk_request(self, position_type, scale_qty):
+        request_func = {
+            "position": self.get_all_position,
+            "productposition": self.get_product_position,
+            "productfamilyposition": self.get_product_family_position,
+        }[position_type]
+
+        def get_position_chunk(chunk):
+            return request_func(account_ids=list(chunk), scale_qty=scale_qty)
+        return get_position_chunk
+
+    @staticmethod
+    def _merge_position_chunks(result):
+        if not result.ok:
+            log.error(f"Position request failed for {len(result.errors)} of {len(result)} account chunks")
+            raise next(iter(result.errors.values()))
+
+        # the records of each chunk are concatenated, other fields are taken from the first chunk
+        merged = {}
+        for response in result.results.values():
+            for key, value in response.items():
+                if isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+                else:
+                    merged.setdefault(key, value)
+        return merged
+
+    def get_all_position_chunked(self, account_ids: list = None, chunk_size: int = 50, position_type: str = "position", scale_qty: ScaleQty = ScaleQty.DEFAULT, max_workers: int = None):
+        """
+        Gets positions for many accounts by splitting them into chunks of account IDs requested concurrently, as TT
+        recommends filtering by account to avoid response timeouts. The records of every chunk are merged.
+
+        Args:
+            account_ids: The account IDs. Defaults to every account associated with the application key, discovered
+                         with TTAccountClient.get_all_accounts().
+            chunk_size: The number of accounts per request. Default is 50.
+            position_type: "position" (paginated), "productposition" or "productfamilyposition". Default is "position".
+            scale_qty: Receive position quantities in flow or as a number of contracts.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns: JSON record with the positions of every account chunk. P&L is expressed in the instrument's currency.
+
+        Raises:
+            UsageError: If position_type or chunk_size is invalid.
+            PostRequestError: If the request for any chunk fails.
+        """
+        if account_ids is None:
+            account_ids = self._discover_account_ids()
+        chunks = self._position_chunks(account_ids, chunk_size, position_type)
+
+        result = self._bulk_request(self._position_chunk_request(position_type, scale_qty), chunks, max_workers=max_workers)
+        return self._merge_position_chunks(result)
+
     def get_position_for_account(self, account_id: [int, str], scale_qty=None):
         """
         Gets positions based on today's fills for the provided account ID. Included in the response are SODs.
@@ -142,11 +287,7 @@ class TTMonitorClient(TTRestClient):
 
         Returns: JSON record of positions based on today's fills for the provided accountId. Included in the response are SODs. P&L is expressed in the instrument's currency.
         """
-        query = None
-        if scale_qty:
-            query = {
-                "scaleQty": str(scale_qty)
-            }
+        query = _add_scale_qty({}, scale_qty) or None
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/position/{account_id}"
         response = self._authenticated_get(url, query=query)
@@ -187,12 +328,9 @@ class TTMonitorClient(TTRestClient):
                 "accountIds": ",".join([str(account_id) for account_id in account_ids]) if isinstance(account_ids, list) else account_ids
             })
 
-        if scale_qty:
-            query.update({
-                "scaleQty": str(scale_qty)
-            })
+        _add_scale_qty(query, scale_qty)
 
-        if (not account_ids) and (not scale_qty):
+        if not query:
             query = None
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productfamilyposition"
@@ -209,11 +347,7 @@ class TTMonitorClient(TTRestClient):
         Returns: JSON record of product family positions based on today's fills for the provided accountId. Included in the response are SODs. P&L is expressed in the instrument's currency.
 
         """
-        query = None
-        if scale_qty:
-            query = {
-                "scaleQty": str(scale_qty)
-            }
+        query = _add_scale_qty({}, scale_qty) or None
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productfamilyposition/{account_id}"
         response = self._authenticated_get(url, query=query)
@@ -236,12 +370,9 @@ class TTMonitorClient(TTRestClient):
                 "accountIds": ",".join([str(account_id) for account_id in account_ids]) if isinstance(account_ids, list) else account_ids
             })
 
-        if scale_qty:
-            query.update({
-                "scaleQty": str(scale_qty)
-            })
+        _add_scale_qty(query, scale_qty)
 
-        if (not account_ids) and (not scale_qty):
+        if not query:
             query = None
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productposition"
@@ -258,11 +389,7 @@ class TTMonitorClient(TTRestClient):
         Returns: JSON record of product positions based on today's fills for the provided accountId. Included in the response are SODs. P&L is expressed in the instrument's currency.
 
         """
-        query = None
-        if scale_qty:
-            query = {
-                "scaleQty": str(scale_qty)
-            }
+        query = _add_scale_qty({}, scale_qty) or None
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productposition/{account_id}"
         response = self._authenticated_get(url, query=query)
@@ -284,15 +411,89 @@ class TTMonitorClient(TTRestClient):
         response = self._authenticated_get(url, query=query)
         return response.json()
 
-    def get_all_sod(self, account_id):
+    def get_all_sod(self, account_id, cache: TTSodCache = None, refresh: bool = False):
         """
         Args:
             account_id: Account ID
+            cache: Optional, a TTSodCache so the SOD is only requested once per account and trading date.
+            refresh: Request the SOD even if it is cached, and cache the new one. Default is False.
 
         Returns: JSON record of all SODs for a given account ID.
         """
-        return self._generic_paginated_request(
+        if cache is None:
+            return self._generic_paginated_request(self.get_sod, results_key="sod", account_id=account_id)
+
+        trading_date = cache.trading_date()
+        sod = None if refresh else cache.get(self.auth_handler.environment, account_id, trading_date)
+        if sod is None:
+            sod = self._generic_paginated_request(self.get_sod, results_key="sod", account_id=account_id)
+            cache.put(self.auth_handler.environment, account_id, sod, trading_date)
+        return sod
+
+    def iter_sod(self, account_id):
+        """
+        Args:
+            account_id: Account ID
+
+        Returns: Generator of SOD records for a given account ID, requesting each page only once the previous one has been consumed.
+        """
+        return self._iter_records(
             self.get_sod,
-            results_key="sod",
+            "sod",
             account_id=account_id
         )
+
+    def get_all_sod_by_account_ids(self, account_ids, max_workers=None, cache: TTSodCache = None):
+        """
+        Args:
+            account_ids: An iterable of account IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+            cache: Optional, a TTSodCache so each SOD is only requested once per trading date.
+
+        Returns: BulkResult of all SODs and errors keyed by account ID, in input order. Accounts are requested concurrently.
+        """
+        return self._bulk_request(self.get_all_sod, account_ids, max_workers=max_workers, cache=cache)
+
+    def iter_sod_by_account_ids(self, account_ids, max_workers=None, cache: TTSodCache = None):
+        """
+        Args:
+            account_ids: An iterable of account IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+            cache: Optional, a TTSodCache so each SOD is only requested once per trading date.
+
+        Returns: Generator of (account ID, JSON record of all SODs, None) for each account that succeeded and (account ID, None, exception) for each that failed, in completion order. Accounts are requested concurrently.
+        """
+        return self._iter_bulk_request(self.get_all_sod, account_ids, max_workers=max_workers, cache=cache)
+
+
+class AsyncTTMonitorClient(AsyncTTRestClient, TTMonitorClient):
+    """
+    An asyncio Rest API Client implementing the TT Monitor endpoints. Methods mirror TTMonitorClient and return awaitables.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport to share with other clients. Default is None.
+    """
+
+    async def _discover_account_ids(self):
+        account_client = AsyncTTAccountClient(self.auth_handler, transport=self.transport)
+        return [account["id"] for account in (await account_client.get_all_accounts())["accounts"]]
+
+    async def get_all_sod(self, account_id, cache: TTSodCache = None, refresh: bool = False):
+        if cache is None:
+            return await self._generic_paginated_request(self.get_sod, results_key="sod", account_id=account_id)
+
+        trading_date = cache.trading_date()
+        sod = None if refresh else cache.get(self.auth_handler.environment, account_id, trading_date)
+        if sod is None:
+            sod = await self._generic_paginated_request(self.get_sod, results_key="sod", account_id=account_id)
+            cache.put(self.auth_handler.environment, account_id, sod, trading_date)
+        return sod
+
+    async def get_all_position_chunked(self, account_ids: list = None, chunk_size: int = 50, position_type: str = "position", scale_qty: ScaleQty = ScaleQty.DEFAULT, max_workers: int = None):
+        if account_ids is None:
+            account_ids = await self._discover_account_ids()
+        chunks = self._position_chunks(account_ids, chunk_size, position_type)
+
+        result = await self._bulk_request(self._position_chunk_request(position_type, scale_qty), chunks, max_workers=max_workers)
+        return self._merge_position_chunks(result)
@@ -1,17 +1,81 @@
 from .rest_client import TTRestClient
+from .async_rest_client import AsyncTTRestClient
 from .authenticator import TTAuthenticator
+from .transport import TTTransport
 from .exceptions import UsageError
+from .checkpoint import Checkpoint
+from .bulk import CrawlReport
+from .reference_cache import TTReferenceCache
 
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 log = logging.getLogger()
 
 
 class TTPdsClient(TTRestClient):
+    """
+    A Rest API Client implementing the TT PDS (product data service) endpoints.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (TTTransport, optional): A pooled HTTP transport to share with other clients. Default is None.
+        cache (TTReferenceCache, optional): A cache for reference data (markets, products, instruments, product
+                                            families, MICs and security exchanges), so it is only requested again once
+                                            it expires. Default is None.
+    """
     endpoint = "ttpds"
+    MAX_MARKETS_PER_REQUEST = 10
 
-    def __init__(self, auth_handler: TTAuthenticator):
-        super().__init__(auth_handler)
+    def __init__(self, auth_handler: TTAuthenticator, transport: TTTransport = None, cache: TTReferenceCache = None):
+        super().__init__(auth_handler, transport)
+        self.cache = cache
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def _join_flight(self, key, new_lock):
+        # the lock serialising the requests of a cache key, shared by every caller until the last one leaves
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [new_lock(), 0])
+            flight[1] += 1
+            return flight[0]
+
+    def _leave_flight(self, key):
+        with self._flights_lock:
+            flight = self._flights[key]
+            flight[1] -= 1
+            if not flight[1]:
+                del self._flights[key]
+
+    def _cached(self, name, params, request):
+        """
+        Return a response from the reference data cache, or make the request and cache its response. Concurrent misses
+        of the same response wait for the first one's request rather than making their own.
+
+        Args:
+            name (str): The PDS endpoint, e.g. "markets".
+            params (dict): The request arguments.
+            request: A callable making the uncached request.
+
+        Returns:
+            dict: JSON response.
+        """
+        if self.cache is None:
+            return request()
+
+        environment = self.auth_handler.environment
+        key = self.cache.key(environment, name, params)
+        try:
+            with self._join_flight(key, threading.Lock):
+                response = self.cache.get(environment, name, params)
+                if response is None:
+                    response = request()
+                    self.cache.put(environment, name, params, response)
+        finally:
+            self._leave_flight(key)
+        return response
 
     def get_algo_data(self):
         """
@@ -124,8 +188,20 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing detailed information about an individual instrument.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/instrument/{instrument_id}"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("instrument", {"instrumentId": instrument_id}, lambda: self._authenticated_get(url).json())
+
+    def get_instruments_by_ids(self, instrument_ids, max_workers=None):
+        """
+        Gets detailed information about many instruments given their IDs, requesting them concurrently.
+
+        Args:
+            instrument_ids: An iterable of Instrument IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses and errors keyed by instrument ID, in input order.
+        """
+        return self._bulk_request(self.get_instrument, instrument_ids, max_workers=max_workers)
 
     def get_instrument_data(self):
         """
@@ -135,8 +211,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing instrument reference data.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/instrumentdata"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("instrumentdata", {}, lambda: self._authenticated_get(url).json())
 
     def get_instruments(self, product_type_id=None, product_id=None, alias=None, next_page_key=None):
         """
@@ -176,7 +251,7 @@ class TTPdsClient(TTRestClient):
         response = self._authenticated_get(url, query=query)
         return response.json()
 
-    def get_all_instruments(self, product_type_id=None, product_id=None, alias=None):
+    def get_all_instruments(self, product_type_id=None, product_id=None, alias=None, checkpoint: Checkpoint = None):
         """
         Gets a list of instruments given a product type ID or a product ID.
 
@@ -188,18 +263,149 @@ class TTPdsClient(TTRestClient):
             product_id: Filter response to fills for a specific product. Product ID can be retrieved using the ttpds
                         service's /products GET request.
             alias: An alias
+            checkpoint: Optional, a Checkpoint recording each page so an interrupted call resumes where it stopped.
 
         Returns:
             dict: JSON response containing a list of instruments.
         """
-        return self._generic_paginated_request(
+        return self._cached(
+            "instruments",
+            {"productTypeId": product_type_id, "productId": product_id, "alias": alias},
+            lambda: self._generic_paginated_request(
+                self.get_instruments,
+                results_key="instruments",
+                product_type_id=product_type_id,
+                product_id=product_id,
+                alias=alias,
+                checkpoint=checkpoint
+            )
+        )
+
+    def iter_instruments(self, product_type_id=None, product_id=None, alias=None, checkpoint: Checkpoint = None):
+        """
+        Iterates over instruments given a product type ID or a product ID, requesting each page only once the previous
+        one has been consumed.
+
+        Args:
+            product_type_id: Product type ID. Can be retrieved by the /productdata GET request.
+            product_id: Filter response to fills for a specific product. Product ID can be retrieved using the ttpds
+                        service's /products GET request.
+            alias: An alias
+            checkpoint: Optional, a Checkpoint recording each consumed page so an interrupted iteration resumes where it stopped.
+
+        Returns:
+            generator: Instrument records.
+        """
+        return self._iter_records(
             self.get_instruments,
-            results_key="instruments",
+            "instruments",
             product_type_id=product_type_id,
             product_id=product_id,
-            alias=alias
+            alias=alias,
+            checkpoint=checkpoint
         )
 
+    def _get_all_instruments_of_product(self, product_id):
+        return self.get_all_instruments(product_id=product_id)
+
+    def get_all_instruments_by_product_ids(self, product_ids, max_workers=None):
+        """
+        Gets the instruments of many products, requesting the products concurrently.
+
+        Args:
+            product_ids: An iterable of Product IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses containing a list of instruments and errors keyed by product ID, in input order.
+        """
+        return self._bulk_request(self._get_all_instruments_of_product, product_ids, max_workers=max_workers)
+
+    def crawl(self, sink, market_ids=None, product_type_ids=None, max_workers=None, progress=None):
+        """
+        Crawls the reference data hierarchy, markets then the products of each market then the instruments of each
+        product, passing the records to a sink as they arrive.
+
+        Requests are made concurrently on a bounded thread pool, and the instruments of a market's products are
+        requested as soon as its products arrive rather than after every market. The sink and progress callback are
+        called from the calling thread. A failed market or product is recorded in the report and doesn't stop the crawl.
+
+        Args:
+            sink: Called as sink(kind, parent_id, records) with kind "markets" (parent_id None), "products" (the market
+                  ID) or "instruments" (the product ID).
+            market_ids: Optional, the markets to crawl. Defaults to every market.
+            product_type_ids: Optional, the product types to crawl, e.g. futures only. Defaults to every product type.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+            progress: Optional, called with the CrawlReport each time a market or product completes.
+
+        Returns:
+            CrawlReport: The number of records delivered and the failed markets and products.
+        """
+        report = CrawlReport()
+        markets = self._crawl_markets(self.get_markets(), market_ids, report)
+        sink("markets", None, markets)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.transport.pool_maxsize)
+        pending = {}
+
+        def submit(level, node_id, request_func):
+            pending[executor.submit(request_func, node_id)] = (level, node_id)
+            report.requested += 1
+
+        try:
+            for market in markets:
+                submit("market", market.get("id"), self.get_all_products)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    level, node_id = pending.pop(future)
+                    error = future.exception()
+                    delivery = self._crawl_node(report, level, node_id, None if error else future.result(), error, product_type_ids)
+                    if delivery is not None:
+                        kind, records = delivery
+                        sink(kind, node_id, records)
+                        if level == "market":
+                            for product in records:
+                                submit("product", product.get("id"), self._get_all_instruments_of_product)
+                    if progress is not None:
+                        progress(report)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        log.debug(f"Crawl finished: {report}")
+        return report
+
+    @staticmethod
+    def _crawl_markets(response, market_ids, report):
+        markets = response.get("markets", [])
+        if market_ids is not None:
+            market_ids = {str(market_id) for market_id in market_ids}
+            markets = [market for market in markets if str(market.get("id")) in market_ids]
+        report.markets += len(markets)
+        return markets
+
+    @staticmethod
+    def _crawl_node(report, level, node_id, response, error, product_type_ids):
+        # count a completed market or product, returning the (kind, records) to deliver or None if it failed
+        report.completed += 1
+        if error is not None:
+            log.warning(f"Crawl of {level} {node_id} failed: {error}")
+            report.errors[(level, node_id)] = error
+            return None
+
+        if level == "market":
+            products = response.get("products", [])
+            if product_type_ids is not None:
+                product_type_ids = {str(product_type_id) for product_type_id in product_type_ids}
+                products = [product for product in products if str(product.get("productTypeId")) in product_type_ids]
+            report.products += len(products)
+            return "products", products
+
+        instruments = response.get("instruments", [])
+        report.instruments += len(instruments)
+        return "instruments", instruments
+
     def get_markets(self):
         """
         Gets the list of markets.
@@ -208,8 +414,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing a list of markets.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/markets"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("markets", {}, lambda: self._authenticated_get(url).json())
 
     def get_miccodes(self):
         """
@@ -219,8 +424,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing a list of Market Identification Codes (MIC).
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/miccodes"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("miccodes", {}, lambda: self._authenticated_get(url).json())
 
     def get_mics(self):
         """
@@ -230,8 +434,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing a list of Market Identification Codes (MIC).
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/mics"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("mics", {}, lambda: self._authenticated_get(url).json())
 
     def get_product(self, product_id):
         """
@@ -244,8 +447,20 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing a list of instruments.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/product/{product_id}"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("product", {"productId": product_id}, lambda: self._authenticated_get(url).json())
+
+    def get_products_by_ids(self, product_ids, max_workers=None):
+        """
+        Gets detailed information about many products given their IDs, requesting them concurrently.
+
+        Args:
+            product_ids: An iterable of Product IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses and errors keyed by product ID, in input order.
+        """
+        return self._bulk_request(self.get_product, product_ids, max_workers=max_workers)
 
     def get_product_data(self):
         """
@@ -255,8 +470,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing product reference data.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productdata"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("productdata", {}, lambda: self._authenticated_get(url).json())
 
     def get_product_families(self, market_ids):
         """
@@ -268,7 +482,8 @@ class TTPdsClient(TTRestClient):
         Returns:
             dict: JSON response containing a list of product families.
         """
-        # Note: To avoid errors when requesting product data, TT strongly recommends listing a maximum of 10
+        # Note: To avoid errors when requesting product data, TT strongly recommends listing a maximum of 10, see
+        # get_all_product_families() for any number of markets
         if isinstance(market_ids, (list, tuple, set)):
             query = {
                 "marketId": market_ids[0] if len(market_ids) == 1 else ",".join([str(market_id) for market_id in market_ids])
@@ -279,8 +494,70 @@ class TTPdsClient(TTRestClient):
             }
 
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productfamilies"
-        response = self._authenticated_get(url, query=query)
-        return response.json()
+        return self._cached("productfamilies", query, lambda: self._authenticated_get(url, query=query).json())
+
+    def _market_chunks(self, market_ids, chunk_size):
+        if not 1 <= chunk_size <= self.MAX_MARKETS_PER_REQUEST:
+            raise UsageError(f"chunk_size must be between 1 and {self.MAX_MARKETS_PER_REQUEST}, got {chunk_size}")
+
+        market_ids = list(dict.fromkeys(market_ids))
+        return [tuple(market_ids[i:i + chunk_size]) for i in range(0, len(market_ids), chunk_size)]
+
+    @staticmethod
+    def _merge_product_family_chunks(result):
+        if not result.ok:
+            log.error(f"Product families request failed for {len(result.errors)} of {len(result)} market chunks")
+            raise next(iter(result.errors.values()))
+
+        # the families of each chunk are concatenated without duplicates, other fields are taken from the first chunk
+        merged = {"productFamilies": []}
+        seen = set()
+        for response in result.results.values():
+            for key, value in response.items():
+                if key != "productFamilies":
+                    merged.setdefault(key, value)
+            for family in response.get("productFamilies", []):
+                if family.get("id") not in seen:
+                    seen.add(family.get("id"))
+                    merged["productFamilies"].append(family)
+        return merged
+
+    @staticmethod
+    def _add_product_family_details(merged, result):
+        if not result.ok:
+            log.error(f"Product family details request failed for {len(result.errors)} of {len(result)} families")
+            raise next(iter(result.errors.values()))
+
+        merged["productFamilies"] = [
+            dict(family, details=result.results[family.get("id")]) for family in merged["productFamilies"]
+        ]
+        return merged
+
+    def get_all_product_families(self, market_ids, chunk_size=MAX_MARKETS_PER_REQUEST, details=False, max_workers=None):
+        """
+        Gets the product families of any number of markets, splitting the market IDs into chunks of at most 10 (as TT
+        strongly recommends) requested concurrently. The families of every chunk are merged without duplicates.
+
+        Args:
+            market_ids: An iterable of Market IDs. Duplicate IDs are only requested once.
+            chunk_size: The number of markets per request, at most 10. Default is 10.
+            details: Also get the details of every family with get_product_family_by_id(), concurrently, added to each
+                     family record as "details". Default is False.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            dict: JSON response containing the product families of every market.
+
+        Raises:
+            UsageError: If chunk_size is not between 1 and 10.
+            PostRequestError: If the request for any chunk or family details fails.
+        """
+        result = self._bulk_request(self.get_product_families, self._market_chunks(market_ids, chunk_size), max_workers=max_workers)
+        merged = self._merge_product_family_chunks(result)
+        if details:
+            family_ids = [family.get("id") for family in merged["productFamilies"]]
+            self._add_product_family_details(merged, self.get_product_families_by_ids(family_ids, max_workers=max_workers))
+        return merged
 
     def get_product_family(self, product_family_id):
         """
@@ -296,8 +573,7 @@ class TTPdsClient(TTRestClient):
             "productFamilyId": product_family_id
         }
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productfamily"
-        response = self._authenticated_get(url, query=query)
-        return response.json()
+        return self._cached("productfamily", query, lambda: self._authenticated_get(url, query=query).json())
 
     def get_product_family_by_id(self, product_family_id):
         """
@@ -310,8 +586,20 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing product family details.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/productfamily/{product_family_id}"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("productfamilydetails", {"productFamilyId": product_family_id}, lambda: self._authenticated_get(url).json())
+
+    def get_product_families_by_ids(self, product_family_ids, max_workers=None):
+        """
+        Gets details about many product families given their IDs, requesting them concurrently.
+
+        Args:
+            product_family_ids: An iterable of Product Family IDs. Duplicate IDs are only requested once.
+            max_workers: Optional, the maximum number of concurrent requests. Defaults to the transport pool size.
+
+        Returns:
+            BulkResult: JSON responses and errors keyed by product family ID, in input order.
+        """
+        return self._bulk_request(self.get_product_family_by_id, product_family_ids, max_workers=max_workers)
 
     def get_products(self, market_id, next_page_key=None):
         """
@@ -347,9 +635,26 @@ class TTPdsClient(TTRestClient):
         Returns:
             dict: JSON response containing a list of products.
         """
-        return self._generic_paginated_request(
+        return self._cached(
+            "products",
+            {"marketId": market_id},
+            lambda: self._generic_paginated_request(self.get_products, results_key="products", market_id=market_id)
+        )
+
+    def iter_products(self, market_id):
+        """
+        Iterates over the products for a given market, requesting each page only once the previous one has been
+        consumed.
+
+        Args:
+            market_id: A Market ID.
+
+        Returns:
+            generator: Product records.
+        """
+        return self._iter_records(
             self.get_products,
-            results_key="products",
+            "products",
             market_id=market_id
         )
 
@@ -361,8 +666,7 @@ class TTPdsClient(TTRestClient):
             dict: JSON response containing a list of security exchanges.
         """
         url = f"{self.TT_BASE_URL}/{self.endpoint}/{self.auth_handler.environment.value}/securityexchanges"
-        response = self._authenticated_get(url)
-        return response.json()
+        return self._cached("securityexchanges", {}, lambda: self._authenticated_get(url).json())
 
     def get_synthetic_instruments(self, next_page_key=None):
         """
@@ -389,8 +693,111 @@ class TTPdsClient(TTRestClient):
         Returns:
             dict: JSON response containing a list of synthetic instruments.
         """
-        return self._generic_paginated_request(
+        return self._cached(
+            "syntheticinstruments",
+            {},
+            lambda: self._generic_paginated_request(self.get_synthetic_instruments, results_key="syntheticInstruments")
+        )
+
+    def iter_synthetic_instruments(self):
+        """
+        Iterates over synthetic instruments, requesting each page only once the previous one has been consumed.
+
+        Returns:
+            generator: Synthetic instrument records.
+        """
+        return self._iter_records(
             self.get_synthetic_instruments,
-            results_key="syntheticInstruments"
+            "syntheticInstruments"
         )
 
+
+class AsyncTTPdsClient(AsyncTTRestClient, TTPdsClient):
+    """
+    An asyncio Rest API Client implementing the TT PDS endpoints. Methods mirror TTPdsClient and return awaitables.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport to share with other clients. Default is None.
+        cache (TTReferenceCache, optional): A cache for reference data, see TTPdsClient. Default is None.
+    """
+
+    def __init__(self, auth_handler: TTAuthenticator, transport=None, cache: TTReferenceCache = None):
+        super().__init__(auth_handler, transport)
+        self.cache = cache
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    async def _cached(self, name, params, request):
+        if self.cache is None:
+            return await request()
+
+        # the cache's SQLite I/O runs in a thread, off the event loop
+        environment = self.auth_handler.environment
+        key = self.cache.key(environment, name, params)
+        try:
+            async with self._join_flight(key, asyncio.Lock):
+                response = await asyncio.to_thread(self.cache.get, environment, name, params)
+                if response is None:
+                    response = await request()
+                    await asyncio.to_thread(self.cache.put, environment, name, params, response)
+        finally:
+            self._leave_flight(key)
+        return response
+
+    async def get_all_product_families(self, market_ids, chunk_size=TTPdsClient.MAX_MARKETS_PER_REQUEST, details=False, max_workers=None):
+        result = await self._bulk_request(self.get_product_families, self._market_chunks(market_ids, chunk_size), max_workers=max_workers)
+        merged = self._merge_product_family_chunks(result)
+        if details:
+            family_ids = [family.get("id") for family in merged["productFamilies"]]
+            self._add_product_family_details(merged, await self.get_product_families_by_ids(family_ids, max_workers=max_workers))
+        return merged
+
+    async def crawl(self, sink, market_ids=None, product_type_ids=None, max_workers=None, progress=None):
+        """
+        Mirrors TTPdsClient.crawl(). The sink and progress callback may be plain functions or coroutine functions.
+        """
+        async def call(callback, *args):
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                await result
+
+        report = CrawlReport()
+        markets = self._crawl_markets(await self.get_markets(), market_ids, report)
+        await call(sink, "markets", None, markets)
+
+        semaphore = asyncio.Semaphore(max_workers or self.DEFAULT_MAX_CONCURRENCY)
+        pending = {}
+
+        async def bounded_request(request_func, node_id):
+            async with semaphore:
+                return await request_func(node_id)
+
+        def submit(level, node_id, request_func):
+            pending[asyncio.ensure_future(bounded_request(request_func, node_id))] = (level, node_id)
+            report.requested += 1
+
+        try:
+            for market in markets:
+                submit("market", market.get("id"), self.get_all_products)
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    level, node_id = pending.pop(task)
+                    error = task.exception()
+                    delivery = self._crawl_node(report, level, node_id, None if error else task.result(), error, product_type_ids)
+                    if delivery is not None:
+                        kind, records = delivery
+                        await call(sink, kind, node_id, records)
+                        if level == "market":
+                            for product in records:
+                                submit("product", product.get("id"), self._get_all_instruments_of_product)
+                    if progress is not None:
+                        await call(progress, report)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        log.debug(f"Crawl finished: {report}")
+        return report
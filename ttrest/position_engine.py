@@ -0,0 +1,252 @@
+import logging
+from array import array
+from .analytics import FillAggregator
+from .exceptions import UsageError
+from .fill_store import fill_key
+from .monitor import ScaleQty
+
+log = logging.getLogger()
+
+
+class TTPositionEngine:
+    """
+    A local book of net positions, seeded from start-of-day (SOD) records and updated with fills.
+
+    Each update() requests the fills from the latest timestamp seen, skipping those already applied, and reconcile()
+    reports any drift from the TT position service.
+
+    Args:
+        min_timestamp (int/datetime, optional): Where the first fills update starts, normally the start of the
+                                                trading session the SODs belong to. Default is None (every fill).
+        account_ids (list, optional): The accounts in the book, fills of other accounts are ignored. Default is None
+                                      (every account).
+
+    Example:
+        engine = TTPositionEngine(min_timestamp=session_start, account_ids=account_ids)
+        engine.load_sod(monitor_client, sod_cache)
+        engine.update(ledger_client)
+        print(engine.position(account_id, instrument_id), engine.reconcile(monitor_client))
+    """
+
+    KEY_FIELDS = ("accountId", "instrumentId")
+    SOD_QUANTITY_FIELD = "netPosition"
+    POSITION_QUANTITY_FIELD = "netPosition"
+
+    def __init__(self, min_timestamp=None, account_ids: list = None):
+        self.min_timestamp = min_timestamp
+        self.account_ids = set(account_ids) if account_ids is not None else None
+        self._index = {}
+        self._sod = array("d")
+        self._bought = array("d")
+        self._sold = array("d")
+        self._applied = {}
+        self._fill_count = 0
+        self._watermark = None
+
+    def _slot(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            slot = self._index[key] = len(self._sod)
+            for column in (self._sod, self._bought, self._sold):
+                column.append(0.0)
+        return slot
+
+    def _key(self, record):
+        return tuple(record.get(field) for field in self.KEY_FIELDS)
+
+    def seed_sod(self, sod_records):
+        """
+        Set the SOD quantity of each position in the records, summing records of the same position.
+
+        Args:
+            sod_records (list): SOD records, e.g. the "sod" of TTMonitorClient.get_all_sod().
+        """
+        quantities = {}
+        for record in sod_records:
+            key = self._key(record)
+            quantities[key] = quantities.get(key, 0.0) + float(record.get(self.SOD_QUANTITY_FIELD) or 0)
+        for key, quantity in quantities.items():
+            self._sod[self._slot(key)] = quantity
+
+    def apply_fills(self, fills):
+        """
+        Add fills to the book, skipping fills that have already been applied. Every fill moves the watermark, including
+        fills of other accounts, so update() doesn't request them again.
+
+        Args:
+            fills (list): Fill records.
+
+        Returns:
+            int: The number of fills applied.
+        """
+        applied = 0
+        for fill in fills:
+            timestamp = int(fill["timeStamp"])
+            self._watermark = timestamp if self._watermark is None else max(self._watermark, timestamp)
+
+            if self.account_ids is not None and fill.get("accountId") not in self.account_ids:
+                continue
+            key = fill_key(fill)
+            if key in self._applied:
+                continue
+
+            side = fill.get(FillAggregator.SIDE_FIELD)
+            if side in FillAggregator.BUY_SIDES:
+                column = self._bought
+            elif side in FillAggregator.SELL_SIDES:
+                column = self._sold
+            else:
+                continue
+
+            self._applied[key] = timestamp
+            column[self._slot(self._key(fill))] += float(fill[FillAggregator.QUANTITY_FIELD])
+            applied += 1
+
+        # only fills at the watermark can be requested again, forget the older ones
+        self._applied = {key: timestamp for key, timestamp in self._applied.items() if timestamp >= self._watermark}
+        self._fill_count += applied
+        return applied
+
+    def position(self, account_id, instrument_id):
+        """
+        Get a net position.
+
+        Args:
+            account_id: The account ID.
+            instrument_id: The instrument ID.
+
+        Returns:
+            float: SOD plus bought less sold, 0 if the book has no such position.
+        """
+        slot = self._index.get((account_id, instrument_id))
+        if slot is None:
+            return 0.0
+        return self._sod[slot] + self._bought[slot] - self._sold[slot]
+
+    def positions(self):
+        """
+        Get every net position in the book.
+
+        Returns:
+            dict: Net positions keyed by (accountId, instrumentId).
+        """
+        return {key: self._sod[slot] + self._bought[slot] - self._sold[slot] for key, slot in self._index.items()}
+
+    def compare(self, position_records, tolerance: float = 0.0):
+        """
+        Compare the book with position records from the TT position service.
+
+        Args:
+            position_records (list): Position records, e.g. the "positions" of TTMonitorClient.get_all_position().
+            tolerance (float, optional): The largest difference not reported as drift. Default is 0.
+
+        Returns:
+            dict: {"local", "remote", "drift"} keyed by (accountId, instrumentId) for each position that differs,
+                  including positions missing on either side.
+        """
+        remote = {}
+        for record in position_records:
+            if self.account_ids is None or record.get("accountId") in self.account_ids:
+                remote[self._key(record)] = float(record.get(self.POSITION_QUANTITY_FIELD) or 0)
+        local = self.positions()
+
+        drift = {}
+        for key in local.keys() | remote.keys():
+            local_quantity, remote_quantity = local.get(key, 0.0), remote.get(key, 0.0)
+            if abs(local_quantity - remote_quantity) > tolerance:
+                drift[key] = {"local": local_quantity, "remote": remote_quantity, "drift": local_quantity - remote_quantity}
+
+        if drift:
+            log.warning(f"Position book drifted from the position service for {len(drift)} positions")
+        return drift
+
+    def _fills_from(self):
+        # restart at the watermark rather than after it, fills arriving later with that timestamp are not missed and
+        # the repeated ones are skipped by apply_fills
+        return self._watermark if self._watermark is not None else self.min_timestamp
+
+    def _require_account_ids(self):
+        if self.account_ids is None:
+            raise UsageError("Loading SODs requires the engine's account_ids")
+        return list(self.account_ids)
+
+    def _seed_sod_result(self, result):
+        for sod in result.results.values():
+            self.seed_sod(sod.get("sod", []))
+        return result
+
+    def load_sod(self, monitor_client, cache=None, max_workers: int = None):
+        """
+        Seed the book with the SODs of the engine's accounts, requested concurrently.
+
+        Args:
+            monitor_client (TTMonitorClient): The client to request SODs with.
+            cache (TTSodCache, optional): A cache so SODs are requested once per trading date. Default is None.
+            max_workers (int, optional): The maximum number of concurrent requests.
+
+        Returns:
+            BulkResult: The SOD responses and errors keyed by account ID.
+        """
+        result = monitor_client.get_all_sod_by_account_ids(self._require_account_ids(), max_workers=max_workers, cache=cache)
+        return self._seed_sod_result(result)
+
+    def update(self, ledger_client):
+        """
+        Apply the fills since the last update.
+
+        Args:
+            ledger_client (TTLedgerClient): The client to request fills with.
+
+        Returns:
+            int: The number of fills applied.
+        """
+        applied = 0
+        for page in ledger_client.iter_fill_pages(min_timestamp=self._fills_from()):
+            applied += self.apply_fills(page["fills"])
+        log.debug(f"Position book updated with {applied} fills, watermark {self._watermark}")
+        return applied
+
+    def reconcile(self, monitor_client, tolerance: float = 0.0, scale_qty: ScaleQty = ScaleQty.DEFAULT):
+        """
+        Request positions from the TT position service and compare them with the book. See compare().
+
+        Args:
+            monitor_client (TTMonitorClient): The client to request positions with.
+            tolerance (float, optional): The largest difference not reported as drift. Default is 0.
+            scale_qty (ScaleQty, optional): Should match how the SODs and fills count quantities.
+
+        Returns:
+            dict: The drift keyed by (accountId, instrumentId).
+        """
+        account_ids = list(self.account_ids) if self.account_ids is not None else None
+        response = monitor_client.get_all_position(account_ids=account_ids, scale_qty=scale_qty)
+        return self.compare(response.get("positions", []), tolerance)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(positions={len(self)}, fills={self._fill_count}, watermark={self._watermark})"
+
+
+class AsyncTTPositionEngine(TTPositionEngine):
+    """
+    A local position book driven by the async clients. Methods mirror TTPositionEngine, and load_sod, update and
+    reconcile return awaitables.
+    """
+
+    async def load_sod(self, monitor_client, cache=None, max_workers: int = None):
+        result = await monitor_client.get_all_sod_by_account_ids(self._require_account_ids(), max_workers=max_workers, cache=cache)
+        return self._seed_sod_result(result)
+
+    async def update(self, ledger_client):
+        applied = 0
+        async for page in ledger_client.iter_fill_pages(min_timestamp=self._fills_from()):
+            applied += self.apply_fills(page["fills"])
+        log.debug(f"Position book updated with {applied} fills, watermark {self._watermark}")
+        return applied
+
+    async def reconcile(self, monitor_client, tolerance: float = 0.0, scale_qty: ScaleQty = ScaleQty.DEFAULT):
+        account_ids = list(self.account_ids) if self.account_ids is not None else None
+        response = await monitor_client.get_all_position(account_ids=account_ids, scale_qty=scale_qty)
+        return self.compare(response.get("positions", []), tolerance)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import threading
+from .monitor import ScaleQty
+
+log = logging.getLogger()
+
+POSITION_KEY_FIELDS = ("accountId", "instrumentId")
+
+
+class PositionDelta:
+    """
+    The difference between two position snapshots.
+
+    Attributes:
+        added (dict): Position records that are new, keyed by (accountId, instrumentId).
+        changed (dict): (record, changes) keyed by (accountId, instrumentId) for positions that moved, where changes
+                        maps each changed field to its (old, new) values.
+        removed (dict): Position records that are no longer in the snapshot, keyed by (accountId, instrumentId).
+    """
+
+    def __init__(self, added=None, changed=None, removed=None):
+        self.added = added if added is not None else {}
+        self.changed = changed if changed is not None else {}
+        self.removed = removed if removed is not None else {}
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(added={len(self.added)}, changed={len(self.changed)}, removed={len(self.removed)})"
+
+
+def index_positions(positions, key_fields=POSITION_KEY_FIELDS):
+    """
+    Index position records by key.
+
+    Args:
+        positions (list): Position records, e.g. the "positions" of get_all_position().
+        key_fields (tuple, optional): The fields identifying a position. Default is ("accountId", "instrumentId").
+
+    Returns:
+        dict: The records keyed by a tuple of the key field values.
+    """
+    return {tuple(position.get(field) for field in key_fields): position for position in positions}
+
+
+def diff_positions(previous, current, ignore_fields=()):
+    """
+    Compare two indexed position snapshots.
+
+    Args:
+        previous (dict): The earlier snapshot, from index_positions().
+        current (dict): The later snapshot, from index_positions().
+        ignore_fields (iterable, optional): Fields whose changes alone don't make a position changed. Default is ().
+
+    Returns:
+        PositionDelta: The added, changed and removed positions.
+    """
+    ignore_fields = set(ignore_fields)
+    delta = PositionDelta()
+
+    for key, position in current.items():
+        old = previous.get(key)
+        if old is None:
+            delta.added[key] = position
+        elif old != position:
+            changes = {
+                field: (old.get(field), position.get(field))
+                for field in old.keys() | position.keys()
+                if field not in ignore_fields and old.get(field) != position.get(field)
+            }
+            if changes:
+                delta.changed[key] = (position, changes)
+
+    for key, position in previous.items():
+        if key not in current:
+            delta.removed[key] = position
+    return delta
+
+
+class TTPositionWatcher:
+    """
+    Polls positions and notifies subscribers of only what changed since the previous poll.
+
+    The previous snapshot is kept indexed by (accountId, instrumentId), each poll is diffed against it and subscribers
+    are called with the PositionDelta when it isn't empty. The first poll reports every position as added.
+
+    Args:
+        monitor_client (TTMonitorClient): The client to request positions with.
+        account_ids (list, optional): The accounts to watch. Default is None (every account of the application key).
+        scale_qty (ScaleQty, optional): Receive position quantities in flow or as a number of contracts.
+        chunk_size (int, optional): Request the accounts in concurrent chunks of this size, see
+                                    TTMonitorClient.get_all_position_chunked(). Default is None (a single request).
+        interval (float, optional): Seconds between polls when running. Default is 5.
+        ignore_fields (iterable, optional): Fields whose changes alone are not reported, e.g. update times. Default is
+                                            ().
+
+    Example:
+        watcher = TTPositionWatcher(monitor_client, account_ids=account_ids)
+        watcher.subscribe(lambda delta: publish(delta.changed))
+        watcher.run(stop_event)
+    """
+
+    def __init__(self, monitor_client, account_ids: list = None, scale_qty: ScaleQty = ScaleQty.DEFAULT, chunk_size: int = None, interval: float = 5.0, ignore_fields=()):
+        self.monitor_client = monitor_client
+        self.account_ids = account_ids
+        self.scale_qty = scale_qty
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.ignore_fields = tuple(ignore_fields)
+        self.snapshot = {}
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Register a callback for deltas.
+
+        Args:
+            callback: Called with each non-empty PositionDelta.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Remove a registered callback.
+
+        Args:
+            callback: The callback passed to subscribe().
+        """
+        self._subscribers.remove(callback)
+
+    def _request_positions(self):
+        if self.chunk_size is not None:
+            return self.monitor_client.get_all_position_chunked(self.account_ids, self.chunk_size, scale_qty=self.scale_qty)
+        return self.monitor_client.get_all_position(account_ids=self.account_ids, scale_qty=self.scale_qty)
+
+    def _update(self, response):
+        current = index_positions(response.get("positions", []))
+        delta = diff_positions(self.snapshot, current, self.ignore_fields)
+        self.snapshot = current
+        log.debug(f"Polled {len(current)} positions: {delta}")
+        return delta
+
+    def poll(self):
+        """
+        Request positions once and notify subscribers of the changes. A subscriber that raises is logged and the
+        others are still notified.
+
+        Returns:
+            PositionDelta: The changes since the previous poll.
+        """
+        delta = self._update(self._request_positions())
+        if delta:
+            for callback in list(self._subscribers):
+                try:
+                    callback(delta)
+                except Exception:
+                    log.exception(f"Position subscriber {callback!r} failed")
+        return delta
+
+    def run(self, stop: threading.Event = None):
+        """
+        Poll every interval seconds until stop is set. A failed poll is logged and the previous snapshot is kept, so the
+        next poll reports every change since the last one that succeeded.
+
+        Args:
+            stop (threading.Event, optional): Ends the watch when set, e.g. from another thread. Default is None (run
+                                              until interrupted).
+        """
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                log.error(f"Position poll failed, retrying in {self.interval} seconds: {e}")
+            stop.wait(self.interval)
+
+
+class AsyncTTPositionWatcher(TTPositionWatcher):
+    """
+    An asyncio position watcher, for use with AsyncTTMonitorClient. Methods mirror TTPositionWatcher and return
+    awaitables. Subscribers may be plain functions or coroutine functions.
+    """
+
+    async def poll(self):
+        delta = self._update(await self._request_positions())
+        if delta:
+            for callback in list(self._subscribers):
+                try:
+                    result = callback(delta)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    log.exception(f"Position subscriber {callback!r} failed")
+        return delta
+
+    async def run(self, stop: asyncio.Event = None):
+        stop = stop if stop is not None else asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.poll()
+            except Exception as e:
+                log.error(f"Position poll failed, retrying in {self.interval} seconds: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import queue
+import threading
+
+log = logging.getLogger()
+
+_END = object()
+
+
+def prefetch_iterator(iterable, depth: int = 1):
+    """
+    Iterate over an iterable on a background thread, reading up to `depth` items ahead of the consumer.
+
+    Used to request the next page of a paginated pull while the caller is still processing the current one. The
+    buffer is bounded, so a slow consumer holds at most `depth` pages in memory, and an exception raised while
+    fetching is re-raised to the consumer in order. Closing the returned generator stops the background thread
+    after its current request.
+
+    Args:
+        iterable: The iterable to read ahead, e.g. a page iterator.
+        depth (int, optional): The maximum number of items buffered ahead of the consumer. Default is 1.
+
+    Returns:
+        generator: The items of the iterable, in order.
+
+    Raises:
+        ValueError: If depth is less than 1, when called rather than on the first item.
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    return _prefetch(iterable, depth)
+
+
+def _prefetch(iterable, depth):
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        # give up if the consumer has gone away, otherwise the worker could block forever on a full buffer
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except Exception as e:
+            put((_END, e))
+
+    thread = threading.Thread(target=worker, name="ttrest-prefetch", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def async_prefetch_iterator(aiterable, depth: int = 1):
+    """
+    Iterate over an async iterable in a background task, reading up to `depth` items ahead of the consumer.
+
+    The asyncio counterpart of prefetch_iterator.
+
+    Args:
+        aiterable: The async iterable to read ahead, e.g. a page iterator.
+        depth (int, optional): The maximum number of items buffered ahead of the consumer. Default is 1.
+
+    Returns:
+        async generator: The items of the async iterable, in order.
+
+    Raises:
+        ValueError: If depth is less than 1, when called rather than on the first item.
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    return _async_prefetch(aiterable, depth)
+
+
+async def _async_prefetch(aiterable, depth):
+    buffer = asyncio.Queue(maxsize=depth)
+
+    async def worker():
+        try:
+            async for item in aiterable:
+                await buffer.put((item, None))
+            await buffer.put((_END, None))
+        except Exception as e:
+            await buffer.put((_END, e))
+
+    task = asyncio.ensure_future(worker())
+
+    try:
+        while True:
+            item, error = await buffer.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import threading
+import time
+
+log = logging.getLogger()
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket allowing bursts of up to `capacity` requests and a sustained `rate` per second.
+
+    Requests reserve a token up front and then wait for their slot, so waiters are served in order and the same
+    bucket can pace threads (acquire) and asyncio tasks (acquire_async) at the same time.
+
+    Args:
+        rate (float): The sustained number of requests per second.
+        capacity (float, optional): The maximum burst size. Defaults to one second of requests (at least 1).
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+
+        self._rate = float(rate)
+        self._capacity = float(capacity) if capacity is not None else max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._requests = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def rate(self):
+        """
+        Get the sustained number of requests per second.
+
+        Returns:
+            float: The rate.
+        """
+        return self._rate
+
+    @property
+    def capacity(self):
+        """
+        Get the maximum burst size.
+
+        Returns:
+            float: The capacity.
+        """
+        return self._capacity
+
+    def _refill(self, now):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1):
+        """
+        Reserve tokens, returning how long the caller must wait before using them.
+
+        Args:
+            tokens (float, optional): The number of tokens to reserve. Default is 1.
+
+        Returns:
+            float: The wait time in seconds, 0 if tokens were available.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self._rate)
+
+            self._requests += 1
+            if wait > 0:
+                self._waits += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+        return wait
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block the calling thread until tokens are available.
+
+        Args:
+            tokens (float, optional): The number of tokens to acquire. Default is 1.
+
+        Returns:
+            float: The time waited in seconds.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1):
+        """
+        Suspend the calling task until tokens are available, without blocking the event loop.
+
+        Args:
+            tokens (float, optional): The number of tokens to acquire. Default is 1.
+
+        Returns:
+            float: The time waited in seconds.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    @property
+    def available(self):
+        """
+        Get the current request budget. Negative values mean requests are queued waiting for tokens.
+
+        Returns:
+            float: The number of tokens available now.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def stats(self):
+        """
+        Get the current budget and wait-time statistics.
+
+        Returns:
+            dict: The rate, capacity, available tokens, request count, waited request count, total and max wait.
+        """
+        available = self.available
+        with self._lock:
+            return {
+                "rate": self._rate,
+                "capacity": self._capacity,
+                "available": available,
+                "requests": self._requests,
+                "waits": self._waits,
+                "totalWait": self._total_wait,
+                "maxWait": self._max_wait,
+            }
+
+
+class TTRateLimiter:
+    """
+    A client-side rate limiter for TT REST API requests, with a token bucket per service endpoint.
+
+    Pass one limiter to a TTAuthenticator and every client built from that authenticator, in any thread or event loop,
+    draws from the same buckets. Endpoints without a configured rate use the default rate, if any.
+
+    Args:
+        default_rate (float, optional): Requests per second for endpoints without their own rate. Default is None
+                                        (endpoints without their own rate are not limited).
+        default_capacity (float, optional): Burst size for endpoints without their own rate. Default is None (one
+                                            second of requests).
+        endpoint_rates (dict, optional): Rates keyed by service endpoint (e.g. "ttledger", "ttpds", "ttmonitor"). Each
+                                         value is either a rate or a (rate, capacity) tuple. Default is None.
+
+    Example:
+        rate_limiter = TTRateLimiter(default_rate=10, endpoint_rates={"ttledger": (5, 10)})
+        auth_handler = TTAuthenticator(environment, api_key, api_secret, app_name, company_name, rate_limiter=rate_limiter)
+    """
+
+    def __init__(self, default_rate: float = None, default_capacity: float = None, endpoint_rates: dict = None):
+        self._default_rate = default_rate
+        self._default_capacity = default_capacity
+        self._endpoint_rates = dict(endpoint_rates or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint):
+        """
+        Get the token bucket for a service endpoint, creating it on first use.
+
+        Args:
+            endpoint (str): The service endpoint, e.g. "ttledger".
+
+        Returns:
+            TokenBucket: The bucket, or None if the endpoint is not limited.
+        """
+        with self._lock:
+            if endpoint not in self._buckets:
+                setting = self._endpoint_rates.get(endpoint, (self._default_rate, self._default_capacity))
+                rate, capacity = setting if isinstance(setting, tuple) else (setting, None)
+                self._buckets[endpoint] = TokenBucket(rate, capacity) if rate else None
+            return self._buckets[endpoint]
+
+    def acquire(self, endpoint):
+        """
+        Block the calling thread until a request to the endpoint is allowed.
+
+        Args:
+            endpoint (str): The service endpoint, e.g. "ttledger".
+
+        Returns:
+            float: The time waited in seconds.
+        """
+        bucket = self.bucket(endpoint)
+        if bucket is None:
+            return 0.0
+
+        wait = bucket.acquire()
+        if wait > 0:
+            log.debug(f"Rate limited request to {endpoint}, waited {wait:.3f}s")
+        return wait
+
+    async def acquire_async(self, endpoint):
+        """
+        Suspend the calling task until a request to the endpoint is allowed.
+
+        Args:
+            endpoint (str): The service endpoint, e.g. "ttledger".
+
+        Returns:
+            float: The time waited in seconds.
+        """
+        bucket = self.bucket(endpoint)
+        if bucket is None:
+            return 0.0
+
+        wait = await bucket.acquire_async()
+        if wait > 0:
+            log.debug(f"Rate limited request to {endpoint}, waited {wait:.3f}s")
+        return wait
+
+    def stats(self):
+        """
+        Get the current budget and wait-time statistics of every limited endpoint used so far.
+
+        Returns:
+            dict: TokenBucket.stats() keyed by endpoint.
+        """
+        with self._lock:
+            buckets = {endpoint: bucket for endpoint, bucket in self._buckets.items() if bucket is not None}
+        return {endpoint: bucket.stats() for endpoint, bucket in buckets.items()}
@@ -0,0 +1,181 @@
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from .sqlite_store import SQLiteStore
+
+log = logging.getLogger()
+
+
+class TTReferenceCache(SQLiteStore):
+    """
+    A cache of PDS reference data (markets, products, instruments, product families, MICs, ...) for TTPdsClient.
+
+    Responses are keyed by environment, PDS endpoint and request arguments and expire after a per-endpoint TTL. The
+    most recently used responses are kept in memory, bounded by max_entries. Given a path, every response is also kept
+    zlib-compressed in a SQLite database, so a restarted process reads its reference data from disk instead of pulling
+    it again from TT. Responses are kept serialised, each get() returns a new copy that the caller may modify.
+
+    Args:
+        path (str, optional): A SQLite database file. Default is None (memory only).
+        ttls (dict, optional): TTLs in seconds keyed by PDS endpoint, e.g. {"instruments": 3600}, overriding
+                               DEFAULT_TTLS. Default is None.
+        default_ttl (float, optional): The TTL in seconds of endpoints without one. Default is 86400 (a day).
+        max_entries (int, optional): The most responses kept in memory. Default is 4096.
+
+    Example:
+        reference_cache = TTReferenceCache("reference.sqlite", ttls={"instruments": 3600})
+        pds_client = TTPdsClient(auth_handler, cache=reference_cache)
+        markets = pds_client.get_markets()  # requested once a day, across restarts
+    """
+
+    DEFAULT_TTLS = {
+        "instrument": 6 * 3600,
+        "instruments": 6 * 3600,
+        "syntheticinstruments": 3600,
+    }
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS reference "
+        "(environment TEXT NOT NULL, name TEXT NOT NULL, params TEXT NOT NULL, body BLOB NOT NULL, "
+        "fetched REAL NOT NULL, PRIMARY KEY (environment, name, params))",
+    )
+
+    def __init__(self, path: str = None, ttls: dict = None, default_ttl: float = 86400, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+
+        super().__init__(path)
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+    def ttl(self, name):
+        """
+        Get the TTL of a PDS endpoint.
+
+        Args:
+            name (str): The PDS endpoint, e.g. "markets".
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        return self.ttls.get(name, self.default_ttl)
+
+    @staticmethod
+    def key(environment, name, params=None):
+        """
+        Get the key a response is cached under.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            name (str): The PDS endpoint, e.g. "markets".
+            params (dict, optional): The request arguments. Default is None.
+
+        Returns:
+            tuple: The environment, endpoint and serialised arguments.
+        """
+        return environment.value, name, json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, environment, name, params=None):
+        """
+        Get a cached response.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            name (str): The PDS endpoint, e.g. "markets".
+            params (dict, optional): The request arguments. Default is None.
+
+        Returns:
+            dict: A copy of the JSON response, or None if it isn't cached or has expired.
+        """
+        key = self.key(environment, name, params)
+        expired_before = time.time() - self.ttl(name)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT body, fetched FROM reference WHERE environment = ? AND name = ? AND params = ?", key
+                ).fetchone()
+                if row is not None:
+                    entry = (zlib.decompress(row[0]).decode(), row[1])
+                    self._remember(key, entry)
+
+            if entry is not None and entry[1] < expired_before:
+                self._discard(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._memory.move_to_end(key)
+            self.hits += 1
+        return json.loads(entry[0])
+
+    def put(self, environment, name, params, response):
+        """
+        Cache a response.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            name (str): The PDS endpoint, e.g. "markets".
+            params (dict): The request arguments.
+            response (dict): The JSON response.
+        """
+        key = self.key(environment, name, params)
+        fetched = time.time()
+        body = json.dumps(response)
+
+        with self._lock:
+            self._remember(key, (body, fetched))
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO reference (environment, name, params, body, fetched) VALUES (?, ?, ?, ?, ?)",
+                        key + (zlib.compress(body.encode()), fetched)
+                    )
+
+    def invalidate(self, environment=None, name=None):
+        """
+        Discard cached responses so they are requested again.
+
+        Args:
+            environment (TTEnvironments, optional): Only discard responses of this environment. Default is None (all).
+            name (str, optional): Only discard responses of this PDS endpoint, e.g. "instruments". Default is None (all).
+        """
+        environment_value = None if environment is None else environment.value
+
+        with self._lock:
+            for key in list(self._memory):
+                if environment_value in (None, key[0]) and name in (None, key[1]):
+                    del self._memory[key]
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM reference WHERE (? IS NULL OR environment = ?) AND (? IS NULL OR name = ?)",
+                        (environment_value, environment_value, name, name)
+                    )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory)
+
+    def _remember(self, key, entry):
+        # add to the in-memory LRU, evicting the least recently used, called with the lock held
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _discard(self, key):
+        # drop an expired response, called with the lock held
+        self._memory.pop(key, None)
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute("DELETE FROM reference WHERE environment = ? AND name = ? AND params = ?", key)
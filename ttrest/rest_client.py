@@ -1,7 +1,13 @@
 import requests
 import logging
+import time
 from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .bulk import BulkResult
+from .checkpoint import Checkpoint
+from .prefetch import prefetch_iterator
 from .exceptions import PostRequestError
+from .transport import TTTransport
 from abc import ABC
 
 log = logging.getLogger()
@@ -15,15 +21,46 @@ class TTRestClient(ABC):
         app_name (str): The name of the application.
         company_name (str): The name of the company.
         auth_handler (TTAuthentication): An instance of TTAuthentication for handling authentication.
+        transport (TTTransport, optional): A pooled HTTP transport, which can be shared between clients. If not given
+                                           the client creates and owns its own transport. Default is None.
 
     Attributes:
+        endpoint (str): The TT service endpoint implemented by the client, e.g. "ttledger".
         TT_BASE_URL (str): Base URL for the Trading Technologies API.
     """
 
+    endpoint = None
     TT_BASE_URL = "https://ttrestapi.trade.tt"  # "https://apigateway.trade.tt" is to be deprecated in october 2024, see https://library.tradingtechnologies.com/release_notes/production-2023-10.html
 
-    def __init__(self, auth_handler):
+    def __init__(self, auth_handler, transport: TTTransport = None):
         self.auth_handler = auth_handler
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else TTTransport()
+
+    def close(self):
+        """
+        Close the client's connections. A transport passed in by the caller is left open for its owner to close.
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _add_request_id(self, query):
+        # all TT requests require "[app name]-[company name]--[GUID]", added to a copy so the caller's query (e.g. a
+        # reference cache key) is left unchanged
+        req_id = "{}--{}".format(f"{self.auth_handler.app_name}-{self.auth_handler.company_name}", uuid4())
+        return dict(query or {}, requestId=req_id)
+
+    def _rate_limit_headroom(self):
+        # the fraction of the endpoint's burst capacity available now, None if requests are not rate limited
+        rate_limiter = self.auth_handler.rate_limiter
+        bucket = rate_limiter.bucket(self.endpoint) if rate_limiter is not None else None
+        return None if bucket is None else max(0.0, bucket.available) / bucket.capacity
 
     def _authenticated_get(self, url, header=None, data=None, query=None, http_method="get"):
         """
@@ -40,48 +77,231 @@ class TTRestClient(ABC):
             requests.Response: The response object from the API request.
 
         Raises:
-            PostRequestError: If the response status code is not 200.
+            PostRequestError: If the response status code is not 200, after any retries allowed by the transport's
+                              retry policy.
+            CircuitOpenError: If the circuit breaker for the client's endpoint is open.
         """
 
         log.debug(f"HTTP GET request to TT REST API 2.0 {url}")
 
-        # all TT requests require "[app name]-[company name]--[GUID]"
-        req_id = "{}--{}".format(f"{self.auth_handler.app_name}-{self.auth_handler.company_name}", uuid4())
+        retry_policy = self.transport.retry_policy
+        circuit_breaker = retry_policy.circuit_breaker(self.endpoint) if retry_policy is not None else None
+        attempt = 0
+
+        while True:
+            if circuit_breaker is not None:
+                circuit_breaker.before_request()
+
+            try:
+                query = self._add_request_id(query)
+
+                if self.auth_handler.rate_limiter is not None:
+                    self.auth_handler.rate_limiter.acquire(self.endpoint)
+
+                request = requests.Request(http_method.upper(), url=url, headers=header, data=data, params=query)
+                prepared_request = self.auth_handler.authenticate_request(request.prepare())
 
-        if query is None:
-            query = {"requestId": req_id}
-        else:
-            query.update({"requestId": req_id})
+                try:
+                    response = self.transport.send(prepared_request)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_failure()
+                    if retry_policy is None or not retry_policy.can_retry(http_method, attempt):
+                        raise
+                    backoff = retry_policy.get_backoff(attempt)
+                    log.warning(f"HTTP GET request to {url} failed ({e}), retry {attempt + 1} in {backoff:.2f}s")
+                    time.sleep(backoff)
+                    attempt += 1
+                    continue
 
-        with requests.Session() as session:
-            request = requests.Request(http_method.upper(), url=url, headers=header, data=data, params=query)
-            prepared_request = self.auth_handler.authenticate_request(request.prepare())
-            response = session.send(prepared_request)
+                if response.status_code == 200 or retry_policy is None or not retry_policy.is_retryable_status(response.status_code):
+                    # the service responded, even if the request itself was rejected
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    break
+
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if not retry_policy.can_retry(http_method, attempt):
+                    break
+                backoff = retry_policy.get_backoff(attempt, response)
+                log.warning(f"HTTP GET request to {url} returned {response.status_code}, retry {attempt + 1} in {backoff:.2f}s")
+                time.sleep(backoff)
+                attempt += 1
+            except BaseException:
+                # an exception the attempt didn't expect (authentication, cancellation, ...) must not leave a
+                # trial request unreported, or the circuit would stay half open
+                if circuit_breaker is not None:
+                    circuit_breaker.record_abandoned()
+                raise
 
         if response.status_code != 200:
             raise PostRequestError(response)
 
         return response
 
-    def _generic_paginated_request(self, request_func, results_key, *args, **kwargs):
+    def iter_pages(self, request_func, *args, prefetch: int = 0, checkpoint: Checkpoint = None, **kwargs):
+        """
+        Iterate over the pages of a paginated request, following 'nextPageKey' until the last page. Each page is
+        requested only when the previous one has been consumed, so memory use does not grow with the number of pages.
+
+        Args:
+            request_func: The client request method, e.g. client.get_instruments.
+            *args: Positional arguments for request_func.
+            prefetch (int, optional): The number of pages to read ahead on a background worker while the caller
+                                      processes the current page. Default is 0 (no read-ahead).
+            checkpoint (Checkpoint, optional): A checkpoint recording each consumed page, the iteration resumes from
+                                               the checkpoint's cursor. Default is None.
+            **kwargs: Keyword arguments for request_func.
+
+        Returns:
+            generator: The JSON response of each page.
+
+        Example:
+            for page in pds_client.iter_pages(pds_client.get_instruments, product_id=product_id, prefetch=2):
+                ...
+        """
+        return self._paginate(request_func, args, kwargs, prefetch=prefetch, checkpoint=checkpoint)
+
+    def _paginate(self, request_func, args, kwargs, prefetch=0, checkpoint=None, store_pages=False):
+        if checkpoint is not None:
+            filters = {key: value for key, value in kwargs.items() if key != "next_page_key"}
+            checkpoint.bind({"request": getattr(request_func, "__name__", None), "args": args, **filters})
+        if checkpoint is not None and checkpoint.cursor is not None:
+            log.info(f"{request_func.__name__}: resuming from checkpoint {checkpoint}")
+            kwargs = {**kwargs, "next_page_key": checkpoint.cursor}
+
+        pages = self._prefetch(self._iter_pages(request_func, *args, **kwargs), prefetch)
+
+        if checkpoint is not None:
+            pages = self._checkpointed_pages(pages, checkpoint, self._next_page_cursor, store_pages)
+        return pages
+
+    def _prefetch(self, pages, prefetch):
+        return prefetch_iterator(pages, prefetch) if prefetch else pages
+
+    @staticmethod
+    def _next_page_cursor(page):
+        is_last_page = page["lastPage"].lower().strip() == "true"
+        return None if is_last_page else page.get("nextPageKey")
+
+    def _checkpointed_pages(self, pages, checkpoint, next_cursor, store_pages=False):
+        if checkpoint.complete:
+            log.info(f"Checkpoint {checkpoint.name} is complete, there are no more pages to request")
+            return
+
+        for page in pages:
+            yield page
+            # only reached once the caller has finished with the page and asks for the next one
+            checkpoint.save(next_cursor(page), page if store_pages else None)
+
+        checkpoint.mark_complete()
+
+    def _iter_pages(self, request_func, *args, **kwargs):
         json_response = request_func(*args, **kwargs)
-        items = json_response[results_key]
+        kwargs.pop("next_page_key", None)  # the first page may have been requested with a key when resuming
         is_last_page = json_response["lastPage"].lower().strip() == "true"
         next_page_key = json_response["nextPageKey"] if ("nextPageKey" in json_response) else "[Key not included]"
         logging.debug(f"{request_func.__name__}: lastPage={is_last_page}, nextPageKey={next_page_key}")
+        yield json_response
 
         while not is_last_page:
-            try:
-                next_page_key = json_response["nextPageKey"]
-                json_response = request_func(*args, **kwargs, next_page_key=next_page_key)
-                items.extend(json_response[results_key])
-                is_last_page = json_response["lastPage"].lower().strip() == "true"
-                logging.debug(f"{request_func.__name__}: lastPage={is_last_page}, nextPageKey={next_page_key}")
-            except KeyError as e:
+            if "nextPageKey" not in json_response:
                 error_message = f"'nextPageKey' not returned in server response to {request_func.__name__}(). Returning the retrieved, but possibly incomplete data."
-                error_message += f"\n\tError: {e}"
                 logging.warning(error_message)
                 break
 
+            next_page_key = json_response["nextPageKey"]
+            json_response = request_func(*args, **kwargs, next_page_key=next_page_key)
+            is_last_page = json_response["lastPage"].lower().strip() == "true"
+            logging.debug(f"{request_func.__name__}: lastPage={is_last_page}, nextPageKey={next_page_key}")
+            yield json_response
+
+    def _iter_page_records(self, pages, results_key):
+        for page in pages:
+            yield from page.get(results_key, [])
+
+    def _iter_records(self, request_func, results_key, *args, checkpoint: Checkpoint = None, **kwargs):
+        return self._iter_page_records(self.iter_pages(request_func, *args, checkpoint=checkpoint, **kwargs), results_key)
+
+    def _collect_pages(self, pages, results_key, stored_pages=()):
+        # combines the records of all pages into the last page's JSON response
+        items = [item for page in stored_pages for item in page[results_key]]
+        json_response = stored_pages[-1] if stored_pages else {}
+
+        for json_response in pages:
+            items.extend(json_response.get(results_key, []))
+
         json_response.update({results_key: items})
         return json_response
+
+    def _generic_paginated_request(self, request_func, results_key, *args, checkpoint: Checkpoint = None, **kwargs):
+        stored_pages = checkpoint.stored_pages() if checkpoint is not None else []
+        pages = self._paginate(request_func, args, kwargs, checkpoint=checkpoint, store_pages=True)
+        return self._collect_pages(pages, results_key, stored_pages)
+
+    def _bulk_request(self, request_func, ids, max_workers=None, **kwargs):
+        """
+        Call a single-ID request method for many IDs concurrently on a bounded thread pool.
+
+        Args:
+            request_func: The client request method taking an ID as its first argument, e.g. client.get_instrument.
+            ids (iterable): The IDs to request. Duplicates are only requested once.
+            max_workers (int, optional): The maximum number of concurrent requests. Defaults to the transport's
+                                         connection pool size.
+            **kwargs: Further keyword arguments for request_func.
+
+        Returns:
+            BulkResult: Results and errors keyed by ID, in input order. A failed ID does not abort the batch.
+        """
+        result = BulkResult(list(dict.fromkeys(ids)))
+        if not result.ids:
+            return result
+
+        max_workers = max_workers or self.transport.pool_maxsize
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(result.ids))) as executor:
+            futures = {item_id: executor.submit(request_func, item_id, **kwargs) for item_id in result.ids}
+
+            for item_id, future in futures.items():
+                try:
+                    result.results[item_id] = future.result()
+                except Exception as e:
+                    log.warning(f"{request_func.__name__}({item_id}) failed in bulk request: {e}")
+                    result.errors[item_id] = e
+
+        log.debug(f"{request_func.__name__}: bulk request for {len(result)} ids, {len(result.errors)} errors")
+        return result
+
+    def _iter_bulk_request(self, request_func, ids, max_workers=None, **kwargs):
+        """
+        Call a single-ID request method for many IDs concurrently, yielding each outcome as soon as it completes.
+
+        Args:
+            request_func: The client request method taking an ID as its first argument, e.g. client.get_all_sod.
+            ids (iterable): The IDs to request. Duplicates are only requested once.
+            max_workers (int, optional): The maximum number of concurrent requests. Defaults to the transport's
+                                         connection pool size.
+            **kwargs: Further keyword arguments for request_func.
+
+        Yields:
+            tuple: (id, JSON response, None) for a request that succeeded, or (id, None, exception) for one that failed,
+                   in completion order. Closing the generator cancels the requests that haven't started.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return
+
+        max_workers = max_workers or self.transport.pool_maxsize
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(ids)))
+        try:
+            futures = {executor.submit(request_func, item_id, **kwargs): item_id for item_id in ids}
+            for future in as_completed(futures):
+                item_id = futures[future]
+                error = future.exception()
+                if error is not None:
+                    log.warning(f"{request_func.__name__}({item_id}) failed in bulk request: {error}")
+                    yield item_id, None, error
+                else:
+                    yield item_id, future.result(), None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
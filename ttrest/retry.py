@@ -0,0 +1,209 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from .exceptions import CircuitOpenError
+
+log = logging.getLogger()
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker for a single endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests fail fast with CircuitOpenError.
+    Once `reset_timeout` seconds have passed a single trial request is let through (half open): success closes the
+    circuit, failure opens it again. A trial that hasn't reported back within `reset_timeout` is replaced by a new one.
+
+    Args:
+        endpoint (str): The TT service endpoint, e.g. "ttledger".
+        failure_threshold (int): The number of consecutive failures that opens the circuit.
+        reset_timeout (float): Seconds to wait before letting a trial request through an open circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint, failure_threshold: int, reset_timeout: float):
+        self._endpoint = endpoint
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """
+        Get the circuit state.
+
+        Returns:
+            str: One of CircuitBreaker.CLOSED, CircuitBreaker.OPEN or CircuitBreaker.HALF_OPEN.
+        """
+        return self._state
+
+    def before_request(self):
+        """
+        Check that a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with a trial request already in flight.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                retry_in = self._opened_at + self._reset_timeout - now
+                if retry_in <= 0:
+                    self._state = self.HALF_OPEN
+                    self._trial_started = now
+                    log.info(f"Circuit breaker for {self._endpoint} is half open, sending a trial request")
+                    return
+            else:
+                retry_in = self._trial_started + self._reset_timeout - now
+                if retry_in <= 0:
+                    self._trial_started = now
+                    log.warning(f"Trial request for {self._endpoint} did not report back, sending another")
+                    return
+
+            raise CircuitOpenError(self._endpoint, max(0.0, retry_in))
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                log.info(f"Circuit breaker for {self._endpoint} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_abandoned(self):
+        """
+        Record that a request ended without an outcome, e.g. it was cancelled or failed before reaching the endpoint.
+        An abandoned trial request opens the circuit again, so that another trial can follow.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != self.OPEN:
+                    log.warning(f"Circuit breaker for {self._endpoint} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """
+    A policy for retrying failed idempotent requests with exponential backoff, and for failing fast with a circuit
+    breaker per endpoint when an endpoint keeps failing.
+
+    Retries happen per request, so a failure part way through a paginated pull retries the failed page and then
+    carries on from there rather than restarting from the first page.
+
+    Args:
+        max_retries (int, optional): The maximum number of retries per request. Default is 3.
+        backoff_factor (float, optional): The backoff before retry n is backoff_factor * 2 ** n seconds. Default is 0.5.
+        max_backoff (float, optional): The maximum backoff in seconds, also caps Retry-After. Default is 30.
+        jitter (bool, optional): Randomise each backoff between 0 and its full value ("full jitter") so that many
+                                 clients don't retry in lockstep. Default is True.
+        retry_statuses (tuple, optional): HTTP status codes that are retried. Default is (429, 500, 502, 503, 504).
+        retry_methods (tuple, optional): HTTP methods that are safe to retry. Default is ("GET",).
+        respect_retry_after (bool, optional): Wait for the server's Retry-After header when present. Default is True.
+        failure_threshold (int, optional): Consecutive failures that open an endpoint's circuit breaker. Default is
+                                           None (no circuit breaking).
+        reset_timeout (float, optional): Seconds before an open circuit lets a trial request through. Default is 30.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30.0, jitter: bool = True,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_methods=("GET",), respect_retry_after: bool = True,
+                 failure_threshold: int = None, reset_timeout: float = 30.0):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuit_breakers = {}
+        self._lock = threading.Lock()
+
+    def circuit_breaker(self, endpoint):
+        """
+        Get the circuit breaker for an endpoint, creating it on first use.
+
+        Args:
+            endpoint (str): The TT service endpoint, e.g. "ttledger".
+
+        Returns:
+            CircuitBreaker: The circuit breaker, or None if circuit breaking is disabled.
+        """
+        if self.failure_threshold is None:
+            return None
+
+        with self._lock:
+            if endpoint not in self._circuit_breakers:
+                self._circuit_breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+            return self._circuit_breakers[endpoint]
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.retry_statuses
+
+    def can_retry(self, http_method, attempt):
+        """
+        Check whether a failed request may be retried.
+
+        Args:
+            http_method (str): The HTTP method of the request.
+            attempt (int): The number of retries already made.
+
+        Returns:
+            bool: True if the request should be retried.
+        """
+        return http_method.upper() in self.retry_methods and attempt < self.max_retries
+
+    def get_backoff(self, attempt, response=None):
+        """
+        Get the time to wait before the next retry.
+
+        Args:
+            attempt (int): The number of retries already made.
+            response (optional): The failed response, whose Retry-After header is honoured if present.
+
+        Returns:
+            float: The backoff in seconds.
+        """
+        retry_after = self._parse_retry_after(response) if (self.respect_retry_after and response is not None) else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    @staticmethod
+    def _parse_retry_after(response):
+        retry_after = response.headers.get("Retry-After") if response.headers is not None else None
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            # Retry-After may also be an HTTP date
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
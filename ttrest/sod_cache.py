@@ -0,0 +1,146 @@
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from datetime import time as dt_time
+from zoneinfo import ZoneInfo
+from .sqlite_store import SQLiteStore
+
+log = logging.getLogger()
+
+
+class TTSodCache(SQLiteStore):
+    """
+    A cache of start-of-day (SOD) records keyed by environment, account and trading date.
+
+    SODs don't change during a trading session, so each account's SOD is requested once per trading date. The trading
+    date rolls over at rollover_time in the given time zone (by default 17:00 Chicago time, when CME Globex opens the
+    next session), after which cached SODs from earlier dates are no longer returned and are purged. Trading dates
+    that fall on a weekend roll on to Monday, exchange holidays are not accounted for. Given a path, the SODs are also
+    kept in a SQLite database so they survive a restart.
+
+    Args:
+        path (str, optional): A SQLite database file. Default is None (memory only).
+        rollover_time (datetime.time, optional): The local time at which the trading date rolls over. Default is 17:00.
+        tz (str, optional): The time zone of rollover_time. Default is "America/Chicago".
+
+    Example:
+        sod_cache = TTSodCache("sod.sqlite")
+        sod = monitor_client.get_all_sod(account_id, cache=sod_cache)
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sod "
+        "(environment TEXT NOT NULL, account_id TEXT NOT NULL, trading_date TEXT NOT NULL, body TEXT NOT NULL, "
+        "fetched REAL NOT NULL, PRIMARY KEY (environment, account_id, trading_date))",
+    )
+
+    def __init__(self, path: str = None, rollover_time: dt_time = dt_time(17, 0), tz: str = "America/Chicago"):
+        super().__init__(path)
+        self.rollover_time = rollover_time
+        self.tz = ZoneInfo(tz)
+        self._memory = {}
+        self._purged = None
+
+    def trading_date(self, now: datetime = None):
+        """
+        Get the trading date of a time.
+
+        Args:
+            now (datetime, optional): A timezone-aware time. Defaults to now.
+
+        Returns:
+            datetime.date: The trading date, the next weekday once rollover_time has passed.
+        """
+        local = (now or datetime.now(timezone.utc)).astimezone(self.tz)
+        trading_date = local.date() + timedelta(days=1) if local.time() >= self.rollover_time else local.date()
+        while trading_date.weekday() >= 5:
+            trading_date += timedelta(days=1)
+        return trading_date
+
+    def get(self, environment, account_id, trading_date=None):
+        """
+        Get a cached SOD.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            account_id: The account ID.
+            trading_date (datetime.date, optional): Defaults to the current trading date.
+
+        Returns:
+            dict: A copy of the get_all_sod() JSON, or None if it isn't cached for the trading date.
+        """
+        trading_date = trading_date or self.trading_date()
+        key = (environment.value, str(account_id), trading_date.isoformat())
+
+        with self._lock:
+            if self._purged is None or trading_date > self._purged:
+                self._purge(trading_date)
+                self._purged = trading_date
+            body = self._memory.get(key)
+            if body is None and self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT body FROM sod WHERE environment = ? AND account_id = ? AND trading_date = ?", key
+                ).fetchone()
+                if row is not None:
+                    body = self._memory[key] = row[0]
+        # SODs are kept serialised, so callers can't change the cached copy
+        return None if body is None else json.loads(body)
+
+    def put(self, environment, account_id, sod, trading_date=None):
+        """
+        Cache an SOD.
+
+        Args:
+            environment (TTEnvironments): The TT environment.
+            account_id: The account ID.
+            sod (dict): The get_all_sod() JSON.
+            trading_date (datetime.date, optional): Defaults to the current trading date.
+        """
+        trading_date = trading_date or self.trading_date()
+        key = (environment.value, str(account_id), trading_date.isoformat())
+        body = json.dumps(sod)
+
+        with self._lock:
+            self._memory[key] = body
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO sod (environment, account_id, trading_date, body, fetched) VALUES (?, ?, ?, ?, ?)",
+                        key + (body, time.time())
+                    )
+
+    def invalidate(self, environment=None, account_id=None):
+        """
+        Discard cached SODs so they are requested again.
+
+        Args:
+            environment (TTEnvironments, optional): Only discard SODs of this environment. Default is None (all).
+            account_id (optional): Only discard SODs of this account. Default is None (all).
+        """
+        environment_value = None if environment is None else environment.value
+        account = None if account_id is None else str(account_id)
+
+        with self._lock:
+            for key in list(self._memory):
+                if environment_value in (None, key[0]) and account in (None, key[1]):
+                    del self._memory[key]
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM sod WHERE (? IS NULL OR environment = ?) AND (? IS NULL OR account_id = ?)",
+                        (environment_value, environment_value, account, account)
+                    )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory)
+
+    def _purge(self, trading_date):
+        # drop the SODs of earlier trading dates, called with the lock held
+        current = trading_date.isoformat()
+        for key in [key for key in self._memory if key[2] < current]:
+            del self._memory[key]
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute("DELETE FROM sod WHERE trading_date < ?", (current,))
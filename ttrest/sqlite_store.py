@@ -0,0 +1,39 @@
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """
+    The base of the local SQLite stores: a connection shared between threads, serialised with a lock.
+
+    Subclasses list their CREATE statements in SCHEMA, which are run when the database is opened.
+
+    Args:
+        path (str): The SQLite database file, ":memory:", or None for a store without a database.
+    """
+
+    SCHEMA = ()
+
+    def __init__(self, path: str = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                for statement in self.SCHEMA:
+                    self._connection.execute(statement)
+
+    def close(self):
+        """
+        Close the store's database connection, if any.
+        """
+        if self._connection is not None:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
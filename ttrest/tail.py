@@ -0,0 +1,71 @@
+import logging
+
+log = logging.getLogger()
+
+
+class AdaptivePollInterval:
+    """
+    The wait between polls of a live tail, adapted to the observed rate of new records and the rate limit headroom.
+
+    The interval shrinks towards min_interval while polls return new records and grows towards max_interval while they
+    don't, so a quiet tail makes few requests and a busy one has little latency. It also grows while the rate limiter
+    has less than half of its burst capacity left, leaving the budget to other requests.
+
+    Args:
+        min_interval (float, optional): The shortest wait in seconds. Default is 0.5.
+        max_interval (float, optional): The longest wait in seconds. Default is 30.
+        factor (float, optional): How much the interval shrinks or grows after each poll. Default is 2.
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 30.0, factor: float = 2.0):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"Expected 0 < min_interval <= max_interval, got {min_interval} and {max_interval}")
+        if factor <= 1:
+            raise ValueError(f"factor must be greater than 1, got {factor}")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.interval = min_interval
+
+    def update(self, new_records: int, headroom: float = None):
+        """
+        Adapt the interval after a poll.
+
+        Args:
+            new_records (int): The number of new records the poll returned.
+            headroom (float, optional): The fraction of the rate limiter's burst capacity available, None if requests
+                                        are not rate limited. Default is None.
+
+        Returns:
+            float: The seconds to wait before the next poll.
+        """
+        if new_records > 0 and (headroom is None or headroom >= 0.5):
+            self.interval = max(self.min_interval, self.interval / self.factor)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.factor)
+        return self.interval
+
+
+class _TailWatermark:
+    # the minTimestamp of the next poll, and the keys of the fills already delivered at or after it
+
+    def __init__(self, min_timestamp, key_func):
+        self.min_timestamp = min_timestamp
+        self._key_func = key_func
+        self._seen = {}
+
+    def new_records(self, records):
+        new = []
+        for record in records:
+            key = self._key_func(record)
+            if key not in self._seen:
+                self._seen[key] = int(record["timeStamp"])
+                new.append(record)
+
+        if records:
+            # the next poll starts at the latest timestamp rather than 1ns after it, as more fills may yet arrive with
+            # that timestamp, and only the fills at that timestamp have to be remembered to drop the repeats
+            self.min_timestamp = max(self._seen.values())
+            self._seen = {key: ts for key, ts in self._seen.items() if ts >= self.min_timestamp}
+        return new
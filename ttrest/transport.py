@@ -0,0 +1,188 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+import logging
+from .retry import RetryPolicy
+
+try:
+    import httpx
+except ImportError:  # httpx is only required by the async clients, see extras_require in setup.py
+    httpx = None
+
+log = logging.getLogger()
+
+
+class TTTransport:
+    """
+    A pooled, long-lived HTTP transport for the TT REST API clients.
+
+    A single transport keeps TCP/TLS connections to the TT gateway alive between requests so that paginated and
+    repeated calls do not pay for a fresh handshake each time. One transport can be shared across any number of
+    clients (e.g. TTLedgerClient, TTPdsClient and TTMonitorClient) and is thread safe for sending requests.
+
+    Args:
+        pool_connections (int, optional): The number of per-host connection pools to cache. Default is 10.
+        pool_maxsize (int, optional): The maximum number of connections kept alive per host. Should be at least the
+                                      number of threads sending requests concurrently. Default is 10.
+        timeout (float/tuple, optional): A requests timeout, either a single value or a (connect, read) tuple.
+                                         Default is None (no timeout).
+        retry_policy (RetryPolicy, optional): A policy for retrying failed GET requests and circuit breaking. Default
+                                              is None (failed requests are not retried).
+
+    Example:
+        with TTTransport(pool_maxsize=20) as transport:
+            ledger_client = TTLedgerClient(auth_handler, transport=transport)
+            pds_client = TTPdsClient(auth_handler, transport=transport)
+            ...
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, timeout=None, retry_policy: RetryPolicy = None):
+        self.retry_policy = retry_policy
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._timeout = timeout
+        self._session = None
+
+    @property
+    def pool_maxsize(self):
+        """
+        Get the maximum number of connections kept alive per host.
+
+        Returns:
+            int: The maximum pool size per host.
+        """
+        return self._pool_maxsize
+
+    @property
+    def session(self):
+        """
+        Get the underlying requests session, creating it on first use.
+
+        Returns:
+            requests.Session: The pooled session.
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self._pool_connections, pool_maxsize=self._pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+            log.debug(f"Opened TT transport with pool_connections={self._pool_connections}, pool_maxsize={self._pool_maxsize}")
+        return self._session
+
+    @property
+    def closed(self):
+        """
+        Check whether the transport currently holds no open session.
+
+        Returns:
+            bool: True if no session is open.
+        """
+        return self._session is None
+
+    def send(self, prepared_request):
+        """
+        Send a prepared request over a pooled connection.
+
+        Args:
+            prepared_request (requests.PreparedRequest): The authenticated, prepared request.
+
+        Returns:
+            requests.Response: The response object from the API request.
+        """
+        return self.session.send(prepared_request, timeout=self._timeout)
+
+    def close(self):
+        """
+        Close all pooled connections. The transport can still be used afterwards, in which case a new session is
+        opened on the next request.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+            log.debug("Closed TT transport")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncTTTransport:
+    """
+    A pooled HTTP transport for the async TT REST API clients, built on httpx.AsyncClient.
+
+    Requires the optional httpx dependency (pip install tt-rest-api[async]).
+
+    Args:
+        max_connections (int, optional): The maximum number of concurrent connections. Default is 100.
+        max_keepalive_connections (int, optional): The maximum number of idle connections kept alive. Default is 20.
+        timeout (float, optional): A timeout in seconds for each request. Default is None (no timeout).
+        retry_policy (RetryPolicy, optional): A policy for retrying failed GET requests and circuit breaking. Default
+                                              is None (failed requests are not retried).
+
+    Example:
+        async with AsyncTTTransport(max_connections=200) as transport:
+            ledger_client = AsyncTTLedgerClient(auth_handler, transport=transport)
+            fills = await ledger_client.get_all_fills()
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20, timeout=None, retry_policy: RetryPolicy = None):
+        if httpx is None:
+            raise ImportError("The async TT clients require httpx. Install it with 'pip install tt-rest-api[async]'.")
+
+        self.retry_policy = retry_policy
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self._timeout = timeout
+        self._client = None
+
+    @property
+    def client(self):
+        """
+        Get the underlying httpx client, creating it on first use.
+
+        Returns:
+            httpx.AsyncClient: The pooled async client.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+            log.debug(f"Opened async TT transport with {self._limits}")
+        return self._client
+
+    @property
+    def closed(self):
+        """
+        Check whether the transport currently holds no open client.
+
+        Returns:
+            bool: True if no client is open.
+        """
+        return self._client is None
+
+    async def send(self, request):
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            request (httpx.Request): The authenticated request.
+
+        Returns:
+            httpx.Response: The response object from the API request.
+        """
+        return await self.client.send(request)
+
+    async def close(self):
+        """
+        Close all pooled connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            log.debug("Closed async TT transport")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -1,5 +1,7 @@
 from .rest_client import TTRestClient
+from .async_rest_client import AsyncTTRestClient
 from .authenticator import TTAuthenticator
+from .transport import TTTransport
 
 import logging
 
@@ -9,8 +11,8 @@ log = logging.getLogger()
 class TTUserClient(TTRestClient):
     endpoint = "ttuser"
 
-    def __init__(self, auth_handler: TTAuthenticator):
-        super().__init__(auth_handler)
+    def __init__(self, auth_handler: TTAuthenticator, transport: TTTransport = None):
+        super().__init__(auth_handler, transport)
 
     def get_accounts(self, user_id, next_page_key=None):
         """
@@ -48,6 +50,23 @@ class TTUserClient(TTRestClient):
             user_id=user_id
         )
 
+    def iter_accounts(self, user_id):
+        """
+        Iterates over the accounts associated with the specified user ID, requesting each page only once the previous
+        one has been consumed.
+
+        Args:
+            user_id:  The user ID. Can be retrieved from the get_users() method.
+
+        Returns:
+            generator:  Account records.
+        """
+        return self._iter_records(
+            self.get_accounts,
+            "accounts",
+            user_id=user_id
+        )
+
     def get_limits(self, user_id, next_page_key=None):
         """
         Gets the list of limits associated with the specified user ID.
@@ -84,6 +103,23 @@ class TTUserClient(TTRestClient):
             user_id=user_id
         )
 
+    def iter_limits(self, user_id):
+        """
+        Iterates over the limits associated with the specified user ID, requesting each page only once the previous one
+        has been consumed.
+
+        Args:
+            user_id:  The user ID. Can be retrieved from the get_users() method.
+
+        Returns:
+            generator:  User limit records.
+        """
+        return self._iter_records(
+            self.get_limits,
+            "userLimits",
+            user_id=user_id
+        )
+
     def get_users(self, next_page_key=None):
         """
         Gets the list of users associated with the application key.
@@ -114,3 +150,26 @@ class TTUserClient(TTRestClient):
             self.get_users,
             results_key="users"
         )
+
+    def iter_users(self):
+        """
+        Iterates over the users associated with the application key, requesting each page only once the previous one
+        has been consumed.
+
+        Returns:
+            generator:  User records.
+        """
+        return self._iter_records(
+            self.get_users,
+            "users"
+        )
+
+
+class AsyncTTUserClient(AsyncTTRestClient, TTUserClient):
+    """
+    An asyncio Rest API Client implementing the TT User endpoints. Methods mirror TTUserClient and return awaitables.
+
+    Args:
+        auth_handler (TTAuthenticator): An authenticator.
+        transport (AsyncTTTransport, optional): A pooled async HTTP transport to share with other clients. Default is None.
+    """